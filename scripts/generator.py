@@ -1,23 +1,38 @@
 import itertools
 import string
-from typing import List
+from typing import Iterator, List
 import argparse
 
-def generate_dictionary(length: int, possible_letters: int, size: int = None, allow_repeats: bool = True) -> List[str]:
-    """Generate dictionary words based on specified parameters."""
+def iter_dictionary(length: int, possible_letters: int, size: int = None, allow_repeats: bool = True) -> Iterator[str]:
+    """Yield dictionary words based on specified parameters, in sorted order, one at a time."""
     letters = string.ascii_lowercase[:possible_letters]
     
     if allow_repeats:
         words = itertools.product(letters, repeat=length)
     else:
         if length > len(letters):
-            return []
+            return
         words = itertools.permutations(letters, length)
     
-    result = [''.join(word) for word in words]
-    if size:
-        result = result[:size]
-    return result
+    for word in itertools.islice(words, size or None):
+        yield ''.join(word)
+
+def generate_dictionary(length: int, possible_letters: int, size: int = None, allow_repeats: bool = True) -> List[str]:
+    """Generate dictionary words based on specified parameters."""
+    return list(iter_dictionary(length, possible_letters, size, allow_repeats))
+
+def write_dictionary(path: str, words: Iterator[str], chunk_size: int = 1 << 16) -> int:
+    """Stream words to a file, one per line, holding at most `chunk_size` of them in memory."""
+    count = 0
+    with open(path, 'w') as f:
+        while True:
+            chunk = list(itertools.islice(words, chunk_size))
+            if not chunk:
+                break
+            # Same layout as '\n'.join(all_words): no trailing newline
+            f.write(('\n' if count else '') + '\n'.join(chunk))
+            count += len(chunk)
+    return count
 
 def main():
     parser = argparse.ArgumentParser(description='Generate dictionary words')
@@ -29,10 +44,8 @@ def main():
     parser.add_argument('-o', '--output', default='dictionary.txt', help='Output file name')
     args = parser.parse_args()
 
-    words = generate_dictionary(args.length, args.possible_letters, args.size, not args.no_repeats)
-    
-    with open(args.output, 'w') as f:
-        f.write('\n'.join(words))
+    words = iter_dictionary(args.length, args.possible_letters, args.size, not args.no_repeats)
+    write_dictionary(args.output, words)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,5 +1,6 @@
 
 import os
+import sys
 from typing import List
 
 from matplotlib import pyplot as plt
@@ -110,8 +111,9 @@ class SimpleWordleCircuitBuilder():
         qc = QuantumCircuit(3,2)
         qc = qc.compose(self.circuit, [0,1,2])
         
-        simulator = AerSimulator()
-        transpiled_circuit = transpile(qc, simulator)
+        simulator = get_simulator()
+        key = circuit_key(2, self.SOLUTIONS, 'wordle')
+        transpiled_circuit = circuit_cache.get_or_build(key, lambda: transpile(qc, simulator))
         job = simulator.run(transpiled_circuit)
         counts = job.result().get_counts()        
         
@@ -122,19 +124,23 @@ from qiskit import QuantumCircuit
 from qiskit.circuit.library import MCXGate
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from circuitcache import circuit_cache, circuit_key, get_simulator
+from filters import CandidateSet
+
 class QuantumWordleSolver:
-    def __init__(self, word_list: List[str]):
-        self.possible_words = set(word_list)
+    def __init__(self, word_list: List[str], **kwargs):
+        self.candidates = CandidateSet(word_list, kwargs.get('patterns'))
         self.feedback_history = []
         self.word_length = len(next(iter(word_list)))
         
+    @property
+    def possible_words(self) -> List[str]:
+        return self.candidates.to_list()
+        
     def update_possibilities(self, guess: str, feedback: List[str]):
         """Update possible words based on Wordle feedback"""
-        new_possibilities = set()
-        for word in self.possible_words:
-            if self._matches_feedback(word, guess, feedback):
-                new_possibilities.add(word)
-        self.possible_words = new_possibilities
+        self.candidates.update(guess, feedback)
         self.feedback_history.append((guess, feedback))
         
     def get_next_guess(self) -> str:
@@ -167,17 +173,6 @@ class QuantumWordleSolver:
         """Convert words to binary numbers for quantum processing"""
         return [sum(1 << i for i, c in enumerate(word)) for word in words]
     
-    def _matches_feedback(self, candidate: str, guess: str, feedback: List[str]) -> bool:
-        """Check if a candidate word matches Wordle feedback"""
-        for i, (letter, result) in enumerate(zip(guess, feedback)):
-            if result == 'correct' and candidate[i] != letter:
-                return False
-            elif result == 'absent' and letter in candidate:
-                return False
-            elif result == 'present' and (letter not in candidate or candidate[i] == letter):
-                return False
-        return True
-        
     def _analyze_measurement_results(self, counts: dict) -> float:
         """Analyze quantum measurement results to score position"""
         total_shots = sum(counts.values())
@@ -252,9 +247,9 @@ class PositionEvaluationCircuit:
         
     def run(self) -> dict:
         """Run the quantum circuit and return measurement results"""
-        qc = self.build()
-        simulator = AerSimulator()
-        transpiled = transpile(qc, simulator)
+        simulator = get_simulator()
+        key = circuit_key(self.qubit_count, self._get_solutions_for_position(), 'phase_position')
+        transpiled = circuit_cache.get_or_build(key, lambda: transpile(self.build(), simulator))
         job = simulator.run(transpiled, shots=1000)
         return job.result().get_counts()
         
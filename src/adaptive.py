@@ -0,0 +1,74 @@
+from collections import Counter
+from typing import List, Tuple
+
+import numpy as np
+
+
+def entropy_interval(counts: dict, z: float = 1.96) -> Tuple[float, float]:
+    """Miller-Madow entropy estimate (bits) of sampled counts and a half-width around it
+
+    The half-width is the delta-method standard error, sqrt((sum p log2(p)^2 - H^2) / n),
+    scaled by z, plus the size of the Miller-Madow bias correction itself, so
+    estimates from too few shots to cover the outcome space never look settled.
+    """
+    values = np.array([v for v in counts.values() if v > 0], dtype=float)
+    shots = values.sum()
+    if shots == 0:
+        return 0.0, float('inf')
+    probs = values / shots
+    logs = np.log2(probs)
+    plug_in = -np.sum(probs * logs)
+    bias = (len(values) - 1) / (2 * shots * np.log(2))
+    variance = max(np.sum(probs * logs ** 2) - plug_in ** 2, 0.0) / shots
+    return float(plug_in + bias), float(z * np.sqrt(variance) + bias)
+
+
+class AdaptiveSampler:
+    """Samples position circuits in rounds until their entropy ranking is settled
+
+    Each round runs `round_shots` more shots of every position still in the
+    race. A position drops out once its upper bound falls below the best lower
+    bound, and sampling stops when a single position is left, when every
+    remaining interval is narrower than `tolerance` bits (ties), or when
+    `max_shots` per position is reached.
+    """
+
+    def __init__(self, backend, round_shots: int = 128, max_shots: int = 4096,
+                 z: float = 1.96, tolerance: float = 0.05):
+        self.backend = backend
+        self.round_shots = round_shots
+        self.max_shots = max_shots
+        self.z = z
+        self.tolerance = tolerance
+
+    def run_many(self, circuits: List) -> Tuple[List[dict], List[int]]:
+        """Return accumulated counts and the number of shots spent on each circuit
+
+        Circuits with the same cache_key() have the same output distribution,
+        so only the first of each is sampled; its duplicates share its counts
+        and report zero shots.
+        """
+        first = {}
+        for i, circuit in enumerate(circuits):
+            first.setdefault(circuit.cache_key(), i)
+        unique = sorted(first.values())
+
+        counts = {i: Counter() for i in unique}
+        shots = [0] * len(circuits)
+        active = list(unique)
+
+        while active:
+            for i, result in zip(active, self.backend.run_many([circuits[i] for i in active], self.round_shots)):
+                counts[i].update(result)
+                shots[i] += self.round_shots
+
+            intervals = {i: entropy_interval(counts[i], self.z) for i in active}
+            best_lower = max(entropy - width for entropy, width in intervals.values())
+            active = [i for i in active
+                      if intervals[i][0] + intervals[i][1] >= best_lower
+                      and shots[i] < self.max_shots]
+
+            if len(active) <= 1 or all(intervals[i][1] < self.tolerance for i in active):
+                break
+
+        return [dict(counts[first[circuit.cache_key()]]) for circuit in circuits], shots
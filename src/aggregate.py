@@ -0,0 +1,218 @@
+import argparse
+import json
+import math
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Iterations and guess counts tracked per solver; longer games are clipped into the last slot
+MAX_ITERATIONS = 64
+
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch for values from 1 to max_value with a relative error bound
+
+    Bucket k >= 1 holds values in (gamma^(k-2), gamma^(k-1)] with
+    gamma = (1+a)/(1-a), so every reported quantile is within a relative
+    error `a` of an exact one. Zeros get bucket 0, and values between 0 and
+    1 share bucket 1 (search-space sizes never fall there). Sketches with
+    the same accuracy merge by adding bucket counts, and `buckets` can be an
+    axis of a larger array.
+    """
+
+    def __init__(self, accuracy: float = 0.01, max_value: float = 1e13):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.size = int(math.ceil(math.log(max_value) / math.log(self.gamma))) + 1
+
+    def bucket(self, values: np.ndarray) -> np.ndarray:
+        """Bucket index of each value; 0 is reserved for zeros"""
+        values = np.asarray(values, dtype=float)
+        buckets = np.ceil(np.log(np.maximum(values, 1e-300)) / math.log(self.gamma)).astype(np.int64) + 1
+        return np.where(values > 0, np.clip(buckets, 1, self.size), 0)
+
+    def value(self, bucket: int) -> float:
+        """Representative value of a bucket (the midpoint that gives the relative error bound)"""
+        if bucket == 0:
+            return 0.0
+        return 2 * self.gamma ** (bucket - 1) / (self.gamma + 1)
+
+    def quantiles(self, counts: np.ndarray, quantiles: Iterable[float] = QUANTILES) -> List[float]:
+        total = counts.sum()
+        if total == 0:
+            return [math.nan for _ in quantiles]
+        cumulative = np.cumsum(counts)
+        return [self.value(int(np.searchsorted(cumulative, q * (total - 1), side='right'))) for q in quantiles]
+
+
+class BurndownAggregator:
+    """Running per-solver statistics of game burndowns, updated one finished game at a time
+
+    Per iteration it keeps the number of games still running, the sum of
+    their search-space sizes (for the mean) and a quantile sketch; per solver
+    it keeps a histogram of guess counts. Memory does not grow with the
+    number of games, aggregators merge by addition, and the state is saved
+    as a single compressed .npz file.
+    """
+
+    def __init__(self, accuracy: float = 0.01, max_iterations: int = MAX_ITERATIONS):
+        self.sketch = QuantileSketch(accuracy)
+        self.max_iterations = max_iterations
+        self.solvers: List[str] = []
+        self.games = np.zeros(0, dtype=np.int64)
+        self.running = np.zeros((0, max_iterations), dtype=np.int64)
+        self.sums = np.zeros((0, max_iterations))
+        self.buckets = np.zeros((0, max_iterations, self.sketch.size + 1), dtype=np.int64)
+        self.guesses = np.zeros((0, max_iterations + 1), dtype=np.int64)
+        self.metadata = {}
+
+    def _row(self, solver: str) -> int:
+        if solver not in self.solvers:
+            self.solvers.append(solver)
+            self.games = np.append(self.games, 0)
+            self.running = np.vstack([self.running, np.zeros((1, self.max_iterations), dtype=np.int64)])
+            self.sums = np.vstack([self.sums, np.zeros((1, self.max_iterations))])
+            self.buckets = np.concatenate([self.buckets, np.zeros((1,) + self.buckets.shape[1:], dtype=np.int64)])
+            self.guesses = np.vstack([self.guesses, np.zeros((1, self.max_iterations + 1), dtype=np.int64)])
+        return self.solvers.index(solver)
+
+    def add(self, solver: str, burndown: List[int], guesses: Optional[int] = None):
+        row = self._row(solver)
+        sizes = np.asarray(burndown[:self.max_iterations], dtype=float)
+        steps = np.arange(len(sizes))
+        self.games[row] += 1
+        self.running[row, steps] += 1
+        self.sums[row, steps] += sizes
+        np.add.at(self.buckets[row], (steps, self.sketch.bucket(sizes)), 1)
+        guesses = len(burndown) if guesses is None else guesses
+        self.guesses[row, min(guesses, self.max_iterations)] += 1
+
+    def add_record(self, record: dict):
+        """Add a compare.py game record"""
+        self.add(record['solver'], record['burndown'], record['guesses'])
+
+    def merge(self, other: 'BurndownAggregator'):
+        if other.sketch.accuracy != self.sketch.accuracy or other.max_iterations != self.max_iterations:
+            raise ValueError('Only aggregators with the same accuracy and iteration limit can be merged')
+        for i, solver in enumerate(other.solvers):
+            row = self._row(solver)
+            self.games[row] += other.games[i]
+            self.running[row] += other.running[i]
+            self.sums[row] += other.sums[i]
+            self.buckets[row] += other.buckets[i]
+            self.guesses[row] += other.guesses[i]
+
+    def summary(self, solver: str) -> dict:
+        """Per-iteration mean and quantiles, plus the guess histogram, for one solver
+
+        Finished games count as a search space of 1 in the mean, as in
+        compare.plot_burndown's padding; quantiles cover running games only.
+        """
+        row = self.solvers.index(solver)
+        length = int(np.flatnonzero(self.running[row]).max()) + 1 if self.running[row].any() else 0
+        finished = self.games[row] - self.running[row, :length]
+        return {
+            'games': int(self.games[row]),
+            'running': self.running[row, :length].tolist(),
+            'mean': ((self.sums[row, :length] + finished) / max(self.games[row], 1)).tolist(),
+            'quantiles': {q: [self.sketch.quantiles(self.buckets[row, i], [q])[0] for i in range(length)]
+                          for q in QUANTILES},
+            'guesses': {int(k): int(v) for k, v in enumerate(self.guesses[row]) if v}
+        }
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        np.savez_compressed(path, solvers=np.array(self.solvers, dtype=str), games=self.games,
+                            running=self.running, sums=self.sums, buckets=self.buckets, guesses=self.guesses,
+                            accuracy=self.sketch.accuracy, metadata=json.dumps(self.metadata))
+
+
+def load_aggregate(path: str) -> BurndownAggregator:
+    with np.load(path) as data:
+        aggregator = BurndownAggregator(float(data['accuracy']), data['running'].shape[1])
+        aggregator.solvers = data['solvers'].tolist()
+        aggregator.games = data['games']
+        aggregator.running = data['running']
+        aggregator.sums = data['sums']
+        aggregator.buckets = data['buckets']
+        aggregator.guesses = data['guesses']
+        aggregator.metadata = json.loads(str(data['metadata']))
+    return aggregator
+
+
+def render_summary(aggregator: BurndownAggregator, output: str, title: str = 'Wordle Solver Comparison',
+                   colors: Optional[Dict[str, str]] = None):
+    """Draw mean and quantile bands of the burndowns and the guess histograms, without a display
+
+    Writes `output` with .png and .pdf extensions and returns the paths.
+    """
+    colors = colors or {}
+    figure = Figure(figsize=(24, 8))
+    FigureCanvasAgg(figure)
+    burndown, histogram = figure.subplots(1, 2, gridspec_kw={'width_ratios': [2, 1]})
+
+    width = 0.8 / max(len(aggregator.solvers), 1)
+    for i, solver in enumerate(aggregator.solvers):
+        summary = aggregator.summary(solver)
+        color = colors.get(solver)
+        steps = np.arange(len(summary['mean']))
+        line, = burndown.plot(steps, summary['mean'], label=solver, color=color, linestyle='-.', linewidth=6, alpha=.5)
+        color = line.get_color()
+        burndown.fill_between(steps, summary['quantiles'][0.1], summary['quantiles'][0.9], color=color, alpha=.1)
+        burndown.fill_between(steps, summary['quantiles'][0.25], summary['quantiles'][0.75], color=color, alpha=.2)
+        burndown.plot(steps, summary['quantiles'][0.5], color=color, linewidth=2)
+
+        counts = summary['guesses']
+        histogram.bar(np.array(list(counts)) + (i - (len(aggregator.solvers) - 1) / 2) * width,
+                      np.array(list(counts.values())) / summary['games'], width=width, color=color, label=solver)
+
+    burndown.set_xlim(0, 10)
+    burndown.set_yscale('log')
+    burndown.set_xlabel('Iteration')
+    burndown.set_ylabel('Search Space')
+    burndown.set_title(title)
+    burndown.grid(True, alpha=0.3)
+    burndown.legend()
+
+    histogram.set_xlabel('Guesses')
+    histogram.set_ylabel('Share of games')
+    histogram.grid(True, alpha=0.3)
+
+    figure.tight_layout()
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    paths = [f'{output}.png', f'{output}.pdf']
+    for path in paths:
+        figure.savefig(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render burndown summaries from aggregate (.npz) or compare (.json) files')
+    parser.add_argument('inputs', nargs='+', help='Aggregate .npz files or compare.py .json results, merged')
+    parser.add_argument('-o', '--output', required=True, help='Figure path without extension')
+    parser.add_argument('--save', help='Also write the merged aggregate to this .npz file')
+    args = parser.parse_args()
+
+    aggregator = BurndownAggregator()
+    for path in args.inputs:
+        if path.endswith('.json'):
+            with open(path) as f:
+                for record in json.load(f)['games']:
+                    aggregator.add_record(record)
+        else:
+            aggregator.merge(load_aggregate(path))
+
+    if args.save:
+        aggregator.save(args.save)
+    for path in render_summary(aggregator, args.output):
+        print('Saved', path)
+
+
+if __name__ == '__main__':
+    main()
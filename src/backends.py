@@ -0,0 +1,168 @@
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from qiskit import transpile
+
+from batching import CircuitBatcher, get_batcher
+from circuitcache import CircuitCache, circuit_cache, get_simulator
+from profiling import phase
+
+
+def marked_states(qubit_count: int, solutions: Iterable[int]) -> np.ndarray:
+    """Basis-state indices flipped by SimpleOracleBuilder for a list of solutions
+
+    The builder reads a solution's bit string most-significant bit first onto
+    qubits 0..n-1, so in Qiskit's little-endian indexing the state is the
+    bit-reversed solution. Each MCX toggles the ancilla, so solutions listed an
+    even number of times cancel out.
+    """
+    solutions = np.asarray(list(solutions), dtype=np.int64)
+    states = np.zeros_like(solutions)
+    for bit in range(qubit_count):
+        states |= ((solutions >> bit) & 1) << (qubit_count - 1 - bit)
+    unique, multiplicity = np.unique(states, return_counts=True)
+    return unique[multiplicity % 2 == 1]
+
+
+def _walsh_hadamard(amplitudes: np.ndarray) -> np.ndarray:
+    """Apply H to every qubit of a statevector (normalised fast Walsh-Hadamard transform)"""
+    n = len(amplitudes)
+    out = amplitudes.copy()
+    h = 1
+    while h < n:
+        out = out.reshape(-1, 2, h)
+        out = np.stack((out[:, 0] + out[:, 1], out[:, 0] - out[:, 1]), axis=1).reshape(n)
+        h *= 2
+    return out / np.sqrt(n)
+
+
+def _to_counts(probabilities: np.ndarray, qubit_count: int, shots: Optional[int],
+               rng: np.random.Generator) -> Dict[str, float]:
+    """Turn a probability vector into Qiskit-style bit-string keys, sampling if shots is set"""
+    if shots is None:
+        values = probabilities
+    else:
+        values = rng.multinomial(shots, probabilities / probabilities.sum())
+    return {format(int(state), f'0{qubit_count}b'): (float(values[state]) if shots is None else int(values[state]))
+            for state in np.flatnonzero(values > 1e-12)}
+
+
+class AerBackend:
+    """Samples the full Qiskit circuit on the process-wide AerSimulator
+
+    Transpiled circuits are kept in a CircuitCache keyed by the circuit's
+    content, so identical circuits are only built and transpiled once.
+    """
+
+    def __init__(self, shots: int = 1024, cache: Optional[CircuitCache] = None):
+        self.shots = shots
+        self.cache = cache if cache is not None else circuit_cache
+        self.simulator = get_simulator()
+
+    def transpiled(self, circuit):
+        return self.cache.get_or_build(circuit.cache_key(), lambda: self._transpile(circuit.build()))
+
+    def _transpile(self, built):
+        with phase('transpile'):
+            return transpile(built, self.simulator)
+
+    def run(self, circuit) -> dict:
+        return self.run_many([circuit])[0]
+
+    def run_many(self, circuits: List, shots: Optional[int] = None) -> List[dict]:
+        """Run several circuits as the experiments of a single simulator job"""
+        transpiled = [self.transpiled(circuit) for circuit in circuits]
+        with phase('simulate'):
+            job = self.simulator.run(transpiled, shots=shots or self.shots, max_parallel_experiments=0)
+            result = job.result()
+        return [result.get_counts(i) for i in range(len(circuits))]
+
+
+class BatchedAerBackend(AerBackend):
+    """AerBackend whose jobs go through the process-wide CircuitBatcher
+
+    Circuits submitted by concurrently running games (e.g. one thread per
+    game) are merged into shared multi-experiment jobs.
+    """
+
+    def __init__(self, shots: int = 1024, cache: Optional[CircuitCache] = None,
+                 batcher: Optional[CircuitBatcher] = None):
+        super().__init__(shots, cache)
+        self.batcher = batcher if batcher is not None else get_batcher()
+
+    def run_many(self, circuits: List, shots: Optional[int] = None) -> List[dict]:
+        transpiled = [self.transpiled(circuit) for circuit in circuits]
+        with phase('simulate'):
+            return self.batcher.run_many(transpiled, shots or self.shots)
+
+
+class StatevectorBackend:
+    """Exact NumPy simulation of PositionEvaluationCircuit
+
+    The circuit is always: H on the word register, a bit-flip oracle onto the
+    ancilla, then H X MCX X H on the word register with the MCX targeting the
+    ancilla. Both ancilla branches are tracked as length-2^n vectors. With
+    shots=None the exact probabilities are returned in place of counts.
+    """
+
+    def __init__(self, shots: Optional[int] = None, seed=None):
+        self.shots = shots
+        self.rng = np.random.default_rng(seed)
+
+    def probabilities(self, qubit_count: int, marked: np.ndarray) -> np.ndarray:
+        size = 2 ** qubit_count
+        branches = np.zeros((2, size))
+        branches[0] = 1 / np.sqrt(size)
+
+        # Oracle: marked states move to the ancilla-1 branch
+        branches[:, marked] = branches[::-1, marked]
+
+        # Diffusion: H X, flip the ancilla on |1...1>, then X H
+        branches = np.stack([_walsh_hadamard(b)[::-1] for b in branches])
+        branches[:, -1] = branches[::-1, -1].copy()
+        branches = np.stack([_walsh_hadamard(b[::-1]) for b in branches])
+
+        return (branches ** 2).sum(axis=0)
+
+    def run(self, circuit, shots: Optional[int] = None) -> dict:
+        marked = marked_states(circuit.qubit_count, circuit._get_solutions_for_position())
+        probabilities = self.probabilities(circuit.qubit_count, marked)
+        return _to_counts(probabilities, circuit.qubit_count, shots or self.shots, self.rng)
+
+    def run_many(self, circuits: List, shots: Optional[int] = None) -> List[dict]:
+        with phase('simulate'):
+            return [self.run(circuit, shots) for circuit in circuits]
+
+
+class AnalyticBackend(StatevectorBackend):
+    """Closed-form output distribution of PositionEvaluationCircuit
+
+    With N = 2^n states, M of them marked and m = M/N, every marked state is
+    measured with probability ((2-2m)^2 + (2m-1)^2)/N and every unmarked one
+    with ((1-2m)^2 + (2m)^2)/N, so only the size of the marked set matters.
+    """
+
+    def probabilities(self, qubit_count: int, marked: np.ndarray) -> np.ndarray:
+        size = 2 ** qubit_count
+        m = len(marked) / size
+        probabilities = np.full(size, ((1 - 2 * m) ** 2 + (2 * m) ** 2) / size)
+        probabilities[marked] = ((2 - 2 * m) ** 2 + (2 * m - 1) ** 2) / size
+        return probabilities
+
+
+BACKENDS = {
+    'aer': AerBackend,
+    'aer-batched': BatchedAerBackend,
+    'statevector': StatevectorBackend,
+    'analytic': AnalyticBackend,
+}
+
+
+def get_backend(backend=None):
+    """Resolve a backend name (or pass through a backend instance); Aer is the default"""
+    if backend is None:
+        return AerBackend()
+    if isinstance(backend, str):
+        return BACKENDS[backend]()
+    return backend
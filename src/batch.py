@@ -0,0 +1,142 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from classicalSolver import DETERMINISTIC_SOLVERS
+from patterns import DEFAULT_CACHE_DIR, feedback_codes
+from profiling import count_guess, profiled
+
+# Upper bound on games x words booleans held per lockstep batch
+_BATCH_ELEMENTS = 1 << 26
+
+MAX_ROUNDS = 64
+
+
+def _frequency_scores(solver) -> np.ndarray:
+    # Summed exactly as FrequencyWordleSolver.get_next_guess does, so float ties break the same way
+    return np.array([sum(solver.frequencies[letter] for letter in sorted(set(word)))
+                     for word in solver.candidates.words])
+
+
+# Rows of `alive` scored together by the incremental Frequency rule, bounding its (rows, words) score matrix
+_SCORE_ELEMENTS = 1 << 22
+
+
+class LockstepSolver:
+    """Plays many games of one deterministic solver together, one guess round at a time
+
+    Each game's candidates are a row of a boolean (games, words) matrix.
+    Every round picks a guess per unfinished game, looks up all of their
+    feedback rows at once (one row per distinct guess) and prunes every row
+    with a single comparison. Pruning and Frequency choose their guesses with
+    masked argmaxes (incremental Frequency scores every row against the
+    letter counts of its own candidates with two matrix products); other
+    solvers, including Entropy with branch_and_bound, are asked once per
+    distinct candidate set, which early rounds share across many games.
+    An Entropy opening is cached in `cache_dir` as by the solver itself.
+    """
+
+    def __init__(self, word_list, solver_name: str = 'Frequency', patterns=None, incremental: bool = False,
+                 branch_and_bound: Optional[bool] = None, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        if solver_name not in DETERMINISTIC_SOLVERS:
+            raise ValueError(f'Lockstep play needs a deterministic solver, expected one of {list(DETERMINISTIC_SOLVERS)}')
+        self.solver_name = solver_name
+        self.solver = DETERMINISTIC_SOLVERS[solver_name](word_list, target_word=None, patterns=patterns,
+                                                         branch_and_bound=branch_and_bound,
+                                                         cache_dir=cache_dir)
+        self.patterns = patterns
+        self.words = self.solver.candidates.words
+        self.encoded = self.solver.candidates.encoded
+        self.index = {word: i for i, word in enumerate(self.words)}
+        self.solved = 3 ** self.encoded.shape[1] - 1
+        self.incremental = incremental and solver_name == 'Frequency'
+        self.scores = _frequency_scores(self.solver) if solver_name == 'Frequency' and not self.incremental else None
+        if self.incremental:
+            # Letters each word contains, and one-hot letters per position, as float32 for BLAS (counts stay exact)
+            self.presence = self.solver._letter_presence(np.arange(len(self.words))).astype(np.float32)
+            self.positions = [np.eye(26, dtype=np.float32)[self.encoded[:, i]] for i in range(self.encoded.shape[1])]
+
+    def _incremental_choices(self, alive: np.ndarray) -> np.ndarray:
+        """FrequencyWordleSolver's incremental choice for every row, from its own candidates' letter counts"""
+        choices = np.empty(len(alive), dtype=np.int64)
+        rows = max(1, _SCORE_ELEMENTS // max(1, len(self.words)))
+        for start in range(0, len(alive), rows):
+            block = alive[start:start + rows].astype(np.float32)
+            scores = (block @ self.presence) @ self.presence.T
+            for i, onehot in enumerate(self.positions):
+                scores += (block @ onehot)[:, self.encoded[:, i]]
+            choices[start:start + rows] = np.where(block > 0, scores, -1).argmax(axis=1)
+        return choices
+
+    @profiled
+    def _feedback_rows(self, guesses: np.ndarray) -> np.ndarray:
+        if self.patterns is not None:
+            return np.asarray(self.patterns.matrix[guesses])
+        return feedback_codes(self.encoded[guesses], self.encoded)
+
+    @profiled
+    def _choose(self, alive: np.ndarray) -> np.ndarray:
+        """Dictionary index of the next guess for every row of `alive`"""
+        if self.solver_name == 'Pruning':
+            return alive.argmax(axis=1)
+        if self.incremental:
+            return self._incremental_choices(alive)
+        if self.scores is not None:
+            return np.where(alive, self.scores, -np.inf).argmax(axis=1)
+
+        states, inverse = np.unique(np.packbits(alive, axis=1), axis=0, return_inverse=True)
+        choices = np.empty(len(states), dtype=np.int64)
+        for i, state in enumerate(states):
+            self.solver.candidates.indices = np.flatnonzero(np.unpackbits(state)[:len(self.words)])
+            choices[i] = self.index[self.solver.get_next_guess()]
+        return choices[inverse.ravel()]
+
+    def _solve_batch(self, targets: np.ndarray):
+        n_games = len(targets)
+        alive = np.ones((n_games, len(self.words)), dtype=bool)
+        active = np.arange(n_games)
+        guesses = np.zeros(n_games, dtype=np.int64)
+        burndowns = [[len(self.words)] for _ in range(n_games)]
+
+        for _ in range(MAX_ROUNDS):
+            if not len(active):
+                break
+            choice = self._choose(alive[active])
+            guesses[active] += 1
+
+            unique, inverse = np.unique(choice, return_inverse=True)
+            rows = self._feedback_rows(unique)[inverse.ravel()]
+            feedback = rows[np.arange(len(active)), targets[active]]
+
+            alive[active] &= rows == feedback[:, None]
+            unsolved = feedback != self.solved
+            active = active[unsolved]
+            for game, size in zip(active, alive[active].sum(axis=1)):
+                burndowns[game].append(int(size))
+            count_guess()
+        if len(active):
+            raise RuntimeError(f'{len(active)} games unsolved after {MAX_ROUNDS} rounds')
+
+        return guesses, burndowns
+
+    def solve_many(self, targets: Sequence[str], batch_size: Optional[int] = None) -> Dict[str, object]:
+        """Play one game per target; returns 'guesses' (array) and 'burndowns' (lists, as in compare.py)"""
+        target_indices = np.array([self.index[target] for target in targets], dtype=np.int64)
+        batch_size = batch_size or max(1, _BATCH_ELEMENTS // max(1, len(self.words)))
+
+        guesses, burndowns = [], []
+        for start in range(0, len(target_indices), batch_size):
+            batch_guesses, batch_burndowns = self._solve_batch(target_indices[start:start + batch_size])
+            guesses.append(batch_guesses)
+            burndowns.extend(batch_burndowns)
+        return {
+            'guesses': np.concatenate(guesses) if guesses else np.zeros(0, dtype=np.int64),
+            'burndowns': burndowns
+        }
+
+
+def solve_many(word_list, targets: Sequence[str], solver_names: Sequence[str] = ('Frequency',),
+               patterns=None, **options) -> Dict[str, List[List[int]]]:
+    """Burndowns of every target for each solver, in the {solver: [burndown, ...]} form plot_burndown takes"""
+    return {name: LockstepSolver(word_list, name, patterns, **options).solve_many(targets)['burndowns']
+            for name in solver_names}
@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import Future
+from typing import List, Optional
+
+from circuitcache import get_simulator
+
+
+class CircuitBatcher:
+    """Collects transpiled circuits from any thread and runs them as multi-experiment Aer jobs
+
+    A background thread waits up to `max_wait` seconds for more submissions
+    (or until `max_batch` are pending), then submits them all in one
+    simulator.run call with Aer's parallel-experiment support enabled and
+    hands each caller its own counts through a Future.
+    """
+
+    def __init__(self, simulator=None, max_batch: int = 64, max_wait: float = 0.002):
+        self.simulator = simulator if simulator is not None else get_simulator()
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.jobs = 0
+        self.experiments = 0
+        self._pending = []
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def submit(self, transpiled, shots: int) -> Future:
+        future = Future()
+        with self._condition:
+            self._pending.append((transpiled, shots, future))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name='circuit-batcher', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def run_many(self, transpiled: List, shots: int) -> List[dict]:
+        """Submit several circuits and wait for all of their counts"""
+        futures = [self.submit(circuit, shots) for circuit in transpiled]
+        return [future.result() for future in futures]
+
+    def _loop(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                # Give concurrent callers a moment to add their circuits to this batch
+                self._condition.wait_for(lambda: len(self._pending) >= self.max_batch, timeout=self.max_wait)
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+            self._execute(batch)
+
+    def _execute(self, batch):
+        by_shots = {}
+        for item in batch:
+            by_shots.setdefault(item[1], []).append(item)
+
+        for shots, items in by_shots.items():
+            try:
+                job = self.simulator.run([circuit for circuit, _, _ in items], shots=shots,
+                                         max_parallel_experiments=0)
+                result = job.result()
+                for i, (_, _, future) in enumerate(items):
+                    future.set_result(result.get_counts(i))
+            except Exception as error:
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(error)
+            self.jobs += 1
+            self.experiments += len(items)
+
+    def stats(self) -> dict:
+        return {
+            'jobs': self.jobs,
+            'experiments': self.experiments,
+            'mean_batch': self.experiments / self.jobs if self.jobs else 0.0
+        }
+
+
+_batcher: Optional[CircuitBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher() -> CircuitBatcher:
+    """The process-wide batcher shared by every game in the process"""
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = CircuitBatcher()
+        return _batcher
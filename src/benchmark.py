@@ -0,0 +1,214 @@
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import sys
+import time
+from functools import lru_cache, partial
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+import qiskit
+from qiskit import transpile
+
+from wordle import Wordle
+from classicalSolver import PruninghWordleSolver, FrequencyWordleSolver, EntropyWordleSolver
+from hybridSolver import HybridWordleSolver, PositionEvaluationCircuit, SimpleOracleBuilder
+from circuitcache import get_simulator
+from patterns import load_pattern_matrix, MAX_MATRIX_WORDS
+
+DATASETS = ['l5_a5', 'l5_a6', 'unique_words', 'dictionary', 'l5_a13']
+
+SOLVERS = {
+    'Pruning': PruninghWordleSolver,
+    'Frequency': FrequencyWordleSolver,
+    'Entropy': EntropyWordleSolver,
+    'Hybrid': HybridWordleSolver
+}
+
+
+def measure(fn: Callable, setup: Optional[Callable] = None, number: int = 1,
+            min_time: float = 0.5, min_repeats: int = 3, max_repeats: int = 100) -> dict:
+    """Time `fn(setup())` repeatedly; setup is not timed and `number` calls make one repeat
+
+    The first repeat warms caches and is discarded, unless it alone takes
+    `min_time` seconds, in which case it is the only measurement. Otherwise
+    repeats stop once `min_time` seconds have been timed and `min_repeats`
+    were made. Times are seconds per call.
+    """
+    def timed():
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        fn(arg)
+        return time.perf_counter() - start
+
+    times = []
+    warmup = timed()
+    if warmup >= min_time:
+        times.append(warmup / number)
+    while len(times) < max_repeats and not (sum(times) * number >= min_time and len(times) >= min_repeats):
+        if times and times[0] * number >= min_time:
+            break
+        times.append(timed() / number)
+
+    times = np.array(times)
+    return {
+        'median': float(np.median(times)),
+        'min': float(times.min()),
+        'mean': float(times.mean()),
+        'repeats': len(times),
+        'number': number
+    }
+
+
+def dataset_benchmarks(dataset: str, seed: int = 0) -> Dict[str, Callable[[], tuple]]:
+    """Benchmarks for one dataset, as name -> thunk returning (fn, setup, number)
+
+    Only the word list is loaded here; the pattern matrix and circuits are
+    built by the first thunk that needs them, so a filtered run skips the
+    setup of benchmarks it does not time. Entropy guesses are skipped on
+    datasets too large for a pattern matrix, where one takes minutes.
+    """
+    game = Wordle(f'../{dataset}.txt')
+    word_list = game.word_list
+    has_matrix = len(word_list) <= MAX_MATRIX_WORDS
+
+    @lru_cache(maxsize=None)
+    def patterns():
+        return load_pattern_matrix(word_list) if has_matrix else None
+
+    @lru_cache(maxsize=None)
+    def circuits():
+        position = PositionEvaluationCircuit(list(random.Random(seed).choice(word_list.words)), 0)
+        oracle = SimpleOracleBuilder('pos_0', position.qubit_count, position._get_solutions_for_position())
+        circuit = position.build()
+        simulator = get_simulator()
+        return oracle, circuit, simulator, transpile(circuit, simulator)
+
+    # The same opening for every solver, so update and guess timings skip
+    # opening-guess scoring (memoized per dictionary) and compare like for like
+    opening = random.Random(seed).choice(word_list.words)
+
+    def evaluate_guess():
+        rng = random.Random(seed)
+        pairs = [(rng.choice(word_list.words), rng.choice(word_list.words)) for _ in range(1000)]
+
+        def evaluate_guesses(_):
+            for target, guess in pairs:
+                game.target_word = target
+                game._evaluate_guess(guess)
+
+        return evaluate_guesses, None, len(pairs)
+
+    def new_solver(solver_class, rng):
+        target = rng.choice(word_list.words)
+        game.reset(target)
+        solver = solver_class(word_list, target_word=target, patterns=patterns(), rng=random.Random(seed))
+        return solver, game.make_guess(opening)['result']
+
+    def updated_solver(solver_class, rng):
+        solver, feedback = new_solver(solver_class, rng)
+        solver.update_possibilities(opening, feedback)
+        return solver
+
+    def update_possibilities(solver_class):
+        rng = random.Random(seed)
+        return (lambda state: state[0].update_possibilities(opening, state[1]),
+                lambda: new_solver(solver_class, rng), 1)
+
+    def get_next_guess(solver_class):
+        rng = random.Random(seed)
+        return lambda solver: solver.get_next_guess(), lambda: updated_solver(solver_class, rng), 1
+
+    benchmarks = {'evaluate_guess': evaluate_guess}
+    for name, solver_class in SOLVERS.items():
+        benchmarks[f'{name}.update_possibilities'] = partial(update_possibilities, solver_class)
+        if name != 'Entropy' or has_matrix:
+            benchmarks[f'{name}.get_next_guess'] = partial(get_next_guess, solver_class)
+
+    benchmarks['build_circuit'] = lambda: ((lambda _: circuits()[0].build_circuit()), None, 1)
+    benchmarks['transpile'] = lambda: ((lambda _: transpile(circuits()[1], circuits()[2])), None, 1)
+    benchmarks['simulate'] = lambda: ((lambda _: circuits()[2].run(circuits()[3], shots=1024).result()), None, 1)
+    return benchmarks
+
+
+def run_benchmarks(datasets, patterns=None, min_time: float = 0.5, seed: int = 0) -> dict:
+    results = {}
+    for dataset in datasets:
+        for name, benchmark in dataset_benchmarks(dataset, seed).items():
+            key = f'{dataset}/{name}'
+            if patterns and not any(fnmatch.fnmatch(key, pattern) for pattern in patterns):
+                continue
+            results[key] = measure(*benchmark(), min_time)
+            print(f"{key:45s} {results[key]['median'] * 1e3:12.4f} ms  ({results[key]['repeats']} repeats)")
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'qiskit': qiskit.__version__,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'seed': seed,
+            'min_time': min_time,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'results': results
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.1) -> list:
+    """Benchmarks whose median got slower than baseline by more than `threshold` (a fraction)"""
+    regressions = []
+    for key, base in baseline['results'].items():
+        if key not in current['results']:
+            continue
+        ratio = current['results'][key]['median'] / base['median'] if base['median'] else 1.0
+        status = 'REGRESSION' if ratio > 1 + threshold else 'improved' if ratio < 1 - threshold else ''
+        print(f"{key:45s} {base['median'] * 1e3:12.4f} -> {current['results'][key]['median'] * 1e3:12.4f} ms"
+              f"  x{ratio:6.3f}  {status}")
+        if status == 'REGRESSION':
+            regressions.append((key, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmarks for the solver and circuit hot paths')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Run benchmarks and save the timings')
+    run.add_argument('-d', '--datasets', nargs='+', default=DATASETS, help='Datasets, e.g. unique_words')
+    run.add_argument('-b', '--benchmarks', nargs='+',
+                     help='Only run benchmarks matching these patterns, e.g. "*/Entropy.*" or "l5_a5/*"')
+    run.add_argument('--min-time', type=float, default=0.5, help='Seconds to spend timing each benchmark')
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('-o', '--output', default='../result/benchmark.json')
+
+    compare = commands.add_parser('compare', help='Fail if a benchmark regressed against a baseline')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('-t', '--threshold', type=float, default=0.1,
+                         help='Allowed slowdown of the median, as a fraction (0.1 = 10%%)')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        results = run_benchmarks(args.datasets, args.benchmarks, args.min_time, args.seed)
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare_results(baseline, current, args.threshold)
+    if regressions:
+        print(f'{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from typing import Callable, Iterable
+
+from qiskit_aer import AerSimulator
+
+
+def circuit_key(qubit_count: int, solutions: Iterable[int], variant: str) -> str:
+    """Canonical hash of a circuit built from an oracle over `solutions`
+
+    Solution order does not matter, and solutions listed an even number of
+    times cancel in the oracle, so both are normalised away before hashing.
+    """
+    parity = Counter(int(solution) for solution in solutions)
+    marked = sorted(solution for solution, count in parity.items() if count % 2)
+    payload = f'{variant}|{qubit_count}|' + ','.join(map(str, marked))
+    return hashlib.sha1(payload.encode('ascii')).hexdigest()
+
+
+class CircuitCache:
+    """Thread-safe LRU cache of transpiled circuits, keyed by circuit_key"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_build(self, key: str, build: Callable):
+        """Return the cached circuit for `key`, calling `build()` on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        circuit = build()
+
+        with self._lock:
+            self._entries[key] = circuit
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return circuit
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# One simulator and one cache per process
+_simulator = None
+_simulator_lock = threading.Lock()
+circuit_cache = CircuitCache()
+
+
+def get_simulator() -> AerSimulator:
+    """The process-wide AerSimulator, created on first use"""
+    global _simulator
+    with _simulator_lock:
+        if _simulator is None:
+            _simulator = AerSimulator()
+        return _simulator
@@ -1,3 +1,15 @@
+import os
+
+import numpy as np
+
+from filters import CandidateSet
+from constraints import ConstraintSpace
+from decisiontree import load_or_build_tree
+from dictionary import ProductDictionary
+from patterns import DEFAULT_CACHE_DIR, dictionary_hash, feedback_to_code, pattern_entropies
+from profiling import profiled
+from search import best_entropy_guess
+
 class VanillaWordleSolver:
     def __init__(self, word_list, **kwargs):
         self.possible_words = set(word_list)
@@ -14,41 +26,54 @@ class VanillaWordleSolver:
 
 class PruninghWordleSolver:
     def __init__(self, word_list, **kwargs):
-        self.possible_words = set(word_list)
+        self.candidates = CandidateSet(word_list, kwargs.get('patterns'))
         self.feedback_history = []
         
+    @property
+    def possible_words(self):
+        return self.candidates.to_list()
+        
+    @profiled
     def update_possibilities(self, guess, feedback):
-        new_possibilities = set()
-        for word in self.possible_words:
-            if self._matches_feedback(word, guess, feedback):
-                new_possibilities.add(word)
-        self.possible_words = new_possibilities
+        self.candidates.update(guess, feedback)
         self.feedback_history.append((guess, feedback))
         
+    @profiled
     def get_next_guess(self):
-        return next(iter(self.possible_words))
-        
-    def _matches_feedback(self, candidate, guess, feedback):
-        for i, (letter, result) in enumerate(zip(guess, feedback)):
-            if result == 'correct' and candidate[i] != letter:
-                return False
-            elif result == 'absent' and letter in candidate:
-                return False
-            elif result == 'present' and (letter not in candidate or candidate[i] == letter):
-                return False
-        return True
+        return next(iter(self.candidates))
     
 class FrequencyWordleSolver:
     def __init__(self, word_list, **kwargs):
-        self.possible_words = set(word_list)
+        self.candidates = CandidateSet(word_list, kwargs.get('patterns'))
         self.feedback_history = []
         # Calculate letter frequencies once at initialization
         self.frequencies = self._calculate_initial_frequencies(word_list)
+        # Optionally track presence and per-position letter counts of the remaining candidates
+        self.incremental = kwargs.get('incremental', False)
+        if self.incremental:
+            self._count_candidates()
+        
+    def _count_candidates(self):
+        indices = self.candidates.indices
+        encoded = self.candidates.encode(indices)
+        self.presence_counts = self._letter_presence(indices).sum(axis=0)
+        self.position_counts = np.stack([np.bincount(encoded[:, i], minlength=26)
+                                         for i in range(self.candidates.word_length)])
+        self._counted = indices
+        
+    def _letter_presence(self, indices):
+        # (len(indices), 26) 0/1 matrix of the letters each word contains
+        return (self.candidates.pack(indices)[1][:, None] >> np.arange(26, dtype=np.uint32)) & 1
         
     def _calculate_initial_frequencies(self, word_list):
         frequencies = {}
         total_words = len(word_list)
         
+        # Compiled dictionaries ship their letter counts
+        letter_counts = getattr(word_list, 'letter_counts', None)
+        if letter_counts is not None:
+            return {chr(ord('a') + i): int(count) / total_words for i, count in enumerate(letter_counts) if count}
+            
         # Count letter occurrences
         for word in word_list:
             for letter in word:
@@ -60,22 +85,37 @@ class FrequencyWordleSolver:
             
         return frequencies
         
+    @property
+    def possible_words(self):
+        return self.candidates.to_list()
+        
+    @profiled
     def update_possibilities(self, guess, feedback):
-        new_possibilities = set()
-        for word in self.possible_words:
-            if self._matches_feedback(word, guess, feedback):
-                new_possibilities.add(word)
-        self.possible_words = new_possibilities
+        counted = self.incremental and self.candidates.indices is self._counted
+        removed = self.candidates.update(guess, feedback)
         self.feedback_history.append((guess, feedback))
+        if counted:
+            # Subtract the eliminated words; counts are replaced, not modified, so forked solvers stay independent
+            self.presence_counts = self.presence_counts - self._letter_presence(removed).sum(axis=0)
+            encoded = self.candidates.encode(removed)
+            self.position_counts = self.position_counts - np.stack(
+                [np.bincount(encoded[:, i], minlength=26)
+                 for i in range(self.candidates.word_length)])
+            self._counted = self.candidates.indices
         
+    @profiled
     def get_next_guess(self):
+        if self.incremental:
+            return self._best_incremental_guess()
+            
         # Score each word based on initial frequencies
         best_score = float('-inf')
         best_word = None
         
         for word in self.possible_words:
-            # Score based on unique letters using pre-calculated frequencies
-            score = sum(self.frequencies[letter] for letter in set(word))
+            # Score based on unique letters using pre-calculated frequencies, summed in a fixed order
+            # so ties break the same way whatever the process's string hashing
+            score = sum(self.frequencies[letter] for letter in sorted(set(word)))
             
             if score > best_score:
                 best_score = score
@@ -83,15 +123,169 @@ class FrequencyWordleSolver:
                 
         return best_word if best_word else next(iter(self.possible_words))
         
-    def _matches_feedback(self, candidate, guess, feedback):
-        for i, (letter, result) in enumerate(zip(guess, feedback)):
-            if result == 'correct' and candidate[i] != letter:
-                return False
-            elif result == 'absent' and letter in candidate:
-                return False
-            elif result == 'present' and (letter not in candidate or candidate[i] == letter):
-                return False
-        return True
+    def _best_incremental_guess(self):
+        # Candidates set from outside (transposition table, decision tree) are recounted
+        if self.candidates.indices is not self._counted:
+            self._count_candidates()
+            
+        # Presence plus positional frequency of every remaining word, one argmax
+        indices = self.candidates.indices
+        encoded = self.candidates.encode(indices)
+        scores = self._letter_presence(indices) @ self.presence_counts
+        for i in range(self.candidates.word_length):
+            scores = scores + self.position_counts[i, encoded[:, i]]
+        return self.candidates.words[indices[np.argmax(scores)]]
+
+# Above this many (guess, candidate) pairs EntropyWordleSolver searches by branch and bound unless told otherwise
+BOUNDED_SEARCH_PAIRS = 1 << 20
+
+class EntropyWordleSolver:
+    # Opening guess per dictionary, shared by every game in the process
+    _openings = {}
+    
+    def __init__(self, word_list, **kwargs):
+        self.candidates = CandidateSet(word_list, kwargs.get('patterns'))
+        self.feedback_history = []
+        # Skip guesses whose entropy bound cannot beat the best found (same guess, less scoring):
+        # True or False forces it, None uses it when the full scan would score many pairs
+        self.branch_and_bound = kwargs.get('branch_and_bound')
+        self.cache_dir = kwargs.get('cache_dir', DEFAULT_CACHE_DIR)
+        
+    @property
+    def possible_words(self):
+        return self.candidates.to_list()
+        
+    @profiled
+    def update_possibilities(self, guess, feedback):
+        self.candidates.update(guess, feedback)
+        self.feedback_history.append((guess, feedback))
+        
+    @profiled
+    def get_next_guess(self):
+        if len(self.candidates) <= 2:
+            return next(iter(self.candidates))
+        
+        # Every game on a dictionary opens with the same guess, so score it once
+        if len(self.candidates) == len(self.candidates.words):
+            key = self.candidates.content_hash
+            if key not in self._openings:
+                self._openings[key] = self._load_or_score_opening(key)
+            return self._openings[key]
+        
+        return self._best_guess()
+        
+    def _load_or_score_opening(self, key):
+        # Kept next to the pattern matrices, so other processes and later runs skip the search
+        if self.cache_dir is None:
+            return self._best_guess()
+        path = os.path.join(self.cache_dir, f'opening_entropy_{key}.txt')
+        if os.path.exists(path):
+            with open(path) as f:
+                return f.read().strip()
+        guess = self._best_guess()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(guess)
+        os.replace(tmp_path, path)
+        return guess
+        
+    def _best_guess(self):
+        bounded = self.branch_and_bound
+        if bounded is None:
+            bounded = len(self.candidates.words) * len(self.candidates) > BOUNDED_SEARCH_PAIRS
+        if bounded:
+            return self.candidates.words[best_entropy_guess(self.candidates)[0]]
+            
+        # Expected information of every allowed guess, from one batch of histograms
+        codes = self.candidates.codes_matrix()
+        scores = pattern_entropies(codes, self.candidates.word_length)
+        
+        # Among equally informative guesses prefer one that could still be the answer
+        best = np.flatnonzero(scores >= scores.max() - 1e-9)
+        remaining = best[np.isin(best, self.candidates.indices)]
+        return self.candidates.words[remaining[0] if len(remaining) else best[0]]
+
+class TreeWordleSolver:
+    """Replays a deterministic solver from its precomputed DecisionTree
+
+    The tree only holds the solver's own guesses. After a guess from off the
+    tree the game is replayed on a live `tree_solver`, which plays the rest.
+    """
+    # Trees per (dictionary, solver), shared by every game in the process
+    _trees = {}
+    
+    def __init__(self, word_list, **kwargs):
+        self.word_list = word_list
+        self.tree_solver = kwargs.get('tree_solver', 'Frequency')
+        self.patterns = kwargs.get('patterns')
+        self.cache_dir = kwargs.get('cache_dir', DEFAULT_CACHE_DIR)
+        self.tree = kwargs.get('tree') or self._load_tree(word_list, self.tree_solver, self.patterns, self.cache_dir)
+        self.node = 0
+        self.solver = None
+        self.feedback_history = []
+        
+    @classmethod
+    def _load_tree(cls, word_list, solver_name, patterns=None, cache_dir=DEFAULT_CACHE_DIR):
+        # Shared WordTables hash their words once, so this lookup is cheap on every game
+        key = (dictionary_hash(word_list), solver_name)
+        if key not in cls._trees:
+            cls._trees[key] = load_or_build_tree(word_list, solver_name, cache_dir, patterns=patterns)
+        return cls._trees[key]
+        
+    @property
+    def possible_words(self):
+        if self.solver is not None:
+            return self.solver.possible_words
+        return self.tree.candidates(self.node)
+        
+    @profiled
+    def update_possibilities(self, guess, feedback):
+        if self.solver is None and guess != self.tree.words[self.tree.guess[self.node]]:
+            self.solver = DETERMINISTIC_SOLVERS[self.tree_solver](self.word_list, patterns=self.patterns,
+                                                                  cache_dir=self.cache_dir)
+            for past_guess, past_feedback in self.feedback_history:
+                self.solver.update_possibilities(past_guess, past_feedback)
+        if self.solver is not None:
+            self.solver.update_possibilities(guess, feedback)
+        else:
+            self.node = self.tree.child(self.node, feedback_to_code(feedback))
+        self.feedback_history.append((guess, feedback))
+        
+    @profiled
+    def get_next_guess(self):
+        if self.solver is not None:
+            return self.solver.get_next_guess()
+        return self.tree.words[self.tree.guess[self.node]]
+
+class SymbolicWordleSolver:
+    """PruninghWordleSolver play on a full product dictionary, with the candidates kept as constraints"""
+    def __init__(self, word_list, **kwargs):
+        if not isinstance(word_list, ProductDictionary):
+            raise ValueError('SymbolicWordleSolver needs a full product dictionary (an l{L}_a{A} ProductDictionary)')
+        self.candidates = ConstraintSpace(word_list.word_length, word_list.alphabet_size)
+        self.feedback_history = []
+        
+    @property
+    def possible_words(self):
+        # Sized and iterable without being listed
+        return self.candidates
+        
+    @profiled
+    def update_possibilities(self, guess, feedback):
+        self.candidates.update(guess, feedback)
+        self.feedback_history.append((guess, feedback))
+        
+    @profiled
+    def get_next_guess(self):
+        return self.candidates.nth(0)
+
+# Solvers whose guesses depend only on the feedback so far, so their games form a DecisionTree
+DETERMINISTIC_SOLVERS = {
+    'Pruning': PruninghWordleSolver,
+    'Frequency': FrequencyWordleSolver,
+    'Entropy': EntropyWordleSolver
+}
 
 # from wordle import Wordle    
     
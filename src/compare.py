@@ -1,68 +1,288 @@
 import matplotlib.pyplot as plt
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 import numpy as np
 import seaborn as sns
 
-import sys
+import argparse
+import json
+import os
+import random
 
 sns.set_theme(context="paper", style="white", font_scale=3)
 
-dataset = sys.argv[1]
-n_repeat = int(sys.argv[2])
-
 from wordle import Wordle
-from classicalSolver import PruninghWordleSolver, FrequencyWordleSolver
+from classicalSolver import PruninghWordleSolver, FrequencyWordleSolver, EntropyWordleSolver, TreeWordleSolver, SymbolicWordleSolver, DETERMINISTIC_SOLVERS
 from hybridSolver import HybridWordleSolver
+from patterns import DEFAULT_CACHE_DIR, load_pattern_matrix, MAX_MATRIX_WORDS
+from backends import BACKENDS
+from oracles import SYNTHESIS_MODES
+from transposition import TransposedSolver, transposition_table
+import profiling
+from batch import LockstepSolver
+from decisiontree import load_or_build_tree
+from aggregate import BurndownAggregator, render_summary
+
+SOLVERS = {
+    # 'Vanilla': VanillaWordleSolver,
+    'Pruning': PruninghWordleSolver,
+    'Frequency': FrequencyWordleSolver,
+    'Entropy': EntropyWordleSolver,
+    'Tree': TreeWordleSolver,
+    'Hybrid': HybridWordleSolver,
+    # Only for full l{L}_a{A} product spaces, e.g. a virtual ../l6_a26.txt
+    'Symbolic': SymbolicWordleSolver
+}
+
+DEFAULT_SOLVERS = [name for name in SOLVERS if name != 'Symbolic']
+
+# Plot color of each solver, shared by the burndown plot and the headless summary
+SOLVER_COLORS = {'Vanilla': 'orange', 'Pruning': 'blue', 'Frequency': 'green', 'Entropy': 'purple',
+                 'Tree': 'brown', 'Hybrid': 'red', 'Symbolic': 'cyan'}
+
+# Per-process game state, loaded once by _init_worker
+_worker = {}
+
+def _init_worker(dataset, options=None, cache_dir=DEFAULT_CACHE_DIR):
+    _worker['path'] = f'../{dataset}.txt'
+    _worker['options'] = options or {}
+    _worker['cache_dir'] = cache_dir
+    word_list = Wordle(_worker['path']).word_list
+    # Feedback for every word pair is computed once and cached on disk
+    _worker['patterns'] = load_pattern_matrix(word_list, cache_dir) if len(word_list) <= MAX_MATRIX_WORDS else None
+    if _worker['options'].get('profile'):
+        profiling.enable(memory=_worker['options'].get('profile_memory', False))
+    if _worker['options'].get('transposition_file'):
+        transposition_table.load(_worker['options']['transposition_file'])
+        # New entries go back to the parent, which merges every worker's and writes the file once
+        transposition_table.track_additions()
+
+def play_game(task):
+    """Play one game in the current process and return its record"""
+    solver_name, game_index, target, seed = task
+    options = _worker['options']
+
+    # Each game has its own Wordle (over the shared word table) and its own
+    # seeded generator, so games can also run concurrently in threads
+    profiler = profiling.get_profiler()
+    if profiler is not None:
+        profiler.start_game(f'{solver_name}/{game_index}')
+
+    game = Wordle(_worker['path'])
+    game.reset(target)
+    solver = SOLVERS[solver_name](game.word_list, target_word = game.target_word, patterns = _worker['patterns'],
+                                  rng = random.Random(seed), backend = options.get('backend'),
+                                  synthesis = options.get('synthesis', 'mcx'),
+                                  adaptive_shots = options.get('adaptive_shots', False),
+                                  block_size = options.get('block_size'),
+                                  block_workers = options.get('block_workers', 0),
+                                  incremental = options.get('incremental', False),
+                                  branch_and_bound = options.get('branch_and_bound'),
+                                  cache_dir = _worker['cache_dir'])
+    if options.get('transpositions') and solver_name in DETERMINISTIC_SOLVERS:
+        # Games on the same path share their pruning and scoring through the process-wide table
+        mode = '-incremental' if options.get('incremental') else ''
+        solver = TransposedSolver(solver, transposition_table, solver_name + mode)
+
+    # Track remaining possibilities for this game
+    game_burndown = [len(solver.possible_words)]
+
+    while True:
+        guess = solver.get_next_guess()
+        result = game.make_guess(guess)
+        if all(x == 'correct' for x in result['result']):
+            break
+        solver.update_possibilities(guess, result['result'])
+        game_burndown.append(len(solver.possible_words))
 
-def compare_solvers(n_games=n_repeat): #500
-    results = defaultdict(list)
-    solvers = {
-        # 'Vanilla': VanillaWordleSolver,
-        'Pruning': PruninghWordleSolver,
-        'Frequency': FrequencyWordleSolver,
-        'Hybrid': HybridWordleSolver
+    record = {
+        'solver': solver_name,
+        'game': game_index,
+        'seed': seed,
+        'target': target,
+        'guesses': game.attempts,
+        'burndown': game_burndown
     }
-    
-    for solver_name, solver_class in solvers.items():
-        for _ in range(n_games):
-            if _ % 10 == 0:
-                print(solver_name, " ", _ ,"/", n_games)
-            game = Wordle(f'../{dataset}.txt')
-            game.start_game()
-            solver = solver_class(game.word_list, target_word = game.target_word)
-            
-            # Track remaining possibilities for this game
-            game_burndown = [len(solver.possible_words)]
-            
-            while True:
-                guess = solver.get_next_guess()
-                result = game.make_guess(guess)
-                if all(x == 'correct' for x in result['result']):
-                    break
-                solver.update_possibilities(guess, result['result'])
-                game_burndown.append(len(solver.possible_words))
-            
-            results[solver_name].append(game_burndown)
+    if hasattr(solver, 'shots_used'):
+        record['shots'] = solver.shots_used
+    if isinstance(solver, TransposedSolver):
+        record['transposition_hits'] = solver.hits
+        record['transposition_lookups'] = solver.lookups
+    if profiler is not None:
+        record['trace'] = profiler.end_game()
+    return record
+
+def play_games(tasks):
+    """Play a chunk of games on concurrent threads, so their circuits can share batched jobs
+
+    Returns the records and the transposition entries added meanwhile.
+    """
+    with ThreadPoolExecutor(max_workers=_worker['options'].get('game_threads', 1)) as threads:
+        records = list(threads.map(play_game, tasks))
+    return records, transposition_table.take_additions()
+
+def exhaustive_records(word_list, solver_name, patterns=None, **kwargs):
+    """One record per dictionary word for a deterministic solver, from its DecisionTree
+
+    The solver runs once per tree node, on the targets consistent with that
+    node's history, so every target's exact guess count and burndown cost
+    about one game per distinct branch. Records are in dictionary order.
+    """
+    tree = load_or_build_tree(word_list, solver_name, patterns=patterns, **kwargs)
+    burndowns = tree.burndowns()
+    solved = sorted(zip(tree.targets.tolist(), tree.target_guesses.tolist()))
+    return [{'solver': solver_name, 'game': i, 'seed': None, 'target': tree.words[target],
+             'guesses': guesses, 'burndown': burndowns[target]}
+            for i, (target, guesses) in enumerate(solved)]
+
+@contextmanager
+def _batch_trace(label, traces):
+    """Record the phases of work done in this process outside play_game as one trace, added to `traces`"""
+    profiler = profiling.get_profiler()
+    if profiler is not None:
+        profiler.start_game(label)
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            events = profiler.end_game()
+            if traces is not None:
+                traces.extend(events)
+
+def compare_solvers(dataset, n_games=500, solver_names=None, workers=None, seed=0, aggregator=None,
+                    keep_records=True, traces=None, cache_dir=DEFAULT_CACHE_DIR, **options):
+    """Play n_games per solver on a dataset, spread across a process pool
+
+    Targets and per-game seeds are derived from `seed`, so a run is
+    reproducible regardless of the number of workers. `options` are
+    backend, synthesis, adaptive_shots, block_size and block_workers (hybrid
+    position circuits split into blocks, run on that many processes),
+    game_threads (games played concurrently per worker; use with the
+    aer-batched backend),
+    transpositions and transposition_file (share solver states across games,
+    optionally persisted between runs), incremental (FrequencyWordleSolver
+    tracks letter counts of the remaining candidates), branch_and_bound
+    (EntropyWordleSolver always prunes its guess search by entropy
+    bounds, not only on large candidate sets),
+    profile and profile_memory (record phase events; see `traces`), lockstep (play the deterministic solvers' games
+    as one batch per solver in this process) and exhaustive (play the
+    deterministic solvers against every dictionary word through their
+    decision trees, in place of the sampled targets).
+
+    Finished games are added to `aggregator` (a BurndownAggregator) as they
+    arrive; with keep_records=False they are not kept, so memory stays flat.
+    When profiling, the phase events of every game, lockstep batch and
+    exhaustive evaluation are added to `traces` (a list), with or without
+    records. Pattern matrices, Entropy openings and decision trees are
+    cached in `cache_dir`, or kept in memory when it is None.
+    """
+    solver_names = solver_names or DEFAULT_SOLVERS
+    workers = workers or os.cpu_count()
+
+    _init_worker(dataset, options, cache_dir)
+    word_list = Wordle(_worker['path']).word_list
+    words = word_list.words
+    rng = random.Random(seed)
+    games = [(rng.choice(words), rng.getrandbits(63)) for _ in range(n_games)]
+
+    results = []
+    total = len(games) * len(solver_names)
+    done = 0
+
+    def collect(record):
+        nonlocal done
+        done += 1
+        trace = record.pop('trace', None)
+        if trace and traces is not None:
+            traces.extend(trace)
+        if aggregator is not None:
+            aggregator.add_record(record)
+        if keep_records:
+            results.append(record)
+    if options.get('exhaustive'):
+        # Deterministic solvers are evaluated on every target instead of the sampled games
+        exhaustive = [name for name in solver_names if name in DETERMINISTIC_SOLVERS]
+        solver_names = [name for name in solver_names if name not in exhaustive]
+        total = len(games) * len(solver_names) + len(words) * len(exhaustive)
+        for solver_name in exhaustive:
+            with _batch_trace(f'{solver_name}/exhaustive', traces):
+                records = exhaustive_records(word_list, solver_name, _worker['patterns'],
+                                             incremental=options.get('incremental', False),
+                                             branch_and_bound=options.get('branch_and_bound'),
+                                             cache_dir=cache_dir)
+            for record in records:
+                collect(record)
+            print(solver_name, " ", done, "/", total)
+    if options.get('lockstep'):
+        lockstep = [name for name in solver_names if name in DETERMINISTIC_SOLVERS]
+        solver_names = [name for name in solver_names if name not in lockstep]
+        for solver_name in lockstep:
+            with _batch_trace(f'{solver_name}/lockstep', traces):
+                batch = LockstepSolver(word_list, solver_name, _worker['patterns'],
+                                       incremental=options.get('incremental', False),
+                                       branch_and_bound=options.get('branch_and_bound'),
+                                       cache_dir=cache_dir)
+                played = batch.solve_many([target for target, _ in games])
+            for i, (target, game_seed) in enumerate(games):
+                collect({'solver': solver_name, 'game': i, 'seed': game_seed, 'target': target,
+                         'guesses': int(played['guesses'][i]), 'burndown': played['burndowns'][i]})
+            print(solver_name, " ", done, "/", total)
+
+    # Every solver plays the same targets with the same seeds
+    tasks = [(solver_name, i, target, game_seed)
+             for solver_name in solver_names
+             for i, (target, game_seed) in enumerate(games)]
+    chunk = max(options.get('game_threads', 1), len(tasks) // (workers * 8), 1)
+    chunks = [tasks[i:i + chunk] for i in range(0, len(tasks), chunk)]
+
+    if workers == 1:
+        batches = map(play_games, chunks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(dataset, options, cache_dir))
+        batches = pool.map(play_games, chunks)
+
+    for batch, additions in batches:
+        transposition_table.merge(additions)
+        for record in batch:
+            collect(record)
+            if done % 10 == 0:
+                print(record['solver'], " ", done, "/", total)
+
+    if pool is not None:
+        pool.shutdown()
+    if options.get('transposition_file'):
+        transposition_table.save(options['transposition_file'])
 
-    plot_burndown(results)
     return results
 
-def plot_burndown(results):
+def save_results(results, path, **metadata):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({**metadata, 'games': results}, f)
+
+def group_burndowns(results):
+    burndowns = defaultdict(list)
+    for record in results:
+        burndowns[record['solver']].append(record['burndown'])
+    return burndowns
+
+def plot_burndown(results, dataset, n_repeat):
     plt.figure(figsize=(16, 8))
     
-    colors = {'Vanilla': 'orange', 'Pruning': 'blue','Frequency':'green','Hybrid':'red'}
-    
     for solver_name, burndowns in results.items():
         # Plot individual traces with high transparency
         for trace in burndowns:
-            plt.plot(trace, alpha=10/len(burndowns), color=colors[solver_name], linewidth=1)
+            plt.plot(trace, alpha=min(1, 10/len(burndowns)), color=SOLVER_COLORS[solver_name], linewidth=1)
             
         max_len = max(len(b) for b in burndowns)
         padded = [b + [1]*(max_len - len(b)) for b in burndowns]
         means = np.mean(padded, axis=0)
         plt.plot(means, 
                 label=solver_name,
-                color=colors[solver_name], 
+                color=SOLVER_COLORS[solver_name], 
                 linestyle='-.',
                 linewidth=6, 
                 alpha=.5)
@@ -78,8 +298,94 @@ def plot_burndown(results):
     
     plt.tight_layout()
     
+    os.makedirs("../result/figures", exist_ok=True)
     plt.savefig(f"../result/figures/compare_{dataset}_{n_repeat}.png")
     plt.savefig(f"../result/figures/compare_{dataset}_{n_repeat}.pdf")
     plt.show()
-    
-results = compare_solvers()
\ No newline at end of file
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare Wordle solvers on a dataset')
+    parser.add_argument('dataset', help='Dataset name, e.g. unique_words for ../unique_words.txt')
+    parser.add_argument('n_games', type=int, nargs='?', default=500, help='Games per solver')
+    parser.add_argument('-s', '--solvers', nargs='+', choices=list(SOLVERS), default=DEFAULT_SOLVERS,
+                        help='Solvers to compare')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(), help='Number of worker processes')
+    parser.add_argument('-b', '--backend', choices=list(BACKENDS), default='aer',
+                        help='Simulation backend for the hybrid solver')
+    parser.add_argument('--synthesis', choices=SYNTHESIS_MODES, default='mcx',
+                        help='Oracle synthesis mode for the hybrid solver circuits')
+    parser.add_argument('--adaptive-shots', action='store_true',
+                        help='Sample hybrid circuits in rounds until the position ranking is settled')
+    parser.add_argument('--block-size', type=int,
+                        help='Hybrid solver splits each position circuit into blocks of this many entries')
+    parser.add_argument('--block-workers', type=int, default=0,
+                        help='Processes per game that run the hybrid block circuits (with --block-size)')
+    parser.add_argument('-t', '--game-threads', type=int, default=1,
+                        help='Games played concurrently in each worker (their circuits are batched with aer-batched)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Frequency solver scores by letter counts of the remaining candidates, kept up to date')
+    parser.add_argument('--branch-and-bound', action='store_true', default=None,
+                        help='Entropy solver always skips guesses whose entropy bound cannot beat the best found '
+                             '(by default only on large candidate sets)')
+    parser.add_argument('--transpositions', action='store_true',
+                        help='Share solver states between games with the same feedback history')
+    parser.add_argument('--transposition-file', help='Load and save the transposition table (.npz) between runs')
+    parser.add_argument('--lockstep', action='store_true',
+                        help='Play the deterministic solvers as one batch of games per solver')
+    parser.add_argument('--exhaustive', action='store_true',
+                        help='Evaluate the deterministic solvers on every word of the dataset through their decision trees')
+    parser.add_argument('--profile', help='Write a JSONL trace of every solver and circuit phase to this file, '
+                                          'and a per-phase summary next to it')
+    parser.add_argument('--profile-memory', action='store_true', help='Also record peak memory per phase (slower)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for targets and per-game solver seeds')
+    parser.add_argument('-o', '--output', help='Results file (default ../result/compare_<dataset>_<n_games>.json)')
+    parser.add_argument('--no-plot', action='store_true', help='Only write the results file')
+    parser.add_argument('--headless', action='store_true',
+                        help='Render summary figures from the aggregate file instead of one line per game')
+    parser.add_argument('--no-records', action='store_true',
+                        help='Keep only the aggregate (.npz), not every game in the .json results')
+    args = parser.parse_args()
+
+    aggregator = BurndownAggregator()
+    aggregator.metadata = {'dataset': args.dataset, 'n_games': args.n_games, 'seed': args.seed,
+                           'exhaustive': args.exhaustive}
+    events = [] if args.profile else None
+    results = compare_solvers(args.dataset, args.n_games, args.solvers, args.workers, args.seed,
+                              aggregator=aggregator, keep_records=not args.no_records, traces=events,
+                              backend=args.backend, synthesis=args.synthesis, game_threads=args.game_threads,
+                              adaptive_shots=args.adaptive_shots, block_size=args.block_size,
+                              block_workers=args.block_workers, incremental=args.incremental,
+                              branch_and_bound=args.branch_and_bound,
+                              transpositions=args.transpositions or bool(args.transposition_file),
+                              transposition_file=args.transposition_file,
+                              profile=bool(args.profile), profile_memory=args.profile_memory,
+                              lockstep=args.lockstep, exhaustive=args.exhaustive)
+
+    if args.profile:
+        if not events:
+            print('Warning: no profiling events were recorded')
+        profiling.write_trace(events, args.profile)
+        summary = profiling.summarize(events)
+        with open(os.path.splitext(args.profile)[0] + '.summary.json', 'w') as f:
+            json.dump(summary, f, indent=2)
+        for name, entry in summary.items():
+            print(f"{name:45s} {entry['calls']:7d} calls  {entry['total']:9.3f}s total  {entry['mean'] * 1e3:9.3f} ms mean")
+
+    lookups = sum(record.get('transposition_lookups', 0) for record in results)
+    if lookups:
+        hits = sum(record.get('transposition_hits', 0) for record in results)
+        print(f"Transposition table: {hits} / {lookups} lookups hit ({hits / lookups:.1%})")
+
+    output = args.output or f"../result/compare_{args.dataset}_{args.n_games}.json"
+    aggregator.save(os.path.splitext(output)[0] + '.npz')
+    if not args.no_records:
+        save_results(results, output, dataset=args.dataset, n_games=args.n_games, seed=args.seed,
+                     backend=args.backend, synthesis=args.synthesis, exhaustive=args.exhaustive)
+
+    if args.headless:
+        render_summary(aggregator, f"../result/figures/summary_{args.dataset}_{args.n_games}", colors=SOLVER_COLORS)
+    elif not args.no_plot and not args.no_records:
+        plot_burndown(group_burndowns(results), args.dataset, args.n_games)
+
+if __name__ == '__main__':
+    main()
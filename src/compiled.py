@@ -0,0 +1,189 @@
+import argparse
+import os
+import struct
+from typing import Iterator, Optional
+
+import numpy as np
+
+from dictionary import WordTable, parse_dictionary
+from packed import packed_dtype
+from patterns import dictionary_hash
+
+COMPILED_SUFFIX = '.wdict'
+MAGIC = b'WORDDICT'
+VERSION = 1
+
+# magic, version, word length, word count, content hash (patterns.dictionary_hash, hex)
+_HEADER = struct.Struct('<8sIIQ40s')
+SECTIONS = ('letters', 'keys', 'packed', 'masks', 'letter_counts', 'presence_counts', 'position_counts')
+_SECTION = struct.Struct('<QQ')
+HEADER_SIZE = 256
+_ALIGN = 64
+
+
+def compiled_path(path: str) -> str:
+    """Where the compiled form of a text dictionary lives: next to it, with COMPILED_SUFFIX"""
+    return os.path.splitext(path)[0] + COMPILED_SUFFIX
+
+
+def word_keys(encoded: np.ndarray) -> np.ndarray:
+    """Base-26 value of each encoded word; sorted words have sorted keys"""
+    keys = np.zeros(len(encoded), dtype=np.uint64)
+    for i in range(encoded.shape[1]):
+        keys = keys * np.uint64(26) + encoded[:, i].astype(np.uint64)
+    return keys
+
+
+def compile_dictionary(path: str, output: Optional[str] = None, word_length: Optional[int] = None) -> str:
+    """Parse a text dictionary once and write it in the binary format read by CompiledWordTable
+
+    Layout: a HEADER_SIZE-byte header (fixed fields, then one (offset, size)
+    pair per entry of SECTIONS), followed by the sections, each 64-byte
+    aligned:
+    - letters: (N, L) uint8 letter indices, words in sorted order
+    - keys: N uint64 base-26 word values, for binary search
+    - packed / masks: packed.pack_encoded's 5-bit lanes and 26-bit letter masks
+    - letter_counts / presence_counts: 26 uint64, letter occurrences and
+      words containing each letter
+    - position_counts: (L, 26) uint64 occurrences per position
+    """
+    table = parse_dictionary(path, word_length)
+    output = output or compiled_path(path)
+    encoded = table.encoded
+    packed, masks = table.packed
+
+    position_counts = np.zeros((table.word_length, 26), dtype=np.uint64)
+    for i in range(table.word_length):
+        position_counts[i] = np.bincount(encoded[:, i], minlength=26)
+    presence_counts = np.array([np.count_nonzero(masks & np.uint32(1 << letter)) for letter in range(26)],
+                               dtype=np.uint64)
+    sections = {
+        'letters': np.ascontiguousarray(encoded),
+        'keys': word_keys(encoded),
+        'packed': packed,
+        'masks': masks,
+        'letter_counts': position_counts.sum(axis=0, dtype=np.uint64),
+        'presence_counts': presence_counts,
+        'position_counts': position_counts
+    }
+
+    header = _HEADER.pack(MAGIC, VERSION, table.word_length, len(table),
+                          dictionary_hash(table.words).encode('ascii'))
+    offset = HEADER_SIZE
+    layout = []
+    for name in SECTIONS:
+        offset = -(-offset // _ALIGN) * _ALIGN
+        layout.append((offset, sections[name].nbytes))
+        offset += sections[name].nbytes
+    header += b''.join(_SECTION.pack(*entry) for entry in layout)
+
+    tmp_path = f'{output}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        for name, (start, _) in zip(SECTIONS, layout):
+            f.write(b'\0' * (start - f.tell()))
+            f.write(sections[name].tobytes())
+    os.replace(tmp_path, output)
+    return output
+
+
+class CompiledWords:
+    """Sequence view of a CompiledWordTable's words, decoded from the letter matrix on access"""
+
+    def __init__(self, table: 'CompiledWordTable'):
+        self.table = table
+        self.content_hash = table.content_hash
+
+    def __len__(self):
+        return len(self.table)
+
+    def __getitem__(self, index):
+        return self.table[index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table)
+
+    def __contains__(self, word):
+        return word in self.table
+
+
+class CompiledWordTable(WordTable):
+    """WordTable backed by a memory-mapped compiled dictionary
+
+    Every array is a read-only view into the mapped file, so loading costs
+    no parsing and no per-word Python objects; words are decoded only when
+    indexed or iterated.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode='r')
+        magic, version, word_length, size, content_hash = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a version {VERSION} compiled dictionary')
+        self.word_length = word_length
+        self.size = size
+        self._content_hash = content_hash.decode('ascii')
+
+        layout = {name: _SECTION.unpack_from(self._map, _HEADER.size + i * _SECTION.size)
+                  for i, name in enumerate(SECTIONS)}
+
+        def section(name, dtype, shape):
+            start, nbytes = layout[name]
+            return self._map[start:start + nbytes].view(dtype).reshape(shape)
+
+        self._encoded = section('letters', np.uint8, (size, word_length))
+        self.keys = section('keys', np.uint64, (size,))
+        self._packed = (section('packed', packed_dtype(word_length), (size,)), section('masks', np.uint32, (size,)))
+        self.letter_counts = section('letter_counts', np.uint64, (26,))
+        self.presence_counts = section('presence_counts', np.uint64, (26,))
+        self.position_counts = section('position_counts', np.uint64, (word_length, 26))
+        self.words = CompiledWords(self)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self) -> Iterator[str]:
+        chunk = 1 << 16
+        for start in range(0, self.size, chunk):
+            block = (self._encoded[start:start + chunk] + ord('a')).tobytes().decode('ascii')
+            for i in range(0, len(block), self.word_length):
+                yield block[i:i + self.word_length]
+
+    def __contains__(self, word):
+        return self.index(word) is not None
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.size))]
+        return (self._encoded[index] + ord('a')).tobytes().decode('ascii')
+
+    def index(self, word: str) -> Optional[int]:
+        """Position of a word in the table by binary search on its key, or None"""
+        if not isinstance(word, str) or len(word) != self.word_length or not word.isascii():
+            return None
+        letters = np.frombuffer(word.encode('ascii'), dtype=np.uint8) - ord('a')
+        if letters.max() >= 26:
+            return None
+        key = word_keys(letters[None, :])[0]
+        i = int(np.searchsorted(self.keys, key))
+        return i if i < self.size and self.keys[i] == key else None
+
+
+def load_compiled(path: str) -> CompiledWordTable:
+    return CompiledWordTable(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile a text dictionary into the memory-mapped binary format')
+    parser.add_argument('dictionaries', nargs='+', help='Text dictionaries, e.g. ../dictionary.txt')
+    parser.add_argument('-l', '--length', type=int, help='Word length (default: the most common length)')
+    args = parser.parse_args()
+
+    for path in args.dictionaries:
+        output = compile_dictionary(path, word_length=args.length)
+        print(path, '->', output, f'({os.path.getsize(output)} bytes)')
+
+
+if __name__ == '__main__':
+    main()
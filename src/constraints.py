@@ -0,0 +1,165 @@
+import random
+import string
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class ConstraintSpace:
+    """Candidates of a full product dictionary, described by constraints instead of listed
+
+    After any feedback history the words still possible in an l{L}_a{A}
+    space are exactly those with an allowed letter at every position and,
+    per letter, a count within [lower, upper]:
+    - a green fixes its position; any other result excludes the letter there
+    - greens plus presents of a letter are a lower bound on its count, and
+      become the exact count once the same guess marks a copy absent
+      (Wordle._evaluate_guess hands out presents left to right).
+
+    Counting, uniform sampling and ordered enumeration run on a dynamic
+    programme over positions whose state is the count of each bounded
+    letter, so the cost depends on the constraints, not on the size of the
+    space.
+    """
+
+    def __init__(self, word_length: int, alphabet_size: int):
+        self.word_length = word_length
+        self.alphabet_size = alphabet_size
+        self.letters = string.ascii_lowercase[:alphabet_size]
+        self.allowed = [(1 << alphabet_size) - 1] * word_length
+        self.lower = [0] * alphabet_size
+        self.upper = [word_length] * alphabet_size
+        self._reset()
+
+    def _reset(self):
+        self._completions: Dict[Tuple[int, tuple], int] = {}
+        self._prepared = False
+
+    def update(self, guess: str, feedback: List[str]):
+        """Add the constraints of one (guess, feedback) pair"""
+        letters = [ord(letter) - ord('a') for letter in guess]
+        for i, (letter, result) in enumerate(zip(letters, feedback)):
+            if result == 'correct':
+                self.allowed[i] &= 1 << letter
+            else:
+                self.allowed[i] &= ~(1 << letter)
+
+        found = Counter(letter for letter, result in zip(letters, feedback) if result != 'absent')
+        for letter in set(letters):
+            self.lower[letter] = max(self.lower[letter], found[letter])
+            if any(l == letter and result == 'absent' for l, result in zip(letters, feedback)):
+                self.upper[letter] = min(self.upper[letter], found[letter])
+        self._reset()
+
+    def _prepare(self):
+        if self._prepared:
+            return
+        # Letters that cannot occur at all are removed from every position up front
+        banned = sum(1 << letter for letter in range(self.alphabet_size) if self.upper[letter] == 0)
+        self._allowed = [mask & ~banned for mask in self.allowed]
+        self._tracked = [letter for letter in range(self.alphabet_size)
+                         if self.upper[letter] > 0 and (self.lower[letter] > 0 or self.upper[letter] < self.word_length)]
+        self._slot = {letter: j for j, letter in enumerate(self._tracked)}
+        self._prepared = True
+
+    def _advance(self, state: tuple, letter: int) -> Optional[tuple]:
+        """Count state after placing `letter`, or None if that exceeds its upper bound"""
+        j = self._slot.get(letter)
+        if j is None:
+            return state
+        count = state[j] + 1
+        upper = self.upper[letter]
+        if upper < self.word_length:
+            if count > upper:
+                return None
+        else:
+            # Only the lower bound matters, so counts beyond it are merged
+            count = min(count, self.lower[letter])
+        return state[:j] + (count,) + state[j + 1:]
+
+    def _letters_at(self, position: int) -> Iterator[int]:
+        mask = self._allowed[position]
+        return (letter for letter in range(self.alphabet_size) if mask >> letter & 1)
+
+    def _count(self, position: int, state: tuple) -> int:
+        """Number of ways to complete a word from `position` with letter counts `state`"""
+        key = (position, state)
+        if key in self._completions:
+            return self._completions[key]
+
+        if position == self.word_length:
+            total = int(all(state[j] >= self.lower[letter] for j, letter in enumerate(self._tracked)))
+        else:
+            missing = sum(max(0, self.lower[letter] - state[j]) for j, letter in enumerate(self._tracked))
+            total = 0
+            if missing <= self.word_length - position:
+                free = 0
+                for letter in self._letters_at(position):
+                    if letter in self._slot:
+                        following = self._advance(state, letter)
+                        if following is not None:
+                            total += self._count(position + 1, following)
+                    else:
+                        free += 1
+                if free:
+                    total += free * self._count(position + 1, state)
+
+        self._completions[key] = total
+        return total
+
+    def _start(self) -> tuple:
+        self._prepare()
+        return (0,) * len(self._tracked)
+
+    def count(self) -> int:
+        return self._count(0, self._start())
+
+    def __len__(self):
+        return self.count()
+
+    def __contains__(self, word):
+        if not isinstance(word, str) or len(word) != self.word_length:
+            return False
+        letters = [ord(letter) - ord('a') for letter in word]
+        if any(not 0 <= letter < self.alphabet_size or not self.allowed[i] >> letter & 1
+               for i, letter in enumerate(letters)):
+            return False
+        counts = Counter(letters)
+        return all(self.lower[letter] <= counts[letter] <= self.upper[letter] for letter in range(self.alphabet_size))
+
+    def nth(self, index: int) -> str:
+        """The index-th remaining candidate in dictionary order"""
+        state = self._start()
+        if not 0 <= index < self._count(0, state):
+            raise IndexError('ConstraintSpace index out of range')
+        word = []
+        for position in range(self.word_length):
+            for letter in self._letters_at(position):
+                following = self._advance(state, letter)
+                if following is None:
+                    continue
+                ways = self._count(position + 1, following)
+                if index < ways:
+                    word.append(self.letters[letter])
+                    state = following
+                    break
+                index -= ways
+        return ''.join(word)
+
+    def sample(self, rng: Optional[random.Random] = None) -> str:
+        """A uniformly random remaining candidate"""
+        return self.nth((rng or random).randrange(self.count()))
+
+    def __iter__(self) -> Iterator[str]:
+        """Remaining candidates in dictionary order, generated lazily"""
+        def walk(position, state, prefix):
+            if position == self.word_length:
+                yield prefix
+                return
+            for letter in self._letters_at(position):
+                following = self._advance(state, letter)
+                if following is not None and self._count(position + 1, following):
+                    yield from walk(position + 1, following, prefix + self.letters[letter])
+
+        state = self._start()
+        if self._count(0, state):
+            yield from walk(0, state, '')
@@ -0,0 +1,230 @@
+import argparse
+import copy
+import os
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from patterns import DEFAULT_CACHE_DIR, dictionary_hash
+from profiling import phase
+
+# Deeper than any sensible game; guards against solvers whose guess stops splitting the candidates
+MAX_DEPTH = 32
+
+
+class DecisionTree:
+    """Every (guess, feedback) branch a deterministic solver can take on one dictionary
+
+    Nodes are numbered in depth-first order and stored as flat arrays:
+    - guess[n]: index into `words` of the guess played at node n
+    - child_start[n]:child_start[n+1]: the node's edges in child_code/child_node
+    - target_start[n]:target_end[n]: the node's remaining candidates, as a slice of
+      `targets` (subtrees are contiguous in depth-first order)
+    - target_guesses[i]: guesses needed to solve targets[i]
+    """
+
+    def __init__(self, words: List[str], guess: np.ndarray, child_start: np.ndarray, child_code: np.ndarray,
+                 child_node: np.ndarray, target_start: np.ndarray, target_end: np.ndarray,
+                 targets: np.ndarray, target_guesses: np.ndarray):
+        self.words = list(words)
+        self.word_length = len(self.words[0]) if self.words else 0
+        self.guess = guess
+        self.child_start = child_start
+        self.child_code = child_code
+        self.child_node = child_node
+        self.target_start = target_start
+        self.target_end = target_end
+        self.targets = targets
+        self.target_guesses = target_guesses
+
+    def __len__(self):
+        return len(self.guess)
+
+    def child(self, node: int, code: int) -> int:
+        """Node reached from `node` after observing pattern `code`"""
+        start, end = self.child_start[node], self.child_start[node + 1]
+        i = start + np.searchsorted(self.child_code[start:end], code)
+        if i == end or self.child_code[i] != code:
+            raise KeyError(f'Feedback pattern {code} cannot occur at node {node}')
+        return int(self.child_node[i])
+
+    def candidates(self, node: int) -> List[str]:
+        return [self.words[i] for i in self.targets[self.target_start[node]:self.target_end[node]]]
+
+    def candidate_count(self, node: int) -> int:
+        return int(self.target_end[node] - self.target_start[node])
+
+    def guess_counts(self) -> Dict[str, int]:
+        """Exact number of guesses the solver needs for every target word"""
+        return {self.words[t]: int(g) for t, g in zip(self.targets, self.target_guesses)}
+
+    def burndowns(self) -> Dict[int, List[int]]:
+        """Search-space sizes of every target's game, as compare.py records them, keyed by index into `words`
+
+        A target is solved at the node that guesses it, so its burndown is
+        the candidate count of each node on the path from the root to there.
+        """
+        burndowns = {}
+
+        def visit(node, path):
+            path = path + [self.candidate_count(node)]
+            if self.guess[node] in self.targets[self.target_start[node]:self.target_end[node]]:
+                burndowns[int(self.guess[node])] = path
+            for child in self.child_node[self.child_start[node]:self.child_start[node + 1]]:
+                visit(int(child), path)
+
+        visit(0, [])
+        return burndowns
+
+    def distribution(self) -> Dict[int, int]:
+        """Number of targets solved in each number of guesses"""
+        return dict(sorted(Counter(self.target_guesses.tolist()).items()))
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        np.savez_compressed(path, words=np.array(self.words), guess=self.guess, child_start=self.child_start,
+                            child_code=self.child_code, child_node=self.child_node,
+                            target_start=self.target_start, target_end=self.target_end,
+                            targets=self.targets, target_guesses=self.target_guesses)
+
+
+def load_tree(path: str) -> DecisionTree:
+    with np.load(path) as data:
+        return DecisionTree(data['words'].tolist(), data['guess'], data['child_start'], data['child_code'],
+                            data['child_node'], data['target_start'], data['target_end'],
+                            data['targets'], data['target_guesses'])
+
+
+def _fork(solver):
+    """Cheap copy of a solver's game state
+
+    The solvers keep their per-game state in `candidates` (whose update
+    replaces its index array rather than mutating it) and `feedback_history`;
+    everything else is shared, read-only setup.
+    """
+    child = copy.copy(solver)
+    child.candidates = copy.copy(solver.candidates)
+    child.feedback_history = list(solver.feedback_history)
+    return child
+
+
+def build_tree(solver_class, word_list, **kwargs) -> DecisionTree:
+    """Walk every branch of a deterministic solver once and record it as a DecisionTree"""
+    root = solver_class(word_list, target_word=None, **kwargs)
+    words = list(root.candidates.words)
+    index = {word: i for i, word in enumerate(words)}
+    word_length = len(words[0])
+    solved = 3 ** word_length - 1
+
+    guess, edges, target_start, target_end = [], [], [], []
+    targets, target_guesses = [], []
+
+    def visit(solver, depth):
+        if depth > MAX_DEPTH:
+            raise RuntimeError(f'{solver_class.__name__} did not converge within {MAX_DEPTH} guesses')
+
+        node = len(guess)
+        word = solver.get_next_guess()
+        guess.append(index[word])
+        edges.append([])
+        target_start.append(len(targets))
+        target_end.append(None)
+
+        codes = solver.candidates.codes(word)
+        for code in np.unique(codes):
+            code = int(code)
+            if code == solved:
+                targets.append(index[word])
+                target_guesses.append(depth + 1)
+                continue
+            child = _fork(solver)
+            child.candidates.indices = solver.candidates.indices[codes == code]
+            child.feedback_history.append((word, code))
+            edges[node].append((code, len(guess)))
+            visit(child, depth + 1)
+
+        target_end[node] = len(targets)
+
+    visit(root, 0)
+
+    child_start = np.zeros(len(guess) + 1, dtype=np.int64)
+    child_start[1:] = np.cumsum([len(e) for e in edges])
+    flat = [edge for node_edges in edges for edge in node_edges]
+    return DecisionTree(
+        words,
+        np.array(guess, dtype=np.int32),
+        child_start,
+        np.array([code for code, _ in flat], dtype=np.uint16),
+        np.array([child for _, child in flat], dtype=np.int32),
+        np.array(target_start, dtype=np.int32),
+        np.array(target_end, dtype=np.int32),
+        np.array(targets, dtype=np.int32),
+        np.array(target_guesses, dtype=np.uint8),
+    )
+
+
+# Solver options that do not change the tree's content
+_SHARED_OPTIONS = {'patterns'}
+
+
+def tree_variant(solver_name: str, **kwargs) -> str:
+    """Solver name plus its non-default options in a canonical order, e.g. 'Frequency+incremental'
+
+    Options that are unset or false are the solver's defaults and are left
+    out, so default builds keep their plain name.
+    """
+    options = []
+    for key in sorted(kwargs):
+        value = kwargs[key]
+        if key in _SHARED_OPTIONS or value is None or value is False:
+            continue
+        options.append(key if value is True else f'{key}={value}')
+    return '+'.join([solver_name] + options)
+
+
+def tree_path(word_list, solver_name: str, cache_dir: str = DEFAULT_CACHE_DIR, **kwargs) -> str:
+    """Cache file of a solver's tree; solver options that are not defaults are part of the name"""
+    return os.path.join(cache_dir, f'tree_{tree_variant(solver_name, **kwargs)}_{dictionary_hash(word_list)}.npz')
+
+
+def load_or_build_tree(word_list, solver_name: str = 'Frequency', cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                       **kwargs) -> DecisionTree:
+    """Load a dictionary's tree for a solver from the cache directory, building it on first use"""
+    from classicalSolver import DETERMINISTIC_SOLVERS
+
+    path = tree_path(word_list, solver_name, cache_dir, **kwargs) if cache_dir is not None else None
+    if path is not None and os.path.exists(path):
+        with phase('load_tree'):
+            return load_tree(path)
+    with phase('build_tree'):
+        # The solver caches what it shares across games (the Entropy opening) in the same place
+        tree = build_tree(DETERMINISTIC_SOLVERS[solver_name], word_list, cache_dir=cache_dir, **kwargs)
+    if path is not None:
+        tree.save(path)
+    return tree
+
+
+def main():
+    from classicalSolver import DETERMINISTIC_SOLVERS
+    from wordle import Wordle
+
+    parser = argparse.ArgumentParser(description='Precompute the decision tree of a deterministic solver')
+    parser.add_argument('dataset', help='Dataset name, e.g. dictionary for ../dictionary.txt')
+    parser.add_argument('-s', '--solver', choices=list(DETERMINISTIC_SOLVERS), default='Frequency')
+    parser.add_argument('-o', '--output', help='Tree file (default: the cache directory)')
+    args = parser.parse_args()
+
+    word_list = Wordle(f'../{args.dataset}.txt').word_list
+    tree = build_tree(DETERMINISTIC_SOLVERS[args.solver], word_list)
+    output = args.output or tree_path(word_list, args.solver)
+    tree.save(output)
+
+    counts = tree.target_guesses
+    print(f'{len(tree)} nodes, {len(counts)} targets, mean {counts.mean():.4f} guesses, max {counts.max()}')
+    print('Guess distribution:', tree.distribution())
+    print('Saved to', output)
+
+
+if __name__ == '__main__':
+    main()
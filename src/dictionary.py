@@ -0,0 +1,224 @@
+import hashlib
+import itertools
+import os
+import re
+import string
+import threading
+from collections import Counter
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from packed import pack_encoded
+from patterns import dictionary_hash, encode_words
+
+
+class WordTable:
+    """Immutable, sorted word list parsed once from a dictionary file and shared by every game"""
+
+    def __init__(self, words: Tuple[str, ...], word_length: int, path: Optional[str] = None):
+        self.words = words
+        self.word_length = word_length
+        self.path = path
+        self._word_set = frozenset(words)
+        self._encoded = None
+        self._packed = None
+        self._content_hash = None
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.words)
+
+    def __contains__(self, word):
+        return word in self._word_set
+
+    def __getitem__(self, index):
+        return self.words[index]
+
+    @property
+    def encoded(self) -> np.ndarray:
+        """Read-only (N, L) uint8 letter matrix, built on first use"""
+        if self._encoded is None:
+            encoded = encode_words(self.words)
+            encoded.flags.writeable = False
+            self._encoded = encoded
+        return self._encoded
+
+    @property
+    def packed(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Read-only packed words (5 bits per letter) and 26-bit letter masks, built on first use"""
+        # Stored beside `encoded` (8 more bytes per word): pruning one guess reads these,
+        # scoring many guesses at once reads the letter matrix
+        if self._packed is None:
+            packed, masks = pack_encoded(self.encoded)
+            packed.flags.writeable = False
+            masks.flags.writeable = False
+            self._packed = (packed, masks)
+        return self._packed
+
+    @property
+    def content_hash(self) -> str:
+        """patterns.dictionary_hash of the words, computed once per table"""
+        if self._content_hash is None:
+            self._content_hash = dictionary_hash(self.words)
+        return self._content_hash
+
+
+class ProductDictionary(WordTable):
+    """Every word of `word_length` letters over the first `alphabet_size` letters, never materialized
+
+    Word i is i written in base `alphabet_size`, most significant digit first,
+    so indices follow the sorted (itertools.product) order of the words that
+    generator.py writes for an l{L}_a{A} dataset. `words` is the dictionary
+    itself, so indexing, len() and random.choice work as on a WordTable.
+    """
+
+    def __init__(self, word_length: int, alphabet_size: int, path: Optional[str] = None):
+        if not 1 <= alphabet_size <= 26:
+            raise ValueError(f'Alphabet size must be between 1 and 26, got {alphabet_size}')
+        self.word_length = word_length
+        self.alphabet_size = alphabet_size
+        self.letters = string.ascii_lowercase[:alphabet_size]
+        self.path = path
+        self.size = alphabet_size ** word_length
+        # Place value of each position, most significant first
+        self.radix = alphabet_size ** np.arange(word_length - 1, -1, -1, dtype=np.int64)
+        self._encoded = None
+        self._packed = None
+        self._content_hash = None
+
+    @property
+    def words(self) -> 'ProductDictionary':
+        return self
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def content_hash(self) -> str:
+        # The shape fixes every word, so hash it rather than stream the whole space through sha1;
+        # the digest differs from the patterns.dictionary_hash of the same words read from a file
+        if self._content_hash is None:
+            shape = f'product l{self.word_length} a{self.alphabet_size}'
+            self._content_hash = hashlib.sha1(shape.encode('ascii')).hexdigest()
+        return self._content_hash
+
+    def __iter__(self) -> Iterator[str]:
+        return (''.join(letters) for letters in itertools.product(self.letters, repeat=self.word_length))
+
+    def __contains__(self, word):
+        return (isinstance(word, str) and len(word) == self.word_length
+                and all(letter in self.letters for letter in word))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError('ProductDictionary index out of range')
+        letters = []
+        for _ in range(self.word_length):
+            index, digit = divmod(index, self.alphabet_size)
+            letters.append(self.letters[digit])
+        return ''.join(reversed(letters))
+
+    def index(self, word: str) -> int:
+        if word not in self:
+            raise ValueError(f'{word!r} is not in the dictionary')
+        index = 0
+        for letter in word:
+            index = index * self.alphabet_size + ord(letter) - ord('a')
+        return index
+
+    def encode(self, indices) -> np.ndarray:
+        """(N, L) uint8 letter matrix of the words at `indices`, computed arithmetically"""
+        indices = np.asarray(indices, dtype=np.int64)
+        encoded = np.empty((len(indices), self.word_length), dtype=np.uint8)
+        for position, radix in enumerate(self.radix):
+            encoded[:, position] = indices // radix % self.alphabet_size
+        return encoded
+
+    @property
+    def encoded(self) -> np.ndarray:
+        if self._encoded is None:
+            encoded = self.encode(np.arange(self.size))
+            encoded.flags.writeable = False
+            self._encoded = encoded
+        return self._encoded
+
+
+_PRODUCT_NAME = re.compile(r'^l(\d+)_a(\d+)(\.txt)?$')
+
+_registry: Dict[Tuple[str, Optional[int]], Tuple[float, WordTable]] = {}
+_registry_lock = threading.Lock()
+
+
+def _infer_word_length(words) -> int:
+    """Most common word length in a file"""
+    lengths = Counter(len(word) for word in words)
+    return lengths.most_common(1)[0][0] if lengths else 0
+
+
+def parse_dictionary(path: str, word_length: Optional[int] = None) -> WordTable:
+    """Read a one-word-per-line file into a WordTable, bypassing the registry"""
+    with open(path, 'r') as f:
+        words = [word.strip().lower() for word in f]
+    words = [word for word in words if word]
+    if word_length is None:
+        word_length = _infer_word_length(words)
+    words = tuple(sorted({word for word in words if len(word) == word_length}))
+    return WordTable(words, word_length, path)
+
+
+def load_dictionary(path: str, word_length: Optional[int] = None) -> WordTable:
+    """Return the shared WordTable for a dictionary file, parsing it only once per process
+
+    The word length is inferred from the file unless given. A table is
+    re-read if the file has been modified since it was loaded. A missing
+    l{L}_a{A} dataset is served as the virtual full product space, and an
+    up-to-date compiled copy (see compiled.py) is memory-mapped instead of
+    parsing the text when the word length is inferred.
+    """
+    from compiled import COMPILED_SUFFIX, compiled_path, load_compiled
+
+    match = _PRODUCT_NAME.match(os.path.basename(path))
+    if match and not os.path.exists(path):
+        return product_dictionary(int(match.group(1)), int(match.group(2)))
+
+    load = lambda: parse_dictionary(path, word_length)
+    if path.endswith(COMPILED_SUFFIX):
+        load = lambda: load_compiled(path)
+    elif word_length is None:
+        compiled = compiled_path(path)
+        if os.path.exists(compiled) and os.path.getmtime(compiled) >= os.path.getmtime(path):
+            path, load = compiled, lambda: load_compiled(compiled)
+
+    key = (os.path.realpath(path), word_length)
+    mtime = os.path.getmtime(path)
+
+    with _registry_lock:
+        entry = _registry.get(key)
+        if entry is None or entry[0] != mtime:
+            entry = (mtime, load())
+            _registry[key] = entry
+        return entry[1]
+
+
+def product_dictionary(word_length: int, alphabet_size: int) -> ProductDictionary:
+    """The shared virtual dictionary of a full l{L}_a{A} product space"""
+    key = (f'product:{word_length}:{alphabet_size}', word_length)
+    with _registry_lock:
+        entry = _registry.get(key)
+        if entry is None:
+            entry = (0.0, ProductDictionary(word_length, alphabet_size))
+            _registry[key] = entry
+        return entry[1]
+
+
+def clear_registry():
+    """Forget every loaded dictionary"""
+    with _registry_lock:
+        _registry.clear()
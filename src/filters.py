@@ -0,0 +1,128 @@
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from dictionary import ProductDictionary, WordTable
+from packed import feedback_codes_packed, pack_encoded, pack_word
+from patterns import dictionary_hash, encode_words, feedback_codes, feedback_to_code
+
+
+# Largest virtual product space a CandidateSet indexes (8 bytes of index per word)
+MAX_CANDIDATE_WORDS = 1 << 26
+# Candidates decoded at once when pruning a product space
+_DECODE_CHUNK = 1 << 20
+
+
+class CandidateSet:
+    """Remaining candidates of one game, kept as indices into an array-encoded dictionary
+
+    When a PatternMatrix for the same dictionary is given, pruning reads the
+    guess's row of the matrix instead of recomputing feedback. On a virtual
+    ProductDictionary the candidates' letters are decoded from their indices
+    when needed, so only scans over every guess build the whole letter matrix.
+    """
+
+    def __init__(self, word_list: Iterable[str], patterns=None):
+        self._encoded = None
+        self._packed = None
+        self._product = None
+        if patterns is not None:
+            self.words = patterns.words
+            self._encoded = patterns.encoded
+        elif isinstance(word_list, ProductDictionary):
+            if len(word_list) > MAX_CANDIDATE_WORDS:
+                raise ValueError(f'{len(word_list)} words is too many to index; '
+                                 'play this space with SymbolicWordleSolver')
+            self.words = word_list
+            self._product = word_list
+        elif isinstance(word_list, WordTable):
+            # Shared tables are already sorted, and encode and pack themselves once
+            self.words = word_list.words
+        else:
+            self.words = sorted(set(word_list))
+            self._encoded = encode_words(self.words)
+        self.patterns = patterns
+        self.word_length = self._encoded.shape[1] if self._encoded is not None else word_list.word_length
+        self.indices = np.arange(len(self.words))
+        # A shared table keeps its own content hash, so games on it never rehash the words
+        self._table = word_list if isinstance(word_list, WordTable) else None
+        self._content_hash = None
+
+    @property
+    def encoded(self) -> np.ndarray:
+        """(N, L) letter matrix of the whole dictionary"""
+        if self._encoded is None:
+            self._encoded = self._table.encoded
+        return self._encoded
+
+    @property
+    def packed(self) -> np.ndarray:
+        """Packed words of the whole dictionary (see packed.pack_encoded)"""
+        return self._packs()[0]
+
+    @property
+    def masks(self) -> np.ndarray:
+        """26-bit letter masks of the whole dictionary"""
+        return self._packs()[1]
+
+    def _packs(self):
+        if self._packed is None:
+            self._packed = self._table.packed if self._table is not None else pack_encoded(self.encoded)
+        return self._packed
+
+    def encode(self, indices) -> np.ndarray:
+        """(len(indices), L) letter matrix of the words at dictionary `indices`"""
+        if self._product is not None:
+            return self._product.encode(indices)
+        return self.encoded[indices]
+
+    def pack(self, indices):
+        """Packed words and letter masks of the words at dictionary `indices`"""
+        if self._product is not None:
+            return pack_encoded(self._product.encode(indices))
+        packed, masks = self._packs()
+        return packed[indices], masks[indices]
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.words[i] for i in self.indices)
+
+    @property
+    def content_hash(self) -> str:
+        """patterns.dictionary_hash of the dictionary"""
+        if self._content_hash is None:
+            self._content_hash = dictionary_hash(self._table if self._table is not None else self.words)
+        return self._content_hash
+
+    def to_list(self) -> List[str]:
+        """Remaining candidates in dictionary order"""
+        return [self.words[i] for i in self.indices]
+
+    def codes(self, guess: str) -> np.ndarray:
+        """Pattern codes of `guess` against every remaining candidate"""
+        if self.patterns is not None and guess in self.patterns.index:
+            return self.patterns.row(guess)[self.indices]
+        packed_guess, guess_mask = pack_word(guess)
+        if self._product is None:
+            packed, masks = self.pack(self.indices)
+            return feedback_codes_packed(packed_guess, guess_mask, packed, masks, self.word_length)
+        # Decoded a chunk at a time, so a large space never holds every candidate's letters at once
+        return np.concatenate([feedback_codes_packed(packed_guess, guess_mask, *self.pack(chunk), self.word_length)
+                               for chunk in np.array_split(self.indices, max(1, len(self.indices) // _DECODE_CHUNK))])
+
+    def codes_matrix(self, guesses: Optional[np.ndarray] = None) -> np.ndarray:
+        """Pattern codes of every dictionary word, or of the `guesses` indices, (rows) against every remaining candidate"""
+        if self.patterns is not None:
+            rows = self.patterns.matrix if guesses is None else self.patterns.matrix[guesses]
+            return rows[:, self.indices]
+        encoded = self.encoded if guesses is None else self.encode(guesses)
+        return feedback_codes(encoded, self.encode(self.indices))
+
+    def update(self, guess: str, feedback: List[str]) -> np.ndarray:
+        """Keep only the candidates consistent with one (guess, feedback) constraint; returns the removed indices"""
+        keep = self.codes(guess) == feedback_to_code(feedback)
+        removed = self.indices[~keep]
+        self.indices = self.indices[keep]
+        return removed
@@ -11,17 +11,36 @@ from qiskit.circuit.library import MCXGate
 from qiskit import transpile
 from qiskit_aer import AerSimulator
 
+from adaptive import AdaptiveSampler
+from backends import get_backend
+from circuitcache import circuit_cache, circuit_key, get_simulator
+from filters import CandidateSet
+from oracles import SYNTHESIS_MODES, build_diagonal_oracle, build_esop_oracle
+from partition import merge_block_counts, run_parallel, split_blocks
+from profiling import profiled
+
 
 class SimpleOracleBuilder():
 
-    def __init__(self, id: str, qubit_count: int, solutions: List[int]):
+    def __init__(self, id: str, qubit_count: int, solutions: List[int], synthesis: str = 'mcx'):
+        
+        if synthesis not in SYNTHESIS_MODES:
+            raise ValueError(f'Unknown oracle synthesis mode {synthesis!r}, expected one of {SYNTHESIS_MODES}')
         
         self.ID = id
         self.QUBIT_COUNT = qubit_count
         self.SOLUTIONS = solutions
+        self.SYNTHESIS = synthesis
         
+    @profiled
     def build_circuit(self):
         
+        # Compressed equivalents of the one-MCX-per-solution oracle below
+        if self.SYNTHESIS == 'esop':
+            return build_esop_oracle(self.QUBIT_COUNT, self.SOLUTIONS).to_instruction(label=self.ID)
+        if self.SYNTHESIS == 'diagonal':
+            return build_diagonal_oracle(self.QUBIT_COUNT, self.SOLUTIONS).to_instruction(label=self.ID)
+        
         def invert_for_control(circuit: QuantumCircuit, solution: str):
             sol_str = bin(solution)[2:].zfill(self.QUBIT_COUNT)
             # Iterate over the bits in the solution
@@ -112,51 +131,68 @@ class SimpleWordleCircuitBuilder():
         qc = QuantumCircuit(3,2)
         qc = qc.compose(self.circuit, [0,1,2])
         
-        simulator = AerSimulator()
-        transpiled_circuit = transpile(qc, simulator)
+        simulator = get_simulator()
+        key = circuit_key(2, self.SOLUTIONS, 'wordle')
+        transpiled_circuit = circuit_cache.get_or_build(key, lambda: transpile(qc, simulator))
         job = simulator.run(transpiled_circuit)
         counts = job.result().get_counts()        
         
         return counts
 
-from typing import List, Set, Tuple
-from qiskit import QuantumCircuit
-from qiskit.circuit.library import MCXGate
-from qiskit import transpile
-from qiskit_aer import AerSimulator
-import numpy as np
-
 class HybridWordleSolver:
     def __init__(self, word_list: List[str], **kwargs):
-        self.possible_words = set(word_list)
+        self.candidates = CandidateSet(word_list, kwargs.get('patterns'))
         self.feedback_history = []
         self.word_length = len(next(iter(word_list)))
         self.target_word = kwargs['target_word']
-        
+        self.backend = get_backend(kwargs.get('backend'))
+        self.synthesis = kwargs.get('synthesis', 'mcx')
+        self.rng = kwargs.get('rng') or random.Random()
+        # Optional round-based sampling that stops once the position ranking is settled
+        self.sampler = AdaptiveSampler(self.backend) if kwargs.get('adaptive_shots') else None
+        self.shots_used = []
+        # Optionally split each position circuit into blocks of block_size entries, run on block_workers processes
+        self.block_size = kwargs.get('block_size')
+        self.block_workers = kwargs.get('block_workers') or 0
+        # Worker processes build their own backend, so only a backend given by name can be shipped to them
+        self.backend_name = kwargs.get('backend')
+        self.parallel = self.block_workers > 1 and (self.backend_name is None or isinstance(self.backend_name, str))
+        
+    @property
+    def possible_words(self) -> List[str]:
+        return self.candidates.to_list()
+        
+    @profiled
     def update_possibilities(self, guess: str, feedback: List[str]):
         """Update possible words based on Wordle feedback"""
-        new_possibilities = set()
-        for word in self.possible_words:
-            if self._matches_feedback(word, guess, feedback):
-                new_possibilities.add(word)
-        self.possible_words = new_possibilities
+        self.candidates.update(guess, feedback)
         self.feedback_history.append((guess, feedback))
         
+    @profiled
     def get_next_guess(self) -> str:
         """Use quantum circuit to find optimal next guess"""
-        if len(self.possible_words) <= 2:
-            return next(iter(self.possible_words))
+        # Listed once; the property builds a new list on every access
+        possible_words = self.possible_words
+        if len(possible_words) <= 2:
+            return possible_words[0]
             
-        # Create quantum circuits for each position
+        if self.block_size:
+            results = self._run_blocks()
+        else:
+            # Create quantum circuits for each position
+            circuits = []
+            for pos in range(self.word_length):
+                # Build circuit to evaluate letter positions
+                circuits.append(PositionEvaluationCircuit(
+                    # list(self.possible_words),
+                    self._position_words(),
+                    pos,
+                    self.synthesis
+                ))
+            results = self._run_circuits(circuits)
+        
         best_scores = []
-        for pos in range(self.word_length):
-            # Build circuit to evaluate letter positions
-            circuit_builder = PositionEvaluationCircuit(
-                # list(self.possible_words),
-                list(self.target_word),
-                pos
-            )
-            counts = circuit_builder.run()
+        for pos, counts in enumerate(results):
             score = self._analyze_measurement_results(counts)
             best_scores.append((score, pos))
             
@@ -164,18 +200,39 @@ class HybridWordleSolver:
         best_pos = max(best_scores, key=lambda x: x[0])[1]
         
         # Select word that maximizes information gain at that position
-        return self._select_word_for_position(best_pos)
+        return self._select_word_for_position(best_pos, possible_words)
     
-    def _matches_feedback(self, candidate: str, guess: str, feedback: List[str]) -> bool:
-        """Check if a candidate word matches Wordle feedback"""
-        for i, (letter, result) in enumerate(zip(guess, feedback)):
-            if result == 'correct' and candidate[i] != letter:
-                return False
-            elif result == 'absent' and letter in candidate:
-                return False
-            elif result == 'present' and (letter not in candidate or candidate[i] == letter):
-                return False
-        return True
+    def _run_circuits(self, circuits: List['PositionEvaluationCircuit']) -> List[dict]:
+        """Submit circuits as one batch of experiments and record the shots spent"""
+        if self.sampler is not None:
+            results, shots = self.sampler.run_many(circuits)
+        elif self.parallel:
+            results = run_parallel(circuits, self.backend_name, self.block_workers)
+            shots = [self.backend.shots or 0] * len(circuits)
+        else:
+            results = self.backend.run_many(circuits)
+            shots = [self.backend.shots or 0] * len(circuits)
+        self.shots_used.append(sum(shots))
+        return results
+        
+    def _position_words(self) -> List[str]:
+        """Solution set every position circuit is built over"""
+        return list(self.target_word)
+        
+    def _run_blocks(self) -> List[dict]:
+        """Counts per position from the position circuit's solution set split into blocks, merged
+
+        Every block needs only len(bin(block_size)) word qubits, so circuit
+        size and simulator memory stay fixed however long the words are, at
+        the cost of one circuit per block and position.
+        """
+        blocks = split_blocks(self._position_words(), self.block_size)
+        sizes = [len(block) for block in blocks]
+        circuits = [PositionEvaluationCircuit(block, pos, self.synthesis)
+                    for pos in range(self.word_length) for block in blocks]
+        results = self._run_circuits(circuits)
+        return [merge_block_counts(results[pos * len(blocks):(pos + 1) * len(blocks)], sizes)
+                for pos in range(self.word_length)]
         
     def _analyze_measurement_results(self, counts: dict) -> float:
         """Analyze quantum measurement results to score position"""
@@ -187,7 +244,7 @@ class HybridWordleSolver:
             entropy -= prob * np.log2(prob) if prob > 0 else 0
         return entropy
         
-    def _select_word_for_position(self, position: int) -> str:
+    def _select_word_for_position(self, position: int, possible_words: List[str]) -> str:
         """Select word that maximizes information gain at given position"""
         best_word = None
         max_score = float('-inf')
@@ -207,16 +264,18 @@ class HybridWordleSolver:
         #         max_score = score
         #         best_word = word
         
-        best_word = random.choice(list(self.possible_words))
+        best_word = self.rng.choice(possible_words)
                 
         return best_word
 
 class PositionEvaluationCircuit:
-    def __init__(self, words: List[str], position: int):
+    def __init__(self, words: List[str], position: int, synthesis: str = 'mcx'):
         self.words = words
         self.position = position
+        self.synthesis = synthesis
         self.qubit_count = len(bin(len(words))[2:])  # Number of qubits needed to represent words
         
+    @profiled
     def build(self) -> QuantumCircuit:
         """Build quantum circuit to evaluate letter positions"""
         # Create circuit with enough qubits to represent words plus ancilla
@@ -229,7 +288,8 @@ class PositionEvaluationCircuit:
         oracle_builder = SimpleOracleBuilder(
             f'pos_{self.position}',
             self.qubit_count,
-            self._get_solutions_for_position()
+            self._get_solutions_for_position(),
+            self.synthesis
         )
         qc = qc.compose(oracle_builder.build_circuit(), range(self.qubit_count + 1))
         
@@ -253,13 +313,19 @@ class PositionEvaluationCircuit:
         
         return qc
         
-    def run(self) -> dict:
-        """Run the quantum circuit and return measurement results"""
-        qc = self.build()
-        simulator = AerSimulator()
-        transpiled = transpile(qc, simulator)
-        job = simulator.run(transpiled, shots=1024)
-        return job.result().get_counts()
+    @profiled
+    def run(self, backend=None) -> dict:
+        """Run the quantum circuit and return measurement results
+
+        `backend` is a name from backends.BACKENDS or a backend instance;
+        by default the circuit is sampled on AerSimulator.
+        """
+        return get_backend(backend).run(self)
+        
+    def cache_key(self) -> str:
+        """Content hash of the circuit; positions with the same solutions share it"""
+        return circuit_key(self.qubit_count, self._get_solutions_for_position(),
+                           f'position-{self.synthesis}')
         
     def _get_solutions_for_position(self) -> List[int]:
         """Get binary solutions for oracle based on letter position"""
@@ -0,0 +1,122 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from typing import List, Optional
+
+import numpy as np
+
+from service import encode_message, read_message
+
+
+class Client:
+    """One keep-alive connection to the Wordle service"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, latencies: dict):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+
+    @classmethod
+    async def connect(cls, host: str, port: int, unix: Optional[str], latencies: dict) -> 'Client':
+        if unix:
+            reader, writer = await asyncio.open_unix_connection(unix)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, latencies)
+
+    async def request(self, route: str, method: str, path: str, payload: Optional[dict] = None) -> dict:
+        start = time.perf_counter()
+        self.writer.write(encode_message(f'{method} {path} HTTP/1.1', payload))
+        await self.writer.drain()
+        status_line, _, body = await read_message(self.reader)
+        self.latencies[route].append(time.perf_counter() - start)
+        response = json.loads(body) if body else {}
+        if not status_line.split(' ')[1].startswith('2'):
+            raise RuntimeError(f'{method} {path}: {status_line} {response}')
+        return response
+
+    def close(self):
+        self.writer.close()
+
+
+async def play_games(client: Client, solver: str, games: int, rng: random.Random, guesses: List[int]):
+    """Let the server's solver play `games` games to the end, one request per guess"""
+    for _ in range(games):
+        session = await client.request('create', 'POST', '/sessions', {'solver': solver, 'seed': rng.getrandbits(32)})
+        while True:
+            result = await client.request('step', 'POST', f"/sessions/{session['session']}/step")
+            if result['solved']:
+                break
+        guesses.append(result['attempts'])
+        await client.request('delete', 'DELETE', f"/sessions/{session['session']}")
+
+
+def summarize(latencies: dict, elapsed: float) -> dict:
+    """Throughput and latency percentiles (milliseconds), per route and overall"""
+    def percentiles(values):
+        values = np.array(values) * 1000
+        return {
+            'count': len(values),
+            'mean': float(values.mean()),
+            'p50': float(np.percentile(values, 50)),
+            'p95': float(np.percentile(values, 95)),
+            'p99': float(np.percentile(values, 99)),
+            'max': float(values.max())
+        }
+
+    every = [value for values in latencies.values() for value in values]
+    return {
+        'elapsed': elapsed,
+        'requests': len(every),
+        'rps': len(every) / elapsed if elapsed else 0.0,
+        'latency_ms': {'all': percentiles(every), **{route: percentiles(v) for route, v in latencies.items()}}
+    }
+
+
+async def run_load(host: str, port: int, unix: Optional[str], solver: str, clients: int,
+                   games: int, seed: int = 0) -> dict:
+    latencies = defaultdict(list)
+    guesses = []
+    connections = [await Client.connect(host, port, unix, latencies) for _ in range(clients)]
+    rng = random.Random(seed)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(play_games(client, solver, games, random.Random(rng.getrandbits(63)), guesses)
+                               for client in connections))
+    finally:
+        for client in connections:
+            client.close()
+    summary = summarize(latencies, time.perf_counter() - start)
+    summary.update(solver=solver, clients=clients, games=len(guesses), mean_guesses=float(np.mean(guesses)))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test a running Wordle service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('-p', '--port', type=int, default=8080)
+    parser.add_argument('--unix', help='Connect to this Unix socket instead of TCP')
+    parser.add_argument('-s', '--solver', default='Entropy')
+    parser.add_argument('-c', '--clients', type=int, default=16, help='Concurrent connections')
+    parser.add_argument('-n', '--games', type=int, default=20, help='Games per client')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='Write the summary to this JSON file')
+    args = parser.parse_args()
+
+    summary = asyncio.run(run_load(args.host, args.port, args.unix, args.solver, args.clients, args.games, args.seed))
+
+    overall = summary['latency_ms']['all']
+    print(f"{summary['requests']} requests in {summary['elapsed']:.2f}s: {summary['rps']:.1f} req/s")
+    print(f"latency ms  p50 {overall['p50']:.2f}  p95 {overall['p95']:.2f}  "
+          f"p99 {overall['p99']:.2f}  max {overall['max']:.2f}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
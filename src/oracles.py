@@ -0,0 +1,112 @@
+from collections import defaultdict
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from qiskit import QuantumCircuit
+from qiskit.circuit.library import DiagonalGate, MCXGate
+
+SYNTHESIS_MODES = ('mcx', 'esop', 'diagonal')
+
+
+def _toggle(cubes: set, cube: Tuple[int, int]):
+    # XOR of a cube with itself is zero, so a repeated cube cancels
+    if cube in cubes:
+        cubes.remove(cube)
+    else:
+        cubes.add(cube)
+
+
+def esop_cubes(qubit_count: int, solutions: Iterable[int]) -> List[Tuple[int, int]]:
+    """Merge solution bit strings into an exclusive-sum-of-products cover
+
+    A cube is (care, value): the bits set in `care` must equal those of
+    `value`, the others are don't-cares. Two cubes with the same care set that
+    differ in exactly one cared-for bit XOR to a single cube without that bit,
+    so merging is repeated until no such pair remains. Contiguous index ranges,
+    as produced by the position circuits, collapse to about one cube per set
+    bit of the range size.
+    """
+    full = (1 << qubit_count) - 1
+    cubes = set()
+    for solution in solutions:
+        _toggle(cubes, (full, int(solution)))
+
+    merged = True
+    while merged:
+        merged = False
+        by_care = defaultdict(set)
+        for care, value in cubes:
+            by_care[care].add(value)
+
+        for care, values in by_care.items():
+            for bit in range(qubit_count):
+                mask = 1 << bit
+                if not care & mask:
+                    continue
+                for value in sorted(values):
+                    partner = value ^ mask
+                    # Cubes merged or cancelled earlier in this pass are no longer in `cubes`
+                    if value & mask or (care, value) not in cubes or (care, partner) not in cubes:
+                        continue
+                    cubes.remove((care, value))
+                    cubes.remove((care, partner))
+                    _toggle(cubes, (care & ~mask, value))
+                    merged = True
+
+    return sorted(cubes, key=lambda cube: (-bin(cube[0]).count('1'), cube[1], cube[0]))
+
+
+def build_esop_oracle(qubit_count: int, solutions: Iterable[int]) -> QuantumCircuit:
+    """Bit-flip oracle with one (smaller) MCX per ESOP cube and no redundant X layers
+
+    Bit strings are read most-significant bit first onto qubits 0..n-1, as in
+    SimpleOracleBuilder. X gates are applied lazily: a qubit is only flipped
+    when the next cube needs the opposite polarity, and all qubits are
+    restored once at the end, so back-to-back inversions never appear.
+    """
+    oracle = QuantumCircuit(qubit_count + 1)
+    inverted = set()
+
+    for care, value in esop_cubes(qubit_count, solutions):
+        controls = [q for q in range(qubit_count) if care >> (qubit_count - 1 - q) & 1]
+        zeros = {q for q in controls if not value >> (qubit_count - 1 - q) & 1}
+
+        flips = [q for q in controls if (q in inverted) != (q in zeros)]
+        if flips:
+            oracle.x(flips)
+        inverted.symmetric_difference_update(flips)
+
+        if controls:
+            oracle.append(MCXGate(len(controls)), controls + [qubit_count])
+        else:
+            oracle.x(qubit_count)
+
+    if inverted:
+        oracle.x(sorted(inverted))
+    return oracle
+
+
+def build_diagonal_oracle(qubit_count: int, solutions: Iterable[int]) -> QuantumCircuit:
+    """Bit-flip oracle written as H . diag(+-1) . H on the ancilla
+
+    The diagonal carries a -1 on every (marked state, ancilla=1) basis state,
+    i.e. a phase oracle controlled by the ancilla; the Hadamards turn it into
+    the same bit flip SimpleOracleBuilder produces. Its cost depends on the
+    register size, not on the number of solutions.
+    """
+    parity = defaultdict(int)
+    for solution in solutions:
+        # Qiskit indexes basis states little-endian, so reverse the bit string
+        parity[int(format(int(solution), f'0{qubit_count}b')[::-1], 2)] ^= 1
+
+    diagonal = np.ones(2 ** (qubit_count + 1))
+    for state, odd in parity.items():
+        if odd:
+            diagonal[state + 2 ** qubit_count] = -1
+
+    oracle = QuantumCircuit(qubit_count + 1)
+    oracle.h(qubit_count)
+    oracle.append(DiagonalGate(list(diagonal)), range(qubit_count + 1))
+    oracle.h(qubit_count)
+    return oracle
@@ -0,0 +1,101 @@
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+import numpy as np
+
+from patterns import encode_words
+
+# Each letter occupies one 5-bit lane: letter index in the low bits, lane i at bit 5*i
+LANE_BITS = 5
+MAX_WORD_LENGTH = 12
+
+
+@lru_cache(maxsize=None)
+def lane_masks(word_length: int) -> Tuple[int, int]:
+    """(low, high) masks selecting the low 4 bits and the top bit of every lane"""
+    low = sum(0b01111 << (LANE_BITS * i) for i in range(word_length))
+    high = sum(0b10000 << (LANE_BITS * i) for i in range(word_length))
+    return low, high
+
+
+def packed_dtype(word_length: int):
+    if word_length > MAX_WORD_LENGTH:
+        raise ValueError(f'Packed words support at most {MAX_WORD_LENGTH} letters, got {word_length}')
+    return np.uint32 if LANE_BITS * word_length <= 32 else np.uint64
+
+
+def pack_word(word: str) -> Tuple[int, int]:
+    """Pack a word into (5 bits per letter, 26-bit letter-presence mask)"""
+    packed = 0
+    mask = 0
+    for i, letter in enumerate(word):
+        index = ord(letter) - ord('a')
+        packed |= index << (LANE_BITS * i)
+        mask |= 1 << index
+    return packed, mask
+
+
+def pack_words(words: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack many equal-length words into (packed, mask) arrays"""
+    return pack_encoded(encode_words(words))
+
+
+def pack_encoded(encoded: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack an (N, L) letter matrix from patterns.encode_words into (packed, mask) arrays"""
+    word_length = encoded.shape[1]
+    dtype = packed_dtype(word_length)
+    packed = np.zeros(len(encoded), dtype=dtype)
+    masks = np.zeros(len(encoded), dtype=np.uint32)
+    for i in range(word_length):
+        letters = encoded[:, i].astype(dtype)
+        packed |= letters << dtype(LANE_BITS * i)
+        masks |= np.uint32(1) << letters.astype(np.uint32)
+    return packed, masks
+
+
+def _green_lanes(diff, low: int, high: int):
+    """Top bit of every lane where the two packed words agree"""
+    nonzero = (((diff & low) + low) | diff) & high
+    return high & ~nonzero
+
+
+@lru_cache(maxsize=4096)
+def _guess_plan(packed_guess: int, word_length: int) -> Tuple[Tuple[int, int, int], ...]:
+    """Per position: (letter, number of earlier positions with that letter, lane-replicated letter)"""
+    plan = []
+    seen = {}
+    for i in range(word_length):
+        letter = (packed_guess >> (LANE_BITS * i)) & 0b11111
+        replicated = sum(letter << (LANE_BITS * j) for j in range(word_length))
+        plan.append((letter, seen.get(letter, 0), replicated))
+        seen[letter] = seen.get(letter, 0) + 1
+    return tuple(plan)
+
+
+def feedback_codes_packed(packed_guess: int, guess_mask: int, packed_answers: np.ndarray,
+                          answer_masks: np.ndarray, word_length: int) -> np.ndarray:
+    """Pattern codes of one packed guess against arrays of packed answers"""
+    dtype = packed_answers.dtype.type
+    low, high = lane_masks(word_length)
+    low, high = dtype(low), dtype(high)
+    green = _green_lanes(packed_answers ^ dtype(packed_guess), low, high)
+    plan = _guess_plan(packed_guess, word_length)
+    repeats = guess_mask.bit_count() < word_length
+
+    codes = np.zeros(len(packed_answers), dtype=np.int32)
+    green_bits = [(green >> dtype(LANE_BITS * i + 4)) & dtype(1) for i in range(word_length)]
+    for i, (letter, earlier, replicated) in enumerate(plan):
+        is_green = green_bits[i].astype(bool)
+        present = ~is_green & ((answer_masks >> np.uint32(letter)) & np.uint32(1)).astype(bool)
+        if repeats and (earlier or any(other == letter for other, _, _ in plan[i + 1:])):
+            matches = _green_lanes(packed_answers ^ dtype(replicated), low, high) & ~green
+            copies = sum(((matches >> dtype(LANE_BITS * j + 4)) & dtype(1)).astype(np.uint8)
+                         for j in range(word_length))
+            claimed = np.zeros(len(packed_answers), dtype=np.uint8)
+            for j in range(i):
+                if plan[j][0] == letter:
+                    claimed += ~green_bits[j].astype(bool)
+            present &= claimed < copies
+        codes += 3 ** i * (2 * is_green + present)
+    return codes
+
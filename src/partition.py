@@ -0,0 +1,90 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from backends import get_backend
+
+# Words per block circuit: 9 word qubits plus the ancilla
+DEFAULT_BLOCK_SIZE = 256
+
+
+def split_blocks(words: Sequence[str], block_size: int = DEFAULT_BLOCK_SIZE) -> List[List[str]]:
+    """Consecutive blocks of at most block_size words, covering `words` in order"""
+    return [list(words[start:start + block_size]) for start in range(0, len(words), block_size)]
+
+
+def merge_block_counts(block_counts: List[dict], block_sizes: List[int]) -> Dict[str, float]:
+    """Combine the measurement counts of one position's block circuits into one counts dict
+
+    Each block's outcomes are prefixed with the block's index and weighted
+    so the block carries its share of the words, as if the block index were
+    extra qubits of one register. The entropy of the merged counts is then
+    the entropy of the block choice plus the weighted entropies of the
+    blocks, which is what HybridWordleSolver._analyze_measurement_results
+    reads from them.
+    """
+    width = len(bin(max(len(block_counts) - 1, 0))[2:])
+    total_words = sum(block_sizes)
+    merged = {}
+    for block, (counts, size) in enumerate(zip(block_counts, block_sizes)):
+        shots = sum(counts.values())
+        if not shots:
+            continue
+        prefix = format(block, f'0{width}b')
+        for state, count in counts.items():
+            merged[prefix + state] = count / shots * size / total_words
+    return merged
+
+
+_worker_backend = None
+
+
+def _init_worker(backend: Optional[str]):
+    global _worker_backend
+    _worker_backend = get_backend(backend)
+
+
+def _run_chunk(circuits: List) -> List[dict]:
+    return _worker_backend.run_many(circuits)
+
+
+_pools: Dict[tuple, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(backend: Optional[str], workers: int) -> ProcessPoolExecutor:
+    """The process-wide pool of block workers for a backend name, started on first use
+
+    Workers are spawned rather than forked: a child forked after Aer has
+    started its OpenMP threads can deadlock in its first simulation.
+    """
+    key = (backend, workers)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                              initializer=_init_worker, initargs=(backend,))
+        return _pools[key]
+
+
+@atexit.register
+def _shutdown_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(cancel_futures=True)
+        _pools.clear()
+
+
+def run_parallel(circuits: List, backend: Optional[str] = None, workers: int = 2) -> List[dict]:
+    """Run circuits on `workers` processes, each chunk as one run_many call of its own `backend`
+
+    Backends are given by name (see backends.BACKENDS) because every worker
+    builds its own; counts come back in the order of `circuits`.
+    """
+    if not circuits:
+        return []
+    pool = get_pool(backend, workers)
+    size = -(-len(circuits) // workers)
+    chunks = [circuits[start:start + size] for start in range(0, len(circuits), size)]
+    return [counts for chunk in pool.map(_run_chunk, chunks) for counts in chunk]
@@ -0,0 +1,185 @@
+import hashlib
+import os
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+# Feedback digits; a word's pattern is sum(digit * 3**position)
+ABSENT, PRESENT, CORRECT = 0, 1, 2
+FEEDBACK_NAMES = ('absent', 'present', 'correct')
+FEEDBACK_DIGITS = {name: digit for digit, name in enumerate(FEEDBACK_NAMES)}
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache')
+
+# Largest dictionary for which the full guess x answer matrix is worth caching
+# (dictionary.txt is ~13k words, i.e. ~170MB on disk)
+MAX_MATRIX_WORDS = 20000
+
+# Upper bound on the number of guess/answer pairs per kernel chunk
+_CHUNK_ELEMENTS = 1 << 22
+
+
+def encode_words(words: Iterable[str]) -> np.ndarray:
+    """Encode equal-length lowercase words as an (N, L) uint8 matrix of letter indices"""
+    words = list(words)
+    if not words:
+        return np.zeros((0, 0), dtype=np.uint8)
+    raw = np.frombuffer(''.join(words).encode('ascii'), dtype=np.uint8)
+    return (raw.reshape(len(words), -1) - ord('a')).astype(np.uint8)
+
+
+def pattern_dtype(word_length: int):
+    """Smallest unsigned dtype that holds every base-3 pattern of a word length"""
+    return np.uint8 if 3 ** word_length <= 256 else np.uint16
+
+
+def feedback_to_code(feedback: List[str]) -> int:
+    """Convert a Wordle feedback list into its base-3 pattern code"""
+    code = 0
+    for i, result in enumerate(feedback):
+        code += FEEDBACK_DIGITS[result] * 3 ** i
+    return code
+
+
+def code_to_feedback(code: int, word_length: int) -> List[str]:
+    """Convert a base-3 pattern code back into a Wordle feedback list"""
+    feedback = []
+    for _ in range(word_length):
+        code, digit = divmod(int(code), 3)
+        feedback.append(FEEDBACK_NAMES[digit])
+    return feedback
+
+
+def feedback_codes(guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+    """Compute the (G, A) matrix of pattern codes for encoded guesses and answers
+
+    Duplicate letters follow Wordle._evaluate_guess: greens are assigned first,
+    then non-green guess letters are marked present left to right while unmatched
+    copies of that letter remain in the answer.
+    """
+    guesses = np.atleast_2d(guesses)
+    answers = np.atleast_2d(answers)
+    n_guesses, word_length = guesses.shape
+    n_answers = answers.shape[0]
+
+    out = np.empty((n_guesses, n_answers), dtype=pattern_dtype(word_length))
+    if n_guesses == 0 or n_answers == 0:
+        return out
+
+    chunk = max(1, _CHUNK_ELEMENTS // n_answers)
+
+    for start in range(0, n_guesses, chunk):
+        g = guesses[start:start + chunk]
+        green = g[:, None, :] == answers[None, :, :]
+        unmatched = ~green
+        codes = np.zeros(green.shape[:2], dtype=np.int32)
+
+        for i in range(word_length):
+            letter = g[:, i, None]
+
+            # Copies of guess letter i still available in the answer after greens
+            available = np.zeros(codes.shape, dtype=np.uint8)
+            for k in range(word_length):
+                available += (answers[None, :, k] == letter) & unmatched[:, :, k]
+
+            # Earlier non-green guess positions competing for the same letter
+            claimed = np.zeros(codes.shape, dtype=np.uint8)
+            for j in range(i):
+                claimed += (g[:, j, None] == letter) & unmatched[:, :, j]
+
+            present = unmatched[:, :, i] & (claimed < available)
+            codes += 3 ** i * (CORRECT * green[:, :, i] + PRESENT * present)
+
+        out[start:start + chunk] = codes
+
+    return out
+
+
+def pattern_entropies(codes: np.ndarray, word_length: int) -> np.ndarray:
+    """Shannon entropy (bits) of each row's feedback distribution
+
+    Rows are histogrammed together with a single bincount per chunk by offsetting
+    every row's codes into its own block of 3**word_length bins.
+    """
+    n_rows, n_cols = codes.shape
+    n_patterns = 3 ** word_length
+    entropies = np.zeros(n_rows)
+    if n_cols == 0:
+        return entropies
+
+    chunk = max(1, _CHUNK_ELEMENTS // n_cols)
+    for start in range(0, n_rows, chunk):
+        block = codes[start:start + chunk]
+        offsets = np.arange(len(block))[:, None] * n_patterns
+        counts = np.bincount((block + offsets).ravel(), minlength=len(block) * n_patterns)
+        probs = counts.reshape(len(block), n_patterns) / n_cols
+        with np.errstate(divide='ignore', invalid='ignore'):
+            entropies[start:start + chunk] = -np.nansum(probs * np.log2(probs), axis=1)
+    return entropies
+
+
+def dictionary_hash(words: Iterable[str]) -> str:
+    """Stable hash of a dictionary's contents, independent of word order"""
+    if hasattr(words, 'content_hash'):
+        # Shared tables compute it once; compiled dictionaries store the one computed when they were written
+        return words.content_hash
+    digest = hashlib.sha1()
+    for word in sorted(words):
+        digest.update(word.encode('ascii'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+class PatternMatrix:
+    """Guess x answer feedback codes for one dictionary, backed by a memory-mapped cache"""
+
+    def __init__(self, words: List[str], matrix: np.ndarray, encoded: Optional[np.ndarray] = None):
+        self.words = words
+        self.index = {word: i for i, word in enumerate(words)}
+        self.matrix = matrix
+        self.encoded = encoded if encoded is not None else encode_words(words)
+        self.word_length = len(words[0]) if words else 0
+
+    def __len__(self):
+        return len(self.words)
+
+    def code(self, guess: str, answer: str) -> int:
+        """Pattern code of guessing `guess` when the target is `answer`"""
+        return int(self.matrix[self.index[guess], self.index[answer]])
+
+    def feedback(self, guess: str, answer: str) -> List[str]:
+        """Feedback list identical to Wordle._evaluate_guess"""
+        return code_to_feedback(self.code(guess, answer), self.word_length)
+
+    def row(self, guess: str) -> np.ndarray:
+        """Pattern codes of `guess` against every answer, in self.words order"""
+        return self.matrix[self.index[guess]]
+
+
+def load_pattern_matrix(words: Iterable[str], cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> PatternMatrix:
+    """Load the pattern matrix for a dictionary, computing and caching it on first use
+
+    Words are sorted so the same dictionary always maps to the same cache file.
+    Pass cache_dir=None to compute the matrix in memory without touching disk.
+    """
+    words = sorted(set(words))
+    encoded = encode_words(words)
+
+    if cache_dir is None:
+        return PatternMatrix(words, feedback_codes(encoded, encoded), encoded)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f'patterns_{dictionary_hash(words)}.npy')
+
+    if not os.path.exists(path):
+        dtype = pattern_dtype(encoded.shape[1])
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        matrix = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype, shape=(len(words), len(words)))
+        rows = max(1, _CHUNK_ELEMENTS // len(words))
+        for start in range(0, len(words), rows):
+            matrix[start:start + rows] = feedback_codes(encoded[start:start + rows], encoded)
+        matrix.flush()
+        del matrix
+        os.replace(tmp_path, path)
+
+    return PatternMatrix(words, np.load(path, mmap_mode='r'), encoded)
@@ -0,0 +1,202 @@
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+from typing import List, Optional
+
+import numpy as np
+
+# The active Profiler, or None; instrumented code checks only this when profiling is off
+_profiler = None
+
+_NULL = nullcontext()
+
+
+class _Frame:
+    __slots__ = ('phase', 'guess', 'size_before', 'start', 'child_peak', 'memory_start')
+
+    def __init__(self, phase: str, guess: int, size_before: Optional[int], memory_start: int):
+        self.phase = phase
+        self.guess = guess
+        self.size_before = size_before
+        self.child_peak = 0
+        self.memory_start = memory_start
+        self.start = time.perf_counter()
+
+
+class Profiler:
+    """Collects one event per instrumented call: phase, wall time, candidate sizes and peak memory
+
+    Events are grouped per game (start_game/end_game) and tagged with the
+    number of the guess they work towards: guesses are counted by
+    Wordle.make_guess, so pruning on the feedback of guess 1 is part of
+    guess 2. State is per thread, so concurrently played games keep separate
+    traces. Peak memory needs tracemalloc, which slows Python down
+    noticeably, so it is opt-in.
+    """
+
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self._local = threading.local()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def _state(self):
+        local = self._local
+        if not hasattr(local, 'events'):
+            local.events = []
+            local.stack = []
+            local.game = None
+            local.guess = 1
+        return local
+
+    def start_game(self, game=None):
+        state = self._state
+        state.events = []
+        state.game = game
+        state.guess = 1
+
+    def end_game(self) -> List[dict]:
+        """Return the events recorded since start_game"""
+        state = self._state
+        events, state.events = state.events, []
+        return events
+
+    def next_guess(self):
+        self._state.guess += 1
+
+    def enter(self, phase: str, owner=None):
+        state = self._state
+        size = _candidate_count(owner)
+        memory_start = 0
+        if self.memory:
+            memory_start = tracemalloc.get_traced_memory()[0]
+            if state.stack:
+                state.stack[-1].child_peak = max(state.stack[-1].child_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        state.stack.append(_Frame(phase, state.guess, size, memory_start))
+
+    def exit(self, owner=None):
+        wall = time.perf_counter()
+        state = self._state
+        frame = state.stack.pop()
+        event = {
+            'game': state.game,
+            'guess': frame.guess,
+            'phase': frame.phase,
+            'wall': wall - frame.start,
+            'depth': len(state.stack)
+        }
+        if frame.size_before is not None:
+            event['size_before'] = frame.size_before
+            event['size_after'] = _candidate_count(owner)
+        if self.memory:
+            peak = max(tracemalloc.get_traced_memory()[1], frame.child_peak)
+            event['peak_bytes'] = peak - frame.memory_start
+            if state.stack:
+                state.stack[-1].child_peak = max(state.stack[-1].child_peak, peak)
+        state.events.append(event)
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'owner')
+
+    def __init__(self, profiler: Profiler, name: str, owner=None):
+        self.profiler = profiler
+        self.name = name
+        self.owner = owner
+
+    def __enter__(self):
+        self.profiler.enter(self.name, self.owner)
+
+    def __exit__(self, *exc):
+        self.profiler.exit(self.owner)
+
+
+def _candidate_count(owner) -> Optional[int]:
+    candidates = getattr(owner, 'candidates', None)
+    return len(candidates) if candidates is not None else None
+
+
+def profiled(fn):
+    """Record calls of a method as a phase named after its class and method"""
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        if _profiler is None:
+            return fn(self, *args, **kwargs)
+        _profiler.enter(name, self)
+        try:
+            return fn(self, *args, **kwargs)
+        finally:
+            _profiler.exit(self)
+
+    return wrapper
+
+
+def phase(name: str, owner=None):
+    """Context manager recording a block as a phase; a shared no-op when profiling is off"""
+    if _profiler is None:
+        return _NULL
+    return _Phase(_profiler, name, owner)
+
+
+def count_guess():
+    """Called by Wordle.make_guess once a guess has been scored"""
+    if _profiler is not None:
+        _profiler.next_guess()
+
+
+def enable(memory: bool = False) -> Profiler:
+    global _profiler
+    _profiler = Profiler(memory)
+    return _profiler
+
+
+def disable():
+    global _profiler
+    if _profiler is not None and _profiler.memory:
+        tracemalloc.stop()
+    _profiler = None
+
+
+def get_profiler() -> Optional[Profiler]:
+    return _profiler
+
+
+def summarize(events: List[dict]) -> dict:
+    """Per-phase call counts, wall-time statistics (seconds), mean candidate sizes and peak memory"""
+    by_phase = {}
+    for event in events:
+        by_phase.setdefault(event['phase'], []).append(event)
+
+    summary = {}
+    for name, group in sorted(by_phase.items()):
+        walls = np.array([event['wall'] for event in group])
+        entry = {
+            'calls': len(group),
+            'total': float(walls.sum()),
+            'mean': float(walls.mean()),
+            'p50': float(np.percentile(walls, 50)),
+            'p95': float(np.percentile(walls, 95)),
+            'max': float(walls.max())
+        }
+        sizes = [event['size_before'] for event in group if 'size_before' in event]
+        if sizes:
+            entry['mean_size_before'] = float(np.mean(sizes))
+            entry['mean_size_after'] = float(np.mean([event['size_after'] for event in group if 'size_after' in event]))
+        peaks = [event['peak_bytes'] for event in group if 'peak_bytes' in event]
+        if peaks:
+            entry['max_peak_bytes'] = int(max(peaks))
+        summary[name] = entry
+    return summary
+
+
+def write_trace(events: List[dict], path: str):
+    with open(path, 'w') as f:
+        for event in events:
+            f.write(json.dumps(event) + '\n')
@@ -0,0 +1,166 @@
+import argparse
+import math
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+from filters import CandidateSet
+from patterns import pattern_entropies
+
+# Entropies within this many bits count as equal, as in EntropyWordleSolver._best_guess
+TIE_TOLERANCE = 1e-9
+# Extra slack so rounding in the bounds never prunes a guess that ties the optimum
+_BOUND_SLACK = 1e-6
+
+
+def _information(counts: np.ndarray, total: int) -> np.ndarray:
+    """Elementwise -p log2 p of count / total, with 0 for empty counts"""
+    p = np.asarray(counts, dtype=float) / total
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(p > 0, -p * np.log2(p), 0.0)
+
+
+def entropy_upper_bounds(guesses: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Upper bound on the feedback entropy (bits) of each encoded guess against the encoded candidates
+
+    A pattern is fixed by, per distinct guess letter, its green positions and
+    its count in the answer clipped to its count in the guess, so by
+    subadditivity the entropy is at most the sum of those parts' entropies.
+    A letter used once contributes the entropy of its single position's
+    absent/present/correct split; a repeated letter its per-position green
+    entropies plus that of its clipped count. Everything comes from per-letter
+    tallies of the candidates, so bounding every guess costs O(guesses x L).
+    """
+    n, word_length = candidates.shape
+    if n == 0:
+        return np.zeros(len(guesses))
+
+    position_counts = np.stack([np.bincount(candidates[:, i], minlength=26) for i in range(word_length)])
+    copies = np.stack([(candidates == letter).sum(axis=1) for letter in range(26)])
+    copy_counts = np.stack([np.bincount(copies[letter], minlength=word_length + 1) for letter in range(26)])
+    presence = n - copy_counts[:, 0]
+
+    # clipped[x, m]: entropy of min(copies of x, m)
+    clipped = np.zeros((26, word_length + 1))
+    for m in range(1, word_length + 1):
+        clipped[:, m] = _information(copy_counts[:, :m], n).sum(axis=1) + \
+                        _information(copy_counts[:, m:].sum(axis=1), n)
+
+    multiplicity = (guesses[:, :, None] == guesses[:, None, :]).sum(axis=2)
+    bounds = np.zeros(len(guesses))
+    for i in range(word_length):
+        letter = guesses[:, i]
+        green = position_counts[i, letter]
+        single = _information(green, n) + _information(presence[letter] - green, n) + \
+                 _information(n - presence[letter], n)
+        # A repeated letter's clipped count is shared among its positions
+        repeated = _information(green, n) + _information(n - green, n) + \
+                   clipped[letter, multiplicity[:, i]] / multiplicity[:, i]
+        bounds += np.where(multiplicity[:, i] == 1, single, repeated)
+    return np.minimum(bounds, np.log2(n))
+
+
+def letter_shapes(encoded: np.ndarray) -> np.ndarray:
+    """(N, L) shape of each word: the first position holding the same letter, e.g. 'abca' -> 0 1 2 0"""
+    same = encoded[:, :, None] == encoded[:, None, :]
+    return same.argmax(axis=2)
+
+
+def symmetric_opening(candidates: CandidateSet) -> Optional[Tuple[int, int]]:
+    """Best guess by shape when the candidates are a whole dictionary closed under relabelling its letters
+
+    If every word with a given shape over the dictionary's alphabet is in
+    it (full product spaces, all words of distinct letters, ...), renaming
+    letters maps the dictionary onto itself, so all words of one shape have
+    the same entropy. Scoring the first word of each shape then gives the
+    exhaustive answer: with every word still a candidate, ties go to the
+    lowest index. Returns None when the symmetry does not hold.
+    """
+    if len(candidates) != len(candidates.words) or not len(candidates):
+        return None
+    encoded = candidates.encoded
+    alphabet_size = len(np.unique(encoded))
+    shapes, first, counts = np.unique(letter_shapes(encoded), axis=0, return_index=True, return_counts=True)
+    distinct = [len(set(shape.tolist())) for shape in shapes]
+    if any(count != math.perm(alphabet_size, k) for count, k in zip(counts, distinct)):
+        return None
+
+    scores = pattern_entropies(candidates.codes_matrix(first), candidates.word_length)
+    return int(first[scores >= scores.max() - TIE_TOLERANCE].min()), len(first)
+
+
+def best_entropy_guess(candidates: CandidateSet, first_chunk: int = 32, max_chunk: int = 4096) -> Tuple[int, int]:
+    """Most informative guess over the whole dictionary, by branch and bound
+
+    Guesses are scored exactly in order of decreasing entropy_upper_bounds,
+    in chunks that double in size, and the search stops at the first guess
+    whose bound cannot reach the best entropy found so far. Ties are broken
+    like EntropyWordleSolver._best_guess (a remaining candidate first, then
+    dictionary order), so the result is the exhaustive one. Returns the
+    guess's dictionary index and the number of guesses scored exactly.
+
+    Openings on letter-symmetric dictionaries, where every guess of a shape
+    ties and the bounds cannot prune, go through symmetric_opening instead.
+    """
+    symmetric = symmetric_opening(candidates)
+    if symmetric is not None:
+        return symmetric
+
+    word_length = candidates.word_length
+    bounds = entropy_upper_bounds(candidates.encoded, candidates.encode(candidates.indices))
+    order = np.argsort(-bounds, kind='stable')
+
+    scored, scores = [], []
+    best = -np.inf
+    start, chunk = 0, first_chunk
+    while start < len(order) and bounds[order[start]] >= best - TIE_TOLERANCE - _BOUND_SLACK:
+        block = order[start:start + chunk]
+        block = block[bounds[block] >= best - TIE_TOLERANCE - _BOUND_SLACK]
+        entropies = pattern_entropies(candidates.codes_matrix(block), word_length)
+        scored.append(block)
+        scores.append(entropies)
+        best = max(best, entropies.max())
+        start += chunk
+        chunk = min(2 * chunk, max_chunk)
+
+    scored = np.concatenate(scored)
+    scores = np.concatenate(scores)
+    tied = np.sort(scored[scores >= scores.max() - TIE_TOLERANCE])
+    remaining = tied[np.isin(tied, candidates.indices)]
+    return int(remaining[0] if len(remaining) else tied[0]), len(scored)
+
+
+def main():
+    from classicalSolver import EntropyWordleSolver
+    from wordle import Wordle
+
+    parser = argparse.ArgumentParser(description='Compare exhaustive and branch-and-bound entropy guess search')
+    parser.add_argument('dataset', nargs='?', default='dictionary', help='Dataset name, e.g. dictionary')
+    parser.add_argument('-g', '--guesses', nargs='*', default=[],
+                        help='Opening guesses to play (against the first word) before searching')
+    args = parser.parse_args()
+
+    game = Wordle(f'../{args.dataset}.txt')
+    game.reset(game.word_list.words[0])
+    solver = EntropyWordleSolver(game.word_list, branch_and_bound=False)
+    for guess in args.guesses:
+        solver.update_possibilities(guess, game.make_guess(guess)['result'])
+
+    start = time.perf_counter()
+    exhaustive = solver._best_guess()
+    exhaustive_time = time.perf_counter() - start
+    start = time.perf_counter()
+    index, evaluated = best_entropy_guess(solver.candidates)
+    bounded_time = time.perf_counter() - start
+
+    words = solver.candidates.words
+    print(f'{len(solver.candidates)} candidates, {len(words)} guesses')
+    print(f'exhaustive:       {exhaustive} in {exhaustive_time:.3f}s')
+    print(f'branch and bound: {words[index]} in {bounded_time:.3f}s ({evaluated} guesses scored)')
+    if words[index] != exhaustive:
+        raise SystemExit('Branch and bound disagrees with exhaustive search')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from wordle import Wordle
+from classicalSolver import DETERMINISTIC_SOLVERS, EntropyWordleSolver, TreeWordleSolver
+from hybridSolver import HybridWordleSolver
+from patterns import DEFAULT_CACHE_DIR, load_pattern_matrix, MAX_MATRIX_WORDS
+from backends import BACKENDS
+
+SOLVERS = {**DETERMINISTIC_SOLVERS, 'Tree': TreeWordleSolver, 'Hybrid': HybridWordleSolver}
+
+# Solvers whose steps block on scoring or circuit simulation and run on the executor
+OFFLOADED_SOLVERS = {'Entropy', 'Hybrid'}
+
+REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+async def read_message(reader: asyncio.StreamReader) -> Optional[Tuple[str, dict, bytes]]:
+    """Read one HTTP/1.1 message: (start line, lower-cased headers, body), or None at EOF"""
+    start = await reader.readline()
+    if not start:
+        return None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = headers.get('content-length', '0')
+    if not length.isdigit():
+        raise HTTPError(400, f'Malformed Content-Length {length!r}')
+    body = await reader.readexactly(int(length))
+    return start.decode('latin-1').rstrip('\r\n'), headers, body
+
+
+def encode_message(start: str, payload: Optional[dict] = None, keep_alive: bool = True) -> bytes:
+    body = json.dumps(payload).encode() if payload is not None else b''
+    head = [start, f'Content-Length: {len(body)}', f'Connection: {"keep-alive" if keep_alive else "close"}']
+    if payload is not None:
+        head.append('Content-Type: application/json')
+    return ('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body
+
+
+class Session:
+    """One game and its solver; steps within a session are serialized by its lock"""
+
+    def __init__(self, session_id: str, game: Wordle, solver, solver_name: str):
+        self.id = session_id
+        self.game = game
+        self.solver = solver
+        self.solver_name = solver_name
+        self.solved = False
+        self.last_used = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def play(self, guess: str) -> dict:
+        """Score a guess against the target and let the solver prune on the feedback"""
+        result = self.game.make_guess(guess)
+        if 'error' in result:
+            raise HTTPError(400, result['error'])
+        self.solved = all(x == 'correct' for x in result['result'])
+        if not self.solved:
+            self.solver.update_possibilities(guess, result['result'])
+        return {'guess': guess, **result, 'solved': self.solved}
+
+    def step(self) -> dict:
+        """Let the solver choose and play the next guess"""
+        return self.play(self.solver.get_next_guess())
+
+    def state(self) -> dict:
+        return {
+            'session': self.id,
+            'solver': self.solver_name,
+            'solved': self.solved,
+            'remaining': len(self.solver.possible_words),
+            **self.game.get_game_state()
+        }
+
+
+class WordleService:
+    """Hosts many concurrent games over one preloaded dictionary and feedback matrix
+
+    Routes (JSON bodies):
+      POST   /sessions               {"solver", "target"?, "seed"?} -> new session
+      GET    /sessions/<id>          game state
+      POST   /sessions/<id>/guess    {"word"}: play a guess of your own
+      POST   /sessions/<id>/step     let the solver play its next guess
+      DELETE /sessions/<id>
+      GET    /stats
+
+    Sessions idle for longer than `ttl` seconds are evicted, as is the least
+    recently used one when `max_sessions` is reached. With `warm_up` the
+    Entropy opening and the decision tree are computed before serving, so
+    no request blocks the event loop on them. The pattern matrix, opening
+    and tree are cached in `cache_dir`, or kept in memory when it is None.
+    """
+
+    def __init__(self, dataset: str, ttl: float = 300.0, max_sessions: int = 10000,
+                 executor_workers: int = 4, backend: str = 'statevector', warm_up: bool = True,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        self.path = f'../{dataset}.txt'
+        self.word_list = Wordle(self.path).word_list
+        self.cache_dir = cache_dir
+        self.patterns = (load_pattern_matrix(self.word_list, cache_dir) if len(self.word_list) <= MAX_MATRIX_WORDS
+                         else None)
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.backend = backend
+        self.executor = ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix='wordle-solver')
+        self.sessions = OrderedDict()
+        self.requests = 0
+        self.evicted = 0
+        self.started = time.monotonic()
+        if warm_up:
+            self.warm_up()
+
+    def warm_up(self):
+        """Compute the work every session shares: the Entropy opening and the Tree solver's tree"""
+        EntropyWordleSolver(self.word_list, patterns=self.patterns, cache_dir=self.cache_dir).get_next_guess()
+        TreeWordleSolver(self.word_list, patterns=self.patterns, cache_dir=self.cache_dir)
+
+    def create_session(self, solver_name: str, target: Optional[str] = None, seed: Optional[int] = None) -> Session:
+        if not isinstance(solver_name, str) or solver_name not in SOLVERS:
+            raise HTTPError(400, f'Unknown solver {solver_name!r}, expected one of {list(SOLVERS)}')
+        if target is not None and (not isinstance(target, str) or target not in self.word_list):
+            raise HTTPError(400, 'Target not in dictionary')
+        if seed is not None and not isinstance(seed, (int, float, str)):
+            raise HTTPError(400, 'Seed must be a number or a string')
+
+        # The seed fixes both the target and the solver's choices
+        rng = random.Random(seed)
+        game = Wordle(self.path)
+        game.reset(target if target is not None else rng.choice(self.word_list.words))
+        solver = SOLVERS[solver_name](self.word_list, target_word=game.target_word, patterns=self.patterns,
+                                      rng=rng, backend=self.backend, cache_dir=self.cache_dir)
+
+        while len(self.sessions) >= self.max_sessions:
+            self.sessions.popitem(last=False)
+            self.evicted += 1
+        session = Session(uuid.uuid4().hex, game, solver, solver_name)
+        self.sessions[session.id] = session
+        return session
+
+    def get_session(self, session_id: str) -> Session:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, f'No session {session_id!r}')
+        session.last_used = time.monotonic()
+        self.sessions.move_to_end(session_id)
+        return session
+
+    def evict_idle(self) -> int:
+        cutoff = time.monotonic() - self.ttl
+        # Sessions are kept in least-recently-used order
+        expired = []
+        for session_id, session in self.sessions.items():
+            if session.last_used >= cutoff:
+                break
+            expired.append(session_id)
+        for session_id in expired:
+            del self.sessions[session_id]
+        self.evicted += len(expired)
+        return len(expired)
+
+    async def _evict_loop(self):
+        while True:
+            await asyncio.sleep(max(self.ttl / 4, 0.1))
+            self.evict_idle()
+
+    async def run_step(self, session: Session, action, *args) -> dict:
+        async with session.lock:
+            if session.solved:
+                raise HTTPError(400, 'Game already solved')
+            if session.solver_name in OFFLOADED_SOLVERS:
+                return await asyncio.get_running_loop().run_in_executor(self.executor, action, *args)
+            return action(*args)
+
+    async def handle(self, method: str, path: str, body: dict) -> Tuple[int, dict]:
+        parts = [part for part in path.split('?')[0].split('/') if part]
+
+        if parts == ['stats'] and method == 'GET':
+            return 200, self.stats()
+        if parts == ['sessions'] and method == 'POST':
+            session = self.create_session(body.get('solver', 'Entropy'), body.get('target'), body.get('seed'))
+            return 201, session.state()
+        if len(parts) == 2 and parts[0] == 'sessions':
+            if method == 'GET':
+                return 200, self.get_session(parts[1]).state()
+            if method == 'DELETE':
+                self.get_session(parts[1])
+                del self.sessions[parts[1]]
+                return 200, {'session': parts[1], 'deleted': True}
+        if len(parts) == 3 and parts[0] == 'sessions' and method == 'POST':
+            session = self.get_session(parts[1])
+            if parts[2] == 'step':
+                return 200, await self.run_step(session, session.step)
+            if parts[2] == 'guess':
+                if not isinstance(body.get('word'), str):
+                    raise HTTPError(400, 'Expected {"word": <guess>}')
+                return 200, await self.run_step(session, session.play, body['word'].lower())
+        raise HTTPError(404, f'No route for {method} {path}')
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    message = await read_message(reader)
+                except HTTPError as error:
+                    # Without a body length the rest of the stream cannot be framed
+                    writer.write(encode_message(f'HTTP/1.1 {error.status} {REASONS[error.status]}',
+                                                {'error': str(error)}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if message is None:
+                    break
+                start, headers, raw = message
+                method, path, _ = (start.split(' ') + ['', ''])[:3]
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self.requests += 1
+                try:
+                    body = json.loads(raw) if raw else {}
+                    if not isinstance(body, dict):
+                        raise HTTPError(400, 'Body must be a JSON object')
+                    status, payload = await self.handle(method, path, body)
+                except HTTPError as error:
+                    status, payload = error.status, {'error': str(error)}
+                except json.JSONDecodeError:
+                    status, payload = 400, {'error': 'Body is not valid JSON'}
+                except Exception as error:
+                    status, payload = 500, {'error': f'{type(error).__name__}: {error}'}
+                writer.write(encode_message(f'HTTP/1.1 {status} {REASONS.get(status, "")}', payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def stats(self) -> dict:
+        return {
+            'sessions': len(self.sessions),
+            'requests': self.requests,
+            'evicted': self.evicted,
+            'uptime': time.monotonic() - self.started,
+            'words': len(self.word_list)
+        }
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8080, unix: Optional[str] = None):
+        if unix:
+            server = await asyncio.start_unix_server(self.serve_connection, path=unix)
+        else:
+            server = await asyncio.start_server(self.serve_connection, host, port)
+        evictor = asyncio.create_task(self._evict_loop())
+        print('Serving', len(self.word_list), 'words on', unix or f'http://{host}:{port}')
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            evictor.cancel()
+            self.executor.shutdown(wait=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve concurrent Wordle games over HTTP')
+    parser.add_argument('dataset', help='Dataset name, e.g. unique_words for ../unique_words.txt')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('-p', '--port', type=int, default=8080)
+    parser.add_argument('--unix', help='Listen on this Unix socket instead of TCP')
+    parser.add_argument('--ttl', type=float, default=300.0, help='Seconds before an idle session is evicted')
+    parser.add_argument('--max-sessions', type=int, default=10000)
+    parser.add_argument('--executor-workers', type=int, default=4, help='Threads for Entropy and Hybrid solver steps')
+    parser.add_argument('--no-warm-up', action='store_true',
+                        help='Skip computing the Entropy opening and decision tree before serving')
+    parser.add_argument('-b', '--backend', choices=list(BACKENDS), default='statevector',
+                        help='Simulation backend for the hybrid solver')
+    args = parser.parse_args()
+
+    service = WordleService(args.dataset, args.ttl, args.max_sessions, args.executor_workers, args.backend,
+                            warm_up=not args.no_warm_up)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from patterns import feedback_to_code
+
+
+def history_key(namespace: str, history: Iterable[Tuple[str, int]]) -> str:
+    """Canonical key of a feedback history
+
+    The candidate set is the intersection of every (guess, feedback) filter,
+    so the order in which they were applied does not matter and is sorted away.
+    """
+    return namespace + '|' + ','.join(f'{guess}:{code}' for guess, code in sorted(history))
+
+
+class TranspositionTable:
+    """Thread-safe LRU table from a feedback-history key to (candidate indices, next guess)
+
+    Candidate indices are shared between games and must not be modified;
+    CandidateSet.update replaces its index array rather than writing to it.
+    """
+
+    def __init__(self, maxsize: int = 65536):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._added = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, indices: np.ndarray, guess: str):
+        with self._lock:
+            self._entries[key] = (indices, guess)
+            if self._added is not None:
+                self._added.append((key, indices, guess))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def track_additions(self):
+        """Start recording put() calls, so take_additions can hand them to another process's table"""
+        with self._lock:
+            if self._added is None:
+                self._added = []
+
+    def take_additions(self) -> List[Tuple[str, np.ndarray, str]]:
+        """Entries put since tracking started or since the last call, as (key, indices, guess)"""
+        with self._lock:
+            if self._added is None:
+                return []
+            added, self._added = self._added, []
+        return added
+
+    def merge(self, entries: Iterable[Tuple[str, np.ndarray, str]]):
+        """Add entries taken from another table; they are not recorded as this table's additions"""
+        with self._lock:
+            for key, indices, guess in entries:
+                self._entries[key] = (indices, guess)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def save(self, path: str):
+        """Write the table to an .npz file, least recently used entries first"""
+        with self._lock:
+            items = list(self._entries.items())
+        keys = [key for key, _ in items]
+        guesses = [guess for _, (_, guess) in items]
+        sizes = [len(indices) for _, (indices, _) in items]
+        offsets = np.zeros(len(items) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(sizes)
+        indices = np.concatenate([indices for _, (indices, _) in items]) if items else np.zeros(0, dtype=np.int64)
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez_compressed(tmp_path, keys=np.array(keys, dtype=str), guesses=np.array(guesses, dtype=str),
+                            offsets=offsets, indices=indices)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str):
+        """Add the entries of a saved table, if the file exists"""
+        if not os.path.exists(path):
+            return
+        with np.load(path) as data:
+            keys, guesses, offsets, indices = data['keys'], data['guesses'], data['offsets'], data['indices']
+        for i, key in enumerate(keys.tolist()):
+            self.put(key, indices[offsets[i]:offsets[i + 1]], str(guesses[i]))
+
+
+class TransposedSolver:
+    """Wraps a deterministic solver so that repeated feedback histories are looked up, not recomputed
+
+    Works with the CandidateSet solvers, whose next guess depends only on the
+    remaining candidates. On a hit the wrapped solver's candidates are set
+    straight from the table and its guess is not scored again.
+    """
+
+    def __init__(self, solver, table: TranspositionTable, solver_name: str):
+        self.solver = solver
+        self.table = table
+        self.namespace = f'{solver_name}:{solver.candidates.content_hash}'
+        self.feedback_history = []
+        self.hits = 0
+        self.lookups = 0
+        self._key = history_key(self.namespace, [])
+        self._guess = self._lookup()
+
+    @property
+    def possible_words(self):
+        return self.solver.possible_words
+
+    def _lookup(self) -> Optional[str]:
+        self.lookups += 1
+        entry = self.table.get(self._key)
+        if entry is None:
+            return None
+        self.hits += 1
+        self.solver.candidates.indices = entry[0]
+        return entry[1]
+
+    def update_possibilities(self, guess, feedback):
+        self.feedback_history.append((guess, feedback_to_code(feedback)))
+        self._key = history_key(self.namespace, self.feedback_history)
+        self._guess = self._lookup()
+        if self._guess is None:
+            self.solver.update_possibilities(guess, feedback)
+        else:
+            self.solver.feedback_history.append((guess, feedback))
+
+    def get_next_guess(self):
+        if self._guess is None:
+            self._guess = self.solver.get_next_guess()
+            self.table.put(self._key, self.solver.candidates.indices, self._guess)
+        return self._guess
+
+
+# One table per process, shared by every game
+transposition_table = TranspositionTable()
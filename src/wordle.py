@@ -1,22 +1,28 @@
 import random
 
+from dictionary import load_dictionary
+from profiling import count_guess, profiled
+
 class Wordle:
-    def __init__(self, dictionary_path):
-        self.word_list = self._load_dictionary(dictionary_path)
+    def __init__(self, dictionary_path, word_length=None):
+        # Shared, immutable word table; parsed once per process
+        self.word_list = load_dictionary(dictionary_path, word_length)
+        self.word_length = self.word_list.word_length
         self.target_word = None
         self.guesses = []
         self.attempts = 0
 
-    def _load_dictionary(self, path):
-        with open(path, 'r') as f:
-            return {word.strip().lower() for word in f if len(word.strip()) == 5}
-
-    def start_game(self):
-        self.target_word = random.choice(list(self.word_list))
+    def reset(self, target=None):
+        """Start a new game on this instance without touching the word list"""
+        self.target_word = target if target is not None else random.choice(self.word_list.words)
         self.guesses = []
         self.attempts = 0
+
+    def start_game(self, target=None):
+        self.reset(target)
         return {'attempts': self.attempts}
 
+    @profiled
     def make_guess(self, guess):
         guess = guess.lower()
         if guess not in self.word_list:
@@ -25,6 +31,7 @@ class Wordle:
         self.attempts += 1
         result = self._evaluate_guess(guess)
         self.guesses.append({'word': guess, 'result': result})
+        count_guess()
         
         return {
             'result': result,
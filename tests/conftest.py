@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+import random
+import string
+import sys
+
+import pytest
+
+# The modules live flat in src/ and import each other by name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from wordle import Wordle  # noqa: E402
+
+# Tests run Aer in this process, and a pool forked after that can hang in its first simulation
+multiprocessing.set_start_method('spawn', force=True)
+
+
+def reference_feedback(guess, target):
+    """Feedback from Wordle._evaluate_guess, the rules every fast path must reproduce"""
+    game = Wordle.__new__(Wordle)
+    game.target_word = target
+    return game._evaluate_guess(guess)
+
+
+def random_words(rng, n, word_length, alphabet_size):
+    """Up to n distinct random words over a small alphabet, so repeated letters are common"""
+    letters = string.ascii_lowercase[:alphabet_size]
+    return sorted({''.join(rng.choice(letters) for _ in range(word_length)) for _ in range(n)})
+
+
+def play(solver, target, max_guesses=32):
+    """Guesses a solver makes against a target until it finds it"""
+    guesses = []
+    while len(guesses) < max_guesses:
+        guess = solver.get_next_guess()
+        guesses.append(guess)
+        if guess == target:
+            break
+        solver.update_possibilities(guess, reference_feedback(guess, target))
+    return guesses
+
+
+@pytest.fixture(params=range(5))
+def rng(request):
+    """A seeded random.Random; tests using it run once per seed"""
+    return random.Random(request.param)
+
+
+@pytest.fixture
+def dictionary_file(tmp_path):
+    """Write words to a one-word-per-line file and return its path"""
+    def write(words, name='words.txt'):
+        path = tmp_path / name
+        path.write_text('\n'.join(words) + '\n')
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    """Write words as a dataset that compare.py-style '../<name>.txt' paths find, and return its name"""
+    def write(words, name='words'):
+        (tmp_path / f'{name}.txt').write_text('\n'.join(words) + '\n')
+        (tmp_path / 'src').mkdir(exist_ok=True)
+        monkeypatch.chdir(tmp_path / 'src')
+        return name
+    return write
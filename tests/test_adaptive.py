@@ -0,0 +1,35 @@
+import math
+
+from adaptive import AdaptiveSampler, entropy_interval
+from backends import StatevectorBackend
+from hybridSolver import PositionEvaluationCircuit
+
+
+def test_sampler_spends_shots_on_distinct_circuits(rng):
+    sizes = [rng.randint(1, 30) for _ in range(5)]
+    circuits = [PositionEvaluationCircuit([f'w{i}' for i in range(size)], position)
+                for position, size in enumerate(sizes)]
+    sampler = AdaptiveSampler(StatevectorBackend(seed=rng.randrange(100)), round_shots=64, max_shots=512)
+    counts, shots = sampler.run_many(circuits)
+
+    first = {}
+    for i, circuit in enumerate(circuits):
+        first.setdefault(circuit.cache_key(), i)
+        if first[circuit.cache_key()] == i:
+            assert 0 < shots[i] <= 512 and shots[i] % 64 == 0
+            assert sum(counts[i].values()) == shots[i]
+        else:
+            assert shots[i] == 0
+            assert counts[i] == counts[first[circuit.cache_key()]]
+
+
+def test_entropy_interval_covers_uniform_entropy(rng):
+    outcomes = rng.randint(2, 16)
+    shots = 20000
+    counts = {}
+    for _ in range(shots):
+        outcome = rng.randrange(outcomes)
+        counts[outcome] = counts.get(outcome, 0) + 1
+    estimate, width = entropy_interval(counts)
+    assert abs(estimate - math.log2(outcomes)) <= width + 0.01
+    assert entropy_interval({}) == (0.0, float('inf'))
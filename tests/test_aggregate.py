@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+import pytest
+
+from aggregate import QUANTILES, BurndownAggregator, QuantileSketch, load_aggregate
+from compare import SOLVER_COLORS, SOLVERS
+
+
+def random_burndown(rng):
+    sizes = [rng.randint(1, 10 ** rng.randint(1, 6))]
+    while sizes[-1] > 1 and len(sizes) < 12:
+        sizes.append(rng.randint(1, sizes[-1]))
+    return sizes
+
+
+def test_sketch_quantiles_are_within_the_relative_error(rng):
+    accuracy = rng.choice([0.01, 0.02, 0.05])
+    sketch = QuantileSketch(accuracy)
+    values = np.array([0.0] * rng.randint(0, 5) + [1 + rng.lognormvariate(0, 3) for _ in range(rng.randint(1, 500))])
+    counts = np.bincount(sketch.bucket(values), minlength=sketch.size + 1)
+    ordered = np.sort(values)
+    for q, estimate in zip(QUANTILES, sketch.quantiles(counts)):
+        exact = ordered[int(math.floor(q * (len(values) - 1)))]
+        assert estimate == pytest.approx(exact, rel=accuracy * 1.0001, abs=0)
+
+
+def test_aggregates_match_padded_means_and_merge_by_addition(rng, tmp_path):
+    games = [(rng.choice(['Pruning', 'Entropy']), random_burndown(rng)) for _ in range(rng.randint(1, 60))]
+    whole, first, second = BurndownAggregator(), BurndownAggregator(), BurndownAggregator()
+    for i, (solver, burndown) in enumerate(games):
+        whole.add(solver, burndown)
+        (first if i % 2 else second).add(solver, burndown)
+    first.merge(second)
+
+    for solver in set(solver for solver, _ in games):
+        burndowns = [burndown for name, burndown in games if name == solver]
+        length = max(len(burndown) for burndown in burndowns)
+        padded = np.array([burndown + [1] * (length - len(burndown)) for burndown in burndowns])
+        summary = whole.summary(solver)
+        assert np.allclose(summary['mean'], padded.mean(axis=0))
+        assert summary['games'] == len(burndowns)
+        assert summary['guesses'] == {n: sum(len(b) == n for b in burndowns) for n in {len(b) for b in burndowns}}
+        assert first.summary(solver) == summary
+
+    whole.save(str(tmp_path / 'aggregate.npz'))
+    loaded = load_aggregate(str(tmp_path / 'aggregate.npz'))
+    assert all(loaded.summary(solver) == whole.summary(solver) for solver in whole.solvers)
+
+
+def test_every_solver_has_a_color():
+    assert set(SOLVERS) <= set(SOLVER_COLORS)
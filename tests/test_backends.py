@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from qiskit.quantum_info import Statevector
+
+from backends import AnalyticBackend, StatevectorBackend
+from hybridSolver import PositionEvaluationCircuit
+
+
+def qiskit_probabilities(circuit):
+    built = circuit.build().remove_final_measurements(inplace=False)
+    return Statevector(built).probabilities_dict(qargs=range(circuit.qubit_count))
+
+
+@pytest.mark.parametrize('backend', [StatevectorBackend(), AnalyticBackend()])
+def test_exact_backends_match_qiskit(rng, backend):
+    words = [f'w{i}' for i in range(rng.randint(1, 40))]
+    circuit = PositionEvaluationCircuit(words, rng.randrange(5))
+    expected = qiskit_probabilities(circuit)
+    counts = backend.run(circuit)
+    for state in set(expected) | set(counts):
+        assert counts.get(state, 0.0) == pytest.approx(expected.get(state, 0.0), abs=1e-9)
+
+
+def test_analytic_matches_statevector_on_any_marked_set(rng):
+    qubit_count = rng.randint(1, 7)
+    marked = np.array(sorted(rng.sample(range(2 ** qubit_count), rng.randint(0, 2 ** qubit_count))), dtype=np.int64)
+    exact = StatevectorBackend().probabilities(qubit_count, marked)
+    assert np.allclose(AnalyticBackend().probabilities(qubit_count, marked), exact)
+    assert exact.sum() == pytest.approx(1.0)
+
+
+def test_sampled_counts_sum_to_shots(rng):
+    circuit = PositionEvaluationCircuit([f'w{i}' for i in range(rng.randint(1, 20))], 0)
+    counts = StatevectorBackend(shots=512, seed=rng.randrange(100)).run(circuit)
+    assert sum(counts.values()) == 512
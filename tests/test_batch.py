@@ -0,0 +1,42 @@
+import pytest
+
+import batch
+from batch import LockstepSolver
+from classicalSolver import DETERMINISTIC_SOLVERS
+from conftest import play, random_words, reference_feedback
+from patterns import load_pattern_matrix
+
+OPTIONS = [('Pruning', {}), ('Frequency', {}), ('Frequency', {'incremental': True}),
+           ('Entropy', {}), ('Entropy', {'branch_and_bound': True})]
+
+
+@pytest.mark.parametrize('solver_name, options', OPTIONS)
+@pytest.mark.parametrize('with_patterns', [False, True])
+def test_lockstep_matches_serial_play(rng, solver_name, options, with_patterns):
+    words = random_words(rng, 60, rng.randint(3, 5), rng.randint(3, 4))
+    patterns = load_pattern_matrix(words, cache_dir=None) if with_patterns else None
+    targets = rng.choices(words, k=25)
+    played = LockstepSolver(words, solver_name, patterns, cache_dir=None, **options).solve_many(
+        targets, batch_size=rng.randint(1, 30))
+    for target, guesses, burndown in zip(targets, played['guesses'], played['burndowns']):
+        solver = DETERMINISTIC_SOLVERS[solver_name](words, patterns=patterns, cache_dir=None, **options)
+        serial = play(solver, target)
+        assert guesses == len(serial)
+        assert burndown == [sum(all(reference_feedback(guess, word) == reference_feedback(guess, target)
+                                    for guess in serial[:i]) for word in words)
+                            for i in range(len(serial))]
+
+
+def test_rejects_non_deterministic_solvers():
+    with pytest.raises(ValueError):
+        LockstepSolver(['abc', 'abd'], 'Hybrid')
+
+
+def test_round_limit_counts_the_solving_round(rng, monkeypatch):
+    words = random_words(rng, 60, 4, 3)
+    played = LockstepSolver(words, 'Pruning').solve_many(words)
+    monkeypatch.setattr(batch, 'MAX_ROUNDS', int(played['guesses'].max()))
+    assert list(LockstepSolver(words, 'Pruning').solve_many(words)['guesses']) == list(played['guesses'])
+    monkeypatch.setattr(batch, 'MAX_ROUNDS', int(played['guesses'].max()) - 1)
+    with pytest.raises(RuntimeError):
+        LockstepSolver(words, 'Pruning').solve_many(words)
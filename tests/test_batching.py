@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from qiskit import QuantumCircuit, transpile
+
+from batching import CircuitBatcher
+from circuitcache import get_simulator
+
+
+def basis_circuit(bits):
+    """A circuit that always measures `bits`"""
+    circuit = QuantumCircuit(len(bits), len(bits))
+    for i, bit in enumerate(reversed(bits)):
+        if bit == '1':
+            circuit.x(i)
+    circuit.measure(range(len(bits)), range(len(bits)))
+    return transpile(circuit, get_simulator())
+
+
+def test_concurrent_callers_get_their_own_counts(rng):
+    batcher = CircuitBatcher(max_batch=rng.randint(2, 16), max_wait=0.01)
+    requests = [[format(rng.randrange(16), '04b') for _ in range(rng.randint(1, 4))] for _ in range(12)]
+    shots = [rng.choice([8, 16]) for _ in requests]
+
+    def run(i):
+        return batcher.run_many([basis_circuit(bits) for bits in requests[i]], shots[i])
+
+    with ThreadPoolExecutor(max_workers=6) as threads:
+        results = list(threads.map(run, range(len(requests))))
+
+    for bits, counts, n in zip(requests, results, shots):
+        assert counts == [{b: n} for b in bits]
+    assert batcher.experiments == sum(len(bits) for bits in requests)
+    assert batcher.jobs <= batcher.experiments
@@ -0,0 +1,51 @@
+import benchmark
+from conftest import random_words
+
+
+def test_compare_flags_only_slowdowns_past_the_threshold(rng):
+    threshold = rng.choice([0.05, 0.1, 0.25])
+    baseline, current, expected = {}, {}, set()
+    for i in range(30):
+        base = rng.uniform(1e-4, 1.0)
+        ratio = rng.uniform(0.5, 1.5)
+        baseline[f'b{i}'] = {'median': base}
+        current[f'b{i}'] = {'median': base * ratio}
+        if base * ratio / base > 1 + threshold:
+            expected.add(f'b{i}')
+    regressions = benchmark.compare_results({'results': baseline}, {'results': current}, threshold)
+    assert {key for key, _ in regressions} == expected
+
+
+def test_measure_discards_warmup_and_meets_minimums(rng):
+    calls = []
+    number, min_repeats = rng.randint(1, 5), rng.randint(1, 6)
+    result = benchmark.measure(lambda arg: calls.append(arg), setup=lambda: len(calls), number=number,
+                               min_time=0.01, min_repeats=min_repeats)
+    assert result['repeats'] >= min_repeats and result['number'] == number
+    assert len(calls) == result['repeats'] + 1
+    assert calls == list(range(len(calls)))
+
+    # A warm-up that already takes min_time is the only measurement
+    calls.clear()
+    assert benchmark.measure(lambda arg: calls.append(arg), min_time=0.0)['repeats'] == 1
+    assert len(calls) == 1
+
+
+def test_setup_is_deferred_until_a_benchmark_runs(rng, dataset, monkeypatch):
+    loads = []
+    monkeypatch.setattr(benchmark, 'load_pattern_matrix', lambda words: loads.append(words))
+    benchmarks = benchmark.dataset_benchmarks(dataset(random_words(rng, 40, 4, 4)), seed=rng.randrange(100))
+    assert loads == []
+    fn, setup, number = benchmarks['evaluate_guess']()
+    fn(None)
+    assert loads == []
+    benchmarks['Pruning.update_possibilities']()[1]()
+    benchmarks['Frequency.update_possibilities']()[1]()
+    assert len(loads) == 1
+
+
+def test_entropy_guesses_skip_matrixless_datasets(rng, dataset, monkeypatch):
+    monkeypatch.setattr(benchmark, 'MAX_MATRIX_WORDS', 10)
+    benchmarks = benchmark.dataset_benchmarks(dataset(random_words(rng, 40, 4, 4)))
+    assert 'Entropy.get_next_guess' not in benchmarks
+    assert 'Frequency.get_next_guess' in benchmarks and 'Entropy.update_possibilities' in benchmarks
@@ -0,0 +1,32 @@
+from collections import OrderedDict
+
+from circuitcache import CircuitCache, circuit_key
+
+
+def test_key_ignores_order_and_cancelling_duplicates(rng):
+    solutions = rng.sample(range(64), rng.randint(0, 20))
+    doubled = rng.sample(range(64, 128), rng.randint(0, 5)) * 2
+    shuffled = solutions + doubled
+    rng.shuffle(shuffled)
+    assert circuit_key(7, shuffled, 'position-mcx') == circuit_key(7, solutions, 'position-mcx')
+    assert circuit_key(7, solutions, 'position-mcx') != circuit_key(7, solutions, 'position-esop')
+    assert circuit_key(7, solutions, 'position-mcx') != circuit_key(7, solutions + [200], 'position-mcx')
+
+
+def test_cache_is_an_lru(rng):
+    cache = CircuitCache(maxsize=rng.randint(1, 6))
+    model = OrderedDict()
+    builds = 0
+    for _ in range(200):
+        key = str(rng.randrange(10))
+        if key in model:
+            model.move_to_end(key)
+        else:
+            model[key] = f'circuit {key}'
+            builds += 1
+            while len(model) > cache.maxsize:
+                model.popitem(last=False)
+        assert cache.get_or_build(key, lambda: f'circuit {key}') == model[key]
+        assert list(cache._entries) == list(model)
+    assert cache.misses == builds
+    assert cache.stats()['hits'] == 200 - builds
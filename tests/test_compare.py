@@ -0,0 +1,29 @@
+from compare import compare_solvers
+from conftest import random_words
+
+SOLVERS = ['Pruning', 'Frequency', 'Entropy']
+
+
+def by_game(records):
+    return sorted(records, key=lambda record: (record['solver'], record['game']))
+
+
+def test_runs_are_reproducible_across_worker_counts(rng, dataset, tmp_path):
+    name = dataset(random_words(rng, 60, 4, 4))
+    seed = rng.randrange(1000)
+    cache_dir = str(tmp_path / 'cache')
+    serial = compare_solvers(name, n_games=8, solver_names=SOLVERS, workers=1, seed=seed, cache_dir=cache_dir)
+    parallel = compare_solvers(name, n_games=8, solver_names=SOLVERS, workers=2, seed=seed, cache_dir=cache_dir)
+    assert by_game(serial) == by_game(parallel)
+    assert len(serial) == 8 * len(SOLVERS)
+
+
+def test_records_describe_real_games(rng, dataset):
+    words = random_words(rng, 60, 4, 4)
+    records = compare_solvers(dataset(words), n_games=5, solver_names=['Pruning'], workers=1, seed=rng.randrange(1000),
+                              cache_dir=None)
+    for record in records:
+        assert record['target'] in words
+        assert record['burndown'][0] == len(words)
+        assert len(record['burndown']) == record['guesses']
+        assert all(later <= earlier for earlier, later in zip(record['burndown'], record['burndown'][1:]))
@@ -0,0 +1,43 @@
+import os
+from collections import Counter
+
+import numpy as np
+
+from classicalSolver import DETERMINISTIC_SOLVERS
+from compiled import CompiledWordTable, compile_dictionary, load_compiled
+from conftest import play, random_words
+from dictionary import load_dictionary, parse_dictionary
+
+
+def test_compiled_tables_match_text_tables(rng, dictionary_file):
+    words = random_words(rng, 100, rng.randint(1, 12), rng.randint(1, 26))
+    path = dictionary_file(words + ['x' * (len(words[0]) + 1)])
+    text = parse_dictionary(path)
+    compiled = load_compiled(compile_dictionary(path))
+
+    assert len(compiled) == len(text) and list(compiled) == list(text.words) == words
+    assert list(compiled.words) == words
+    assert np.array_equal(compiled.encoded, text.encoded)
+    assert all(np.array_equal(a, b) for a, b in zip(compiled.packed, text.packed))
+    assert compiled.content_hash == text.content_hash
+    letters = Counter(letter for word in words for letter in word)
+    assert {chr(ord('a') + i): int(n) for i, n in enumerate(compiled.letter_counts) if n} == letters
+    for word in rng.sample(words, min(10, len(words))):
+        assert word in compiled and compiled[compiled.index(word)] == word
+    for word in random_words(rng, 20, len(words[0]), 26):
+        assert (word in compiled) == (word in text)
+    assert 'A' * len(words[0]) not in compiled and words[0] + 'a' not in compiled
+
+
+def test_registry_prefers_an_up_to_date_compiled_copy(rng, dictionary_file):
+    words = random_words(rng, 60, 4, 4)
+    path = dictionary_file(words)
+    compiled_path = compile_dictionary(path)
+    table = load_dictionary(path)
+    assert isinstance(table, CompiledWordTable)
+    for solver_class in DETERMINISTIC_SOLVERS.values():
+        target = rng.choice(words)
+        assert play(solver_class(table, cache_dir=None), target) == play(solver_class(words, cache_dir=None), target)
+
+    os.utime(compiled_path, (0, os.path.getmtime(path) - 10))
+    assert not isinstance(load_dictionary(path), CompiledWordTable)
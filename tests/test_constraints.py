@@ -0,0 +1,34 @@
+import itertools
+import string
+
+from classicalSolver import PruninghWordleSolver, SymbolicWordleSolver
+from conftest import play, reference_feedback
+from constraints import ConstraintSpace
+from dictionary import ProductDictionary
+
+
+def test_counts_and_words_match_brute_force(rng):
+    word_length, alphabet_size = rng.randint(1, 4), rng.randint(1, 5)
+    letters = string.ascii_lowercase[:alphabet_size]
+    words = [''.join(word) for word in itertools.product(letters, repeat=word_length)]
+    target = rng.choice(words)
+    space = ConstraintSpace(word_length, alphabet_size)
+    remaining = words
+    for _ in range(rng.randint(0, 4)):
+        guess = rng.choice(words)
+        feedback = reference_feedback(guess, target)
+        space.update(guess, feedback)
+        remaining = [word for word in remaining if reference_feedback(guess, word) == feedback]
+
+        assert len(space) == len(remaining)
+        assert list(space) == remaining
+        assert [space.nth(i) for i in range(len(remaining))] == remaining
+        for word in rng.sample(words, min(10, len(words))):
+            assert (word in space) == (word in remaining)
+        assert space.sample(rng) in remaining
+
+
+def test_symbolic_solver_plays_like_pruning(rng):
+    space = ProductDictionary(rng.randint(2, 4), rng.randint(2, 5))
+    for target in rng.sample(list(space), min(5, len(space))):
+        assert play(SymbolicWordleSolver(space), target) == play(PruninghWordleSolver(list(space)), target)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from classicalSolver import DETERMINISTIC_SOLVERS, TreeWordleSolver
+from conftest import play, random_words, reference_feedback
+from compare import exhaustive_records
+from decisiontree import build_tree, load_tree, load_or_build_tree, tree_path
+
+
+@pytest.mark.parametrize('solver_name', list(DETERMINISTIC_SOLVERS))
+def test_tree_replays_live_games(rng, solver_name):
+    words = random_words(rng, 50, rng.randint(2, 4), rng.randint(2, 4))
+    solver_class = DETERMINISTIC_SOLVERS[solver_name]
+    tree = build_tree(solver_class, words, cache_dir=None)
+    counts = tree.guess_counts()
+    assert sorted(counts) == words
+    for target in words:
+        live = play(solver_class(words, cache_dir=None), target)
+        assert play(TreeWordleSolver(words, tree=tree), target) == live
+        assert counts[target] == len(live)
+
+
+def test_saved_tree_loads_unchanged(rng, tmp_path):
+    words = random_words(rng, 60, 4, 3)
+    tree = build_tree(DETERMINISTIC_SOLVERS['Frequency'], words)
+    tree.save(str(tmp_path / 'tree.npz'))
+    loaded = load_tree(str(tmp_path / 'tree.npz'))
+    assert loaded.words == tree.words
+    for name in ('guess', 'child_start', 'child_code', 'child_node', 'target_start', 'target_end',
+                 'targets', 'target_guesses'):
+        assert np.array_equal(getattr(loaded, name), getattr(tree, name))
+
+
+
+@pytest.mark.parametrize('solver_name, options', [('Pruning', {}), ('Frequency', {'incremental': True}),
+                                                  ('Entropy', {'branch_and_bound': True})])
+def test_exhaustive_records_match_every_live_game(rng, solver_name, options, tmp_path):
+    words = random_words(rng, 40, rng.randint(2, 4), rng.randint(2, 4))
+    records = exhaustive_records(words, solver_name, cache_dir=str(tmp_path), **options)
+    assert [record['target'] for record in records] == words
+    for record in records:
+        target = record['target']
+        live = play(DETERMINISTIC_SOLVERS[solver_name](words, cache_dir=None, **options), target)
+        assert record['guesses'] == len(live)
+        assert record['burndown'] == [sum(all(reference_feedback(guess, word) == reference_feedback(guess, target)
+                                              for guess in live[:i]) for word in words)
+                                      for i in range(len(live))]
+
+
+def test_cached_trees_are_keyed_by_options(rng, tmp_path):
+    words = random_words(rng, 40, 4, 4)
+    cache_dir = str(tmp_path)
+    plain = tree_path(words, 'Frequency', cache_dir)
+    incremental = tree_path(words, 'Frequency', cache_dir, incremental=True)
+    assert plain != incremental
+    assert tree_path(words, 'Frequency', cache_dir, incremental=False, patterns=None) == plain
+    load_or_build_tree(words, 'Frequency', cache_dir, incremental=True)
+    assert [path.name for path in tmp_path.iterdir()] == [incremental.split('/')[-1]]
+
+
+@pytest.mark.parametrize('solver_name', list(DETERMINISTIC_SOLVERS))
+def test_off_tree_guess_continues_on_the_live_solver(rng, solver_name):
+    words = random_words(rng, 50, rng.randint(3, 4), rng.randint(2, 4))
+    tree = build_tree(DETERMINISTIC_SOLVERS[solver_name], words, cache_dir=None)
+    replay = TreeWordleSolver(words, tree=tree, tree_solver=solver_name, cache_dir=None)
+    live = DETERMINISTIC_SOLVERS[solver_name](words, cache_dir=None)
+    first = replay.get_next_guess()
+    target = rng.choice([word for word in words if word != first])
+    for solver in (replay, live):
+        solver.update_possibilities(first, reference_feedback(first, target))
+    off_tree = rng.choice([word for word in words if word != replay.get_next_guess()])
+    for solver in (replay, live):
+        solver.update_possibilities(off_tree, reference_feedback(off_tree, target))
+    assert list(replay.possible_words) == [word for word in words if reference_feedback(first, word) ==
+                                           reference_feedback(first, target) and
+                                           reference_feedback(off_tree, word) == reference_feedback(off_tree, target)]
+    assert play(replay, target) == play(live, target)
@@ -0,0 +1,49 @@
+import os
+from collections import Counter
+
+from conftest import random_words
+from dictionary import load_dictionary
+from patterns import dictionary_hash, encode_words
+from wordle import Wordle
+
+
+def test_registry_loads_once_and_filters_by_length(rng, dictionary_file):
+    words = random_words(rng, 80, 3, 4) + random_words(rng, 40, 5, 4) + random_words(rng, 10, 2, 3)
+    rng.shuffle(words)
+    path = dictionary_file([word.upper() if rng.random() < 0.2 else word for word in words])
+
+    table = load_dictionary(path)
+    assert load_dictionary(path) is table
+    most_common = Counter(len(word) for word in words).most_common(1)[0][0]
+    assert table.word_length == most_common
+    assert list(table.words) == sorted(word for word in words if len(word) == most_common)
+
+    fives = load_dictionary(path, word_length=5)
+    assert fives is not table
+    assert list(fives.words) == sorted(word for word in words if len(word) == 5)
+    assert (fives.encoded == encode_words(fives.words)).all()
+    assert fives.content_hash == dictionary_hash(fives.words)
+
+
+def test_registry_reloads_modified_files(rng, dictionary_file):
+    path = dictionary_file(random_words(rng, 30, 4, 4))
+    table = load_dictionary(path)
+    replacement = random_words(rng, 30, 4, 5)
+    with open(path, 'w') as f:
+        f.write('\n'.join(replacement))
+    os.utime(path, (os.path.getatime(path), os.path.getmtime(path) + 10))
+    reloaded = load_dictionary(path)
+    assert reloaded is not table
+    assert list(reloaded.words) == replacement
+
+
+def test_games_share_the_table_at_any_word_length(rng, dictionary_file):
+    words = random_words(rng, 40, rng.randint(2, 8), 5)
+    path = dictionary_file(words)
+    first, second = Wordle(path), Wordle(path)
+    assert first.word_list is second.word_list
+    assert first.word_length == len(words[0])
+    target = rng.choice(words)
+    first.reset(target)
+    assert first.make_guess(target)['result'] == ['correct'] * len(target)
+    assert 'error' in first.make_guess('z' * len(target))
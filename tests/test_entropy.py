@@ -0,0 +1,72 @@
+import itertools
+import math
+from collections import Counter
+
+import pytest
+
+from classicalSolver import EntropyWordleSolver
+from conftest import random_words, reference_feedback
+from search import symmetric_opening
+
+
+@pytest.fixture(autouse=True)
+def fresh_openings():
+    EntropyWordleSolver._openings.clear()
+    yield
+    EntropyWordleSolver._openings.clear()
+
+
+def entropy(guess, candidates):
+    counts = Counter(tuple(reference_feedback(guess, answer)) for answer in candidates)
+    return -sum(count / len(candidates) * math.log2(count / len(candidates)) for count in counts.values())
+
+
+def expected_guess(words, candidates):
+    """Highest entropy, then a remaining candidate, then dictionary order"""
+    scores = {word: entropy(word, candidates) for word in words}
+    best = max(scores.values())
+    tied = [word for word in words if scores[word] >= best - 1e-9]
+    return next((word for word in tied if word in candidates), tied[0])
+
+
+@pytest.mark.parametrize('branch_and_bound', [False, True])
+def test_guess_maximizes_entropy(rng, branch_and_bound):
+    words = random_words(rng, 70, rng.randint(2, 5), rng.randint(2, 5))
+    target = rng.choice(words)
+    solver = EntropyWordleSolver(words, cache_dir=None, branch_and_bound=branch_and_bound)
+    candidates = list(words)
+    for _ in range(6):
+        guess = solver.get_next_guess()
+        assert guess == expected_guess(words, candidates)
+        if guess == target:
+            break
+        feedback = reference_feedback(guess, target)
+        solver.update_possibilities(guess, feedback)
+        candidates = [word for word in candidates if reference_feedback(guess, word) == feedback]
+
+
+def test_opening_is_persisted(rng, tmp_path):
+    words = random_words(rng, 50, 4, 4)
+    opening = EntropyWordleSolver(words, cache_dir=str(tmp_path)).get_next_guess()
+    [path] = tmp_path.iterdir()
+    assert path.read_text() == opening
+
+    EntropyWordleSolver._openings.clear()
+    path.write_text(words[-1])
+    assert EntropyWordleSolver(words, cache_dir=str(tmp_path)).get_next_guess() == words[-1]
+
+
+@pytest.mark.parametrize('word_length, alphabet_size, distinct', [(3, 4, False), (3, 5, True), (4, 5, True)])
+def test_symmetric_opening_matches_exhaustive(word_length, alphabet_size, distinct):
+    letters = 'abcdefghij'[:alphabet_size]
+    words = [''.join(word) for word in itertools.product(letters, repeat=word_length)
+             if not distinct or len(set(word)) == word_length]
+    solver = EntropyWordleSolver(words, cache_dir=None, branch_and_bound=False)
+    index, scored = symmetric_opening(solver.candidates)
+    assert scored < len(words)
+    assert words[index] == solver.get_next_guess() == expected_guess(words, words)
+
+
+def test_symmetric_opening_declines_asymmetric_dictionaries(rng):
+    words = random_words(rng, 40, 4, 4)
+    assert symmetric_opening(EntropyWordleSolver(words, cache_dir=None).candidates) is None
@@ -0,0 +1,31 @@
+from conftest import random_words, reference_feedback
+from filters import CandidateSet
+from patterns import load_pattern_matrix
+
+
+def brute_force(words, history):
+    return [word for word in words if all(reference_feedback(guess, word) == feedback for guess, feedback in history)]
+
+
+def test_pruning_matches_brute_force(rng):
+    words = random_words(rng, 120, rng.randint(2, 6), rng.randint(2, 5))
+    target = rng.choice(words)
+    patterns = load_pattern_matrix(words, cache_dir=None)
+    candidates = [CandidateSet(words), CandidateSet(words, patterns)]
+    history = []
+    for _ in range(4):
+        guess = rng.choice(words)
+        history.append((guess, reference_feedback(guess, target)))
+        for candidate_set in candidates:
+            candidate_set.update(*history[-1])
+            assert candidate_set.to_list() == brute_force(words, history)
+
+
+def test_codes_matrix_agrees_with_codes(rng):
+    words = random_words(rng, 50, 4, 3)
+    candidates = CandidateSet(words)
+    guess = rng.choice(words)
+    candidates.update(guess, reference_feedback(guess, rng.choice(words)))
+    matrix = candidates.codes_matrix()
+    for i, word in enumerate(words):
+        assert list(matrix[i]) == list(candidates.codes(word))
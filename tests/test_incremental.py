@@ -0,0 +1,54 @@
+import copy
+
+import numpy as np
+
+from classicalSolver import FrequencyWordleSolver
+from conftest import random_words, reference_feedback
+
+
+def expected_counts(candidates):
+    presence = np.zeros(26, dtype=np.int64)
+    positions = np.zeros((len(candidates[0]), 26), dtype=np.int64)
+    for word in candidates:
+        for letter in set(word):
+            presence[ord(letter) - ord('a')] += 1
+        for i, letter in enumerate(word):
+            positions[i, ord(letter) - ord('a')] += 1
+    return presence, positions
+
+
+def expected_guess(candidates):
+    presence, positions = expected_counts(candidates)
+
+    def score(word):
+        return sum(presence[ord(letter) - ord('a')] for letter in set(word)) + \
+               sum(positions[i, ord(letter) - ord('a')] for i, letter in enumerate(word))
+    return max(candidates, key=score)
+
+
+def test_counts_track_the_remaining_candidates(rng):
+    words = random_words(rng, 80, rng.randint(2, 6), rng.randint(2, 6))
+    target = rng.choice(words)
+    solver = FrequencyWordleSolver(words, incremental=True)
+    while True:
+        candidates = solver.possible_words
+        presence, positions = expected_counts(candidates)
+        assert np.array_equal(solver.presence_counts, presence)
+        assert np.array_equal(solver.position_counts, positions)
+        guess = solver.get_next_guess()
+        assert guess == expected_guess(candidates)
+        if guess == target:
+            break
+
+        # A copy taken before pruning keeps its own counts
+        before = copy.copy(solver)
+        before.candidates = copy.copy(solver.candidates)
+        solver.update_possibilities(guess, reference_feedback(guess, target))
+        assert np.array_equal(before.presence_counts, presence)
+
+
+def test_candidates_set_from_outside_are_recounted(rng):
+    words = random_words(rng, 60, 4, 4)
+    solver = FrequencyWordleSolver(words, incremental=True)
+    solver.candidates.indices = np.array(sorted(rng.sample(range(len(words)), rng.randint(1, len(words)))))
+    assert solver.get_next_guess() == expected_guess(solver.possible_words)
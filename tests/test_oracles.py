@@ -0,0 +1,34 @@
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Operator
+
+from hybridSolver import SimpleOracleBuilder
+from oracles import esop_cubes
+
+
+def random_solutions(rng, qubit_count):
+    # Repeats included: an even number of copies cancels in every mode
+    solutions = [rng.randrange(2 ** qubit_count) for _ in range(rng.randint(0, 2 ** qubit_count))]
+    return solutions + rng.sample(solutions, min(len(solutions), 2))
+
+
+def test_esop_cover_marks_the_odd_solutions(rng):
+    qubit_count = rng.randint(1, 8)
+    solutions = random_solutions(rng, qubit_count)
+    cubes = esop_cubes(qubit_count, solutions)
+    for state in range(2 ** qubit_count):
+        covered = sum(state & care == value for care, value in cubes) % 2
+        assert covered == solutions.count(state) % 2
+
+
+@pytest.mark.parametrize('synthesis', ['esop', 'diagonal'])
+def test_compressed_oracles_match_mcx(rng, synthesis):
+    qubit_count = rng.randint(1, 4)
+    solutions = random_solutions(rng, qubit_count)
+
+    def unitary(mode):
+        circuit = QuantumCircuit(qubit_count + 1)
+        circuit.append(SimpleOracleBuilder('o', qubit_count, solutions, mode).build_circuit(), range(qubit_count + 1))
+        return Operator(circuit)
+
+    assert unitary(synthesis).equiv(unitary('mcx'))
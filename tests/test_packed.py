@@ -0,0 +1,23 @@
+import numpy as np
+
+from conftest import random_words, reference_feedback
+from packed import feedback_codes_packed, pack_words, pack_word
+from patterns import code_to_feedback
+
+
+def test_packed_codes_match_reference(rng):
+    word_length = rng.randint(1, 12)
+    words = random_words(rng, 80, word_length, rng.randint(1, 4))
+    packed, masks = pack_words(words)
+    for guess in rng.sample(words, min(10, len(words))):
+        codes = feedback_codes_packed(*pack_word(guess), packed, masks, word_length)
+        for answer, code in zip(words, codes):
+            assert code_to_feedback(code, word_length) == reference_feedback(guess, answer)
+
+
+def test_pack_word_agrees_with_pack_words(rng):
+    words = random_words(rng, 20, rng.randint(1, 12), 26)
+    packed, masks = pack_words(words)
+    for word, packed_word, mask in zip(words, packed, masks):
+        assert pack_word(word) == (int(packed_word), int(mask))
+    assert packed.dtype == (np.uint32 if len(words[0]) <= 6 else np.uint64)
@@ -0,0 +1,65 @@
+import math
+import random
+
+import pytest
+
+from backends import AnalyticBackend
+from conftest import play, random_words
+from hybridSolver import HybridWordleSolver, PositionEvaluationCircuit
+from partition import merge_block_counts, run_parallel, split_blocks
+
+
+def entropy(counts):
+    total = sum(counts.values())
+    return -sum(c / total * math.log2(c / total) for c in counts.values() if c)
+
+
+def test_blocks_cover_the_words_in_order(rng):
+    words = [f'w{i}' for i in range(rng.randint(0, 100))]
+    block_size = rng.randint(1, 20)
+    blocks = split_blocks(words, block_size)
+    assert [word for block in blocks for word in block] == words
+    assert all(0 < len(block) <= block_size for block in blocks)
+
+
+def test_merged_entropy_adds_block_choice_and_block_entropies(rng):
+    sizes = [rng.randint(1, 30) for _ in range(rng.randint(1, 6))]
+    blocks = [{format(state, '05b'): rng.randint(0, 50) for state in range(rng.randint(1, 32))} for _ in sizes]
+    for block in blocks:
+        block['00000'] += 1
+    merged = merge_block_counts(blocks, sizes)
+    assert sum(merged.values()) == pytest.approx(1.0)
+    weights = [size / sum(sizes) for size in sizes]
+    expected = entropy(dict(enumerate(weights))) + sum(w * entropy(b) for w, b in zip(weights, blocks))
+    assert entropy(merged) == pytest.approx(expected)
+
+
+def test_parallel_blocks_match_serial_runs():
+    rng = random.Random(11)
+    circuits = [PositionEvaluationCircuit([f'w{i}' for i in range(rng.randint(1, 40))], p) for p in range(7)]
+    assert run_parallel(circuits, 'analytic', workers=2) == AnalyticBackend().run_many(circuits)
+
+    words = random_words(rng, 80, 4, 4)
+    target = rng.choice(words)
+    games = [play(HybridWordleSolver(words, target_word=target, backend='analytic', rng=random.Random(5),
+                                     block_size=2, block_workers=workers), target)
+             for workers in (0, 2)]
+    assert games[0] == games[1] and games[0][-1] == target
+
+
+def test_blocks_split_the_position_circuits(rng):
+    words = random_words(rng, 80, 5, 4)
+    target = rng.choice(words)
+
+    def game(**options):
+        solver = HybridWordleSolver(words, target_word=target, backend='analytic', rng=random.Random(3), **options)
+        run_circuits, sizes = solver._run_circuits, []
+        solver._run_circuits = lambda circuits: sizes.append(len(circuits)) or run_circuits(circuits)
+        return play(solver, target), sizes
+
+    unsplit, sizes = game()
+    assert game(block_size=5) == (unsplit, sizes)
+    split, block_sizes = game(block_size=2)
+    assert split[-1] == target
+    # Three blocks of at most two letters for each of the five positions
+    assert block_sizes and set(block_sizes) == {5 * 3}
@@ -0,0 +1,44 @@
+import numpy as np
+
+from conftest import random_words, reference_feedback
+from patterns import (code_to_feedback, encode_words, feedback_codes, feedback_to_code, load_pattern_matrix,
+                      pattern_entropies)
+
+
+def test_feedback_codes_match_reference(rng):
+    words = random_words(rng, 60, rng.randint(1, 6), rng.randint(1, 5))
+    codes = feedback_codes(encode_words(words), encode_words(words))
+    for _ in range(300):
+        g, a = rng.randrange(len(words)), rng.randrange(len(words))
+        assert code_to_feedback(codes[g, a], len(words[0])) == reference_feedback(words[g], words[a])
+
+
+def test_feedback_code_round_trip(rng):
+    word_length = rng.randint(1, 8)
+    for _ in range(50):
+        code = rng.randrange(3 ** word_length)
+        assert feedback_to_code(code_to_feedback(code, word_length)) == code
+
+
+def test_pattern_matrix_cache_matches_memory(rng, tmp_path):
+    words = random_words(rng, 80, 4, 4)
+    shuffled = words[:]
+    rng.shuffle(shuffled)
+    cached = load_pattern_matrix(shuffled, cache_dir=str(tmp_path))
+    reloaded = load_pattern_matrix(words, cache_dir=str(tmp_path))
+    in_memory = load_pattern_matrix(words, cache_dir=None)
+    assert len(list(tmp_path.iterdir())) == 1
+    assert np.array_equal(cached.matrix, in_memory.matrix)
+    assert np.array_equal(reloaded.matrix, in_memory.matrix)
+    guess, answer = rng.choice(words), rng.choice(words)
+    assert in_memory.feedback(guess, answer) == reference_feedback(guess, answer)
+
+
+def test_pattern_entropies_match_direct_histograms(rng):
+    codes = np.array([[rng.randrange(9) for _ in range(rng.randint(1, 40))]] * 3)
+    expected = []
+    for row in codes:
+        _, counts = np.unique(row, return_counts=True)
+        p = counts / len(row)
+        expected.append(-(p * np.log2(p)).sum())
+    assert np.allclose(pattern_entropies(codes, 2), expected)
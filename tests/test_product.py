@@ -0,0 +1,67 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import reference_feedback
+from dictionary import ProductDictionary, load_dictionary, product_dictionary
+from filters import MAX_CANDIDATE_WORDS, CandidateSet
+from patterns import dictionary_hash, encode_words
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from generator import iter_dictionary, write_dictionary  # noqa: E402
+
+
+def random_space(rng):
+    return ProductDictionary(rng.randint(1, 4), rng.randint(1, 6))
+
+
+def test_mixed_radix_indexing_matches_generated_words(rng):
+    space = random_space(rng)
+    words = list(iter_dictionary(space.word_length, space.alphabet_size))
+    assert list(space) == words and len(space) == len(words)
+    for i in rng.sample(range(len(words)), min(20, len(words))):
+        assert space[i] == words[i] == space[i - len(words)]
+        assert space.index(words[i]) == i
+        assert words[i] in space
+    indices = np.array(rng.sample(range(len(words)), min(20, len(words))))
+    assert np.array_equal(space.encode(indices), encode_words([words[i] for i in indices]))
+    assert dictionary_hash(space) == ProductDictionary(space.word_length, space.alphabet_size).content_hash
+    assert dictionary_hash(space) != ProductDictionary(space.word_length + 1, space.alphabet_size).content_hash
+    assert 'z' * space.word_length not in space
+    with pytest.raises(IndexError):
+        space[len(words)]
+
+
+def test_written_dictionary_loads_like_the_virtual_one(rng, tmp_path):
+    word_length, alphabet_size = rng.randint(2, 4), rng.randint(2, 5)
+    path = str(tmp_path / f'l{word_length}_a{alphabet_size}.txt')
+    virtual = load_dictionary(path)
+    assert isinstance(virtual, ProductDictionary)
+    count = write_dictionary(path, iter_dictionary(word_length, alphabet_size), chunk_size=rng.randint(1, 50))
+    assert count == len(virtual)
+    assert list(load_dictionary(path).words) == list(virtual)
+
+
+def test_product_candidates_prune_like_a_word_list(rng):
+    space = random_space(rng)
+    words = list(space)
+    target = rng.choice(words)
+    lazy, listed = CandidateSet(space), CandidateSet(words)
+    for _ in range(3):
+        guess = rng.choice(words)
+        feedback = reference_feedback(guess, target)
+        lazy.update(guess, feedback)
+        listed.update(guess, feedback)
+        assert lazy.to_list() == listed.to_list()
+    # Pruning decodes candidates from their indices; only a scan over every guess builds the whole matrix
+    assert lazy._encoded is None
+    assert np.array_equal(lazy.codes_matrix(), listed.codes_matrix())
+
+
+def test_oversized_spaces_are_refused():
+    space = product_dictionary(8, 26)
+    assert len(space) > MAX_CANDIDATE_WORDS
+    with pytest.raises(ValueError):
+        CandidateSet(space)
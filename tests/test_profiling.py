@@ -0,0 +1,51 @@
+import pytest
+
+import profiling
+from classicalSolver import PruninghWordleSolver
+from compare import compare_solvers
+from conftest import random_words
+from wordle import Wordle
+
+
+@pytest.fixture(autouse=True)
+def profiler_off():
+    yield
+    profiling.disable()
+
+
+def test_game_events_follow_the_game(rng, dictionary_file):
+    words = random_words(rng, 60, 4, 3)
+    game = Wordle(dictionary_file(words))
+    game.reset(rng.choice(words))
+    solver = PruninghWordleSolver(game.word_list)
+    profiler = profiling.enable()
+    profiler.start_game('g')
+
+    sizes = [len(solver.candidates)]
+    while True:
+        guess = solver.get_next_guess()
+        result = game.make_guess(guess)['result']
+        if guess == game.target_word:
+            break
+        solver.update_possibilities(guess, result)
+        sizes.append(len(solver.candidates))
+    events = profiler.end_game()
+
+    guesses = [event for event in events if event['phase'] == 'PruninghWordleSolver.get_next_guess']
+    updates = [event for event in events if event['phase'] == 'PruninghWordleSolver.update_possibilities']
+    assert [event['guess'] for event in guesses] == list(range(1, game.attempts + 1))
+    assert [event['guess'] for event in updates] == list(range(2, game.attempts + 1))
+    assert [(event['size_before'], event['size_after']) for event in updates] == list(zip(sizes, sizes[1:]))
+    assert all(event['game'] == 'g' and event['wall'] >= 0 for event in events)
+    summary = profiling.summarize(events)
+    assert summary['PruninghWordleSolver.get_next_guess']['calls'] == game.attempts
+
+
+@pytest.mark.parametrize('mode', [{}, {'lockstep': True}, {'exhaustive': True}])
+def test_compare_collects_traces_apart_from_records(rng, dataset, mode, tmp_path):
+    traces = []
+    records = compare_solvers(dataset(random_words(rng, 40, 4, 4)), n_games=4, solver_names=['Frequency'],
+                              workers=1, seed=rng.randrange(100), keep_records=False, traces=traces,
+                              cache_dir=str(tmp_path / 'cache'), profile=True, **mode)
+    assert records == []
+    assert traces and all('phase' in event for event in traces)
@@ -0,0 +1,31 @@
+import numpy as np
+
+from classicalSolver import EntropyWordleSolver
+from conftest import random_words, reference_feedback
+from patterns import pattern_entropies
+from search import best_entropy_guess, entropy_upper_bounds
+
+
+def test_bounds_are_upper_bounds(rng):
+    words = random_words(rng, 80, rng.randint(2, 6), rng.randint(2, 6))
+    solver = EntropyWordleSolver(words, cache_dir=None)
+    for _ in range(2):
+        candidates = solver.candidates
+        exact = pattern_entropies(candidates.codes_matrix(), candidates.word_length)
+        bounds = entropy_upper_bounds(candidates.encoded, candidates.encode(candidates.indices))
+        assert np.all(bounds >= exact - 1e-9)
+        guess = rng.choice(words)
+        solver.update_possibilities(guess, reference_feedback(guess, rng.choice(solver.possible_words)))
+
+
+def test_branch_and_bound_matches_the_exhaustive_scan(rng):
+    words = random_words(rng, 120, rng.randint(3, 5), rng.randint(3, 6))
+    target = rng.choice(words)
+    solver = EntropyWordleSolver(words, cache_dir=None, branch_and_bound=False)
+    for _ in range(3):
+        index, scored = best_entropy_guess(solver.candidates, first_chunk=rng.randint(1, 8))
+        assert words[index] == solver.get_next_guess()
+        assert scored <= len(words)
+        if words[index] == target:
+            break
+        solver.update_possibilities(words[index], reference_feedback(words[index], target))
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+
+from classicalSolver import DETERMINISTIC_SOLVERS
+from conftest import play, random_words, reference_feedback
+from service import HTTPError, WordleService
+
+
+@pytest.fixture
+def service(rng, dataset, tmp_path):
+    words = random_words(rng, 60, 4, 4)
+    service = WordleService(dataset(words), executor_workers=2, cache_dir=str(tmp_path / 'cache'))
+    yield service
+    service.executor.shutdown()
+
+
+def test_sessions_play_like_local_solvers(rng, service):
+    async def run():
+        for solver_name in list(DETERMINISTIC_SOLVERS) + ['Tree']:
+            seed = rng.randrange(1000)
+            status, state = await service.handle('POST', '/sessions', {'solver': solver_name, 'seed': seed})
+            assert status == 201
+            session = service.sessions[state['session']]
+            target = session.game.target_word
+            # The seed alone fixes the target
+            assert service.create_session(solver_name, seed=seed).game.target_word == target
+
+            guesses = []
+            while True:
+                _, step = await service.handle('POST', f'/sessions/{state["session"]}/step', {})
+                guesses.append(step['guess'])
+                if step['solved']:
+                    break
+            local = DETERMINISTIC_SOLVERS.get(solver_name, DETERMINISTIC_SOLVERS['Frequency'])
+            assert guesses == play(local(service.word_list, cache_dir=None), target)
+            with pytest.raises(HTTPError):
+                await service.handle('POST', f'/sessions/{state["session"]}/step', {})
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize('solver_name', list(DETERMINISTIC_SOLVERS) + ['Tree'])
+def test_player_guesses_prune_like_the_rules(rng, service, solver_name):
+    async def run():
+        _, state = await service.handle('POST', '/sessions', {'solver': solver_name, 'seed': rng.randrange(1000)})
+        target = service.sessions[state['session']].game.target_word
+        words = service.word_list.words
+        remaining = list(words)
+        for _ in range(2):
+            guess = rng.choice([word for word in words if word != target])
+            await service.handle('POST', f'/sessions/{state["session"]}/guess', {'word': guess})
+            feedback = reference_feedback(guess, target)
+            remaining = [word for word in remaining if reference_feedback(guess, word) == feedback]
+            _, state = await service.handle('GET', f'/sessions/{state["session"]}', {})
+            assert state['remaining'] == len(remaining)
+        _, step = await service.handle('POST', f'/sessions/{state["session"]}/step', {})
+        assert step['guess'] in words
+
+    asyncio.run(run())
+
+
+def test_http_errors(service, tmp_path):
+    socket = str(tmp_path / 'service.sock')
+
+    async def request(method, path, body, length=None):
+        reader, writer = await asyncio.open_unix_connection(socket)
+        length = len(body) if length is None else length
+        writer.write(f'{method} {path} HTTP/1.1\r\nContent-Length: {length}\r\nConnection: close\r\n\r\n'.encode()
+                     + body)
+        response = await reader.read()
+        writer.close()
+        head, _, payload = response.partition(b'\r\n\r\n')
+        return int(head.split()[1]), json.loads(payload)
+
+    async def run():
+        server = await asyncio.start_unix_server(service.serve_connection, path=socket)
+        async with server:
+            assert (await request('POST', '/sessions', b'[1, 2]'))[0] == 400
+            assert (await request('POST', '/sessions', b'{not json'))[0] == 400
+            assert (await request('POST', '/sessions', b'{"solver": "Nope"}'))[0] == 400
+            assert (await request('GET', '/sessions/missing', b''))[0] == 404
+            assert (await request('POST', '/sessions', b'{}', length='two'))[0] == 400
+            assert (await request('POST', '/sessions', b'{}', length='-2'))[0] == 400
+            for body in ({'target': 7}, {'target': ['a']}, {'seed': [1]}, {'seed': {'a': 1}}, {'solver': ['Tree']}):
+                assert (await request('POST', '/sessions', json.dumps(body).encode()))[0] == 400
+            status, state = await request('POST', '/sessions', b'{"solver": "Pruning"}')
+            assert status == 201 and state['remaining'] == len(service.word_list)
+
+    asyncio.run(run())
@@ -0,0 +1,67 @@
+import random
+
+import numpy as np
+import pytest
+
+from classicalSolver import DETERMINISTIC_SOLVERS
+from compare import compare_solvers
+from conftest import play, random_words
+from transposition import TranspositionTable, TransposedSolver, history_key
+
+
+@pytest.mark.parametrize('solver_name', list(DETERMINISTIC_SOLVERS))
+def test_transposed_games_match_plain_games(rng, solver_name):
+    words = random_words(rng, 50, 4, 3)
+    solver_class = DETERMINISTIC_SOLVERS[solver_name]
+    table = TranspositionTable()
+    hits = 0
+    for target in rng.choices(words, k=15):
+        solver = TransposedSolver(solver_class(words, cache_dir=None), table, solver_name)
+        assert play(solver, target) == play(solver_class(words, cache_dir=None), target)
+        hits += solver.hits
+    assert hits > 0
+
+
+def test_history_key_ignores_order(rng):
+    history = [(f'w{i}', rng.randrange(81)) for i in range(rng.randint(0, 6))]
+    shuffled = history[:]
+    rng.shuffle(shuffled)
+    assert history_key('Frequency:x', shuffled) == history_key('Frequency:x', history)
+
+
+def test_additions_merge_and_round_trip(rng, tmp_path):
+    worker, parent = TranspositionTable(), TranspositionTable()
+    worker.put('before', np.arange(3), 'aaaa')
+    worker.track_additions()
+    entries = {f'k{i}': (np.array(sorted(rng.sample(range(100), 5))), f'g{i}') for i in range(rng.randint(1, 20))}
+    for key, (indices, guess) in entries.items():
+        worker.put(key, indices, guess)
+    additions = worker.take_additions()
+    assert [key for key, _, _ in additions] == list(entries)
+    assert worker.take_additions() == []
+
+    parent.merge(additions)
+    parent.save(str(tmp_path / 'table.npz'))
+    loaded = TranspositionTable()
+    loaded.load(str(tmp_path / 'table.npz'))
+    assert len(loaded) == len(entries)
+    for key, (indices, guess) in entries.items():
+        stored_indices, stored_guess = loaded.get(key)
+        assert stored_guess == guess and np.array_equal(stored_indices, indices)
+
+
+def test_workers_tables_are_merged_into_one_file(dataset, tmp_path):
+    name = dataset(random_words(random.Random(7), 60, 4, 4))
+    path = str(tmp_path / 'transpositions.npz')
+    compare_solvers(name, n_games=12, solver_names=['Frequency'], workers=2, seed=3, cache_dir=None,
+                    transpositions=True, transposition_file=path)
+    first = TranspositionTable()
+    first.load(path)
+
+    records = compare_solvers(name, n_games=12, solver_names=['Frequency'], workers=2, seed=3, cache_dir=None,
+                              transpositions=True, transposition_file=path)
+    # Every state of the repeated games was saved by one worker or the other
+    assert all(record['transposition_hits'] == record['transposition_lookups'] for record in records)
+    second = TranspositionTable()
+    second.load(path)
+    assert len(second) == len(first)